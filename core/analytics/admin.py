@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import DailyRollup
+
+
+@admin.register(DailyRollup)
+class DailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'category', 'location', 'lost_reported', 'found_reported',
+                    'matched', 'returned', 'claims_created', 'claims_approved')
+    list_filter = ('category',)
+    date_hierarchy = 'day'
@@ -0,0 +1,166 @@
+# analytics/exports.py
+
+import csv
+import io
+import json
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from claims.models import Claim
+from items.forms import ItemSearchForm
+from items.models import Item
+from users.models import Notification
+
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+# kind → (model, exported columns)
+EXPORTS = {
+    'items': (Item, (
+        'id', 'item_name', 'description', 'category', 'color', 'location',
+        'item_type', 'status', 'date_lost', 'date_found', 'date_reported',
+        'reported_by__username', 'matched_lost_item_id', 'created_at', 'updated_at',
+        'returned_at',
+    )),
+    'claims': (Claim, (
+        'id', 'item_id', 'item__item_name', 'matched_found_item_id',
+        'claimed_by__username', 'status', 'evidence_score', 'created_by_system',
+        'where_lost', 'when_lost', 'created_at', 'reviewed_by__username',
+        'reviewed_at', 'decision_note',
+    )),
+    'notifications': (Notification, (
+        'id', 'user__username', 'message', 'is_read', 'created_at', 'emailed_at',
+    )),
+}
+
+
+class ExportError(ValueError):
+    """Unknown export kind/format or invalid filters."""
+
+
+# ---------------------------------------------------------
+# QUERY
+# ---------------------------------------------------------
+def export_queryset(kind, filters):
+    """
+    Rows to export for `kind`, filtered with ItemSearchForm fields
+    (claims by their item; notifications by keyword and created date).
+    """
+    if kind not in EXPORTS:
+        raise ExportError(f"Unknown export '{kind}'. Choose one of: {', '.join(EXPORTS)}.")
+
+    form = ItemSearchForm(filters)
+    if not form.is_valid():
+        raise ExportError(form.errors.as_text())
+
+    model, columns = EXPORTS[kind]
+    queryset = model.objects.all()
+
+    if kind == 'items':
+        queryset = form.filter_items(queryset)
+    elif kind == 'claims':
+        queryset = form.filter_items(queryset, prefix='item__')
+    else:
+        data = form.cleaned_data
+        if data.get('keyword'):
+            queryset = queryset.filter(message__icontains=data['keyword'])
+        if data.get('start_date'):
+            queryset = queryset.filter(created_at__date__gte=data['start_date'])
+        if data.get('end_date'):
+            queryset = queryset.filter(created_at__date__lte=data['end_date'])
+
+    return queryset, columns
+
+
+def iter_chunks(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield lists of value tuples, `chunk_size` rows at a time, walking the
+    primary key (WHERE id > last ORDER BY id LIMIT n). Each chunk is its own
+    short query, so memory stays flat and no cursor or transaction is held
+    open for the whole export — MySQL drivers buffer the full result of a
+    single query even with .iterator().
+    """
+    rows = queryset.order_by('id').values_list(*columns)
+    last_id = 0
+
+    while True:
+        chunk = list(rows.filter(id__gt=last_id)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1][0]
+
+
+# ---------------------------------------------------------
+# ENCODING
+# ---------------------------------------------------------
+def _csv_lines(chunks, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # header only (no rows)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _jsonl_lines(chunks, columns):
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+            for row in chunk
+        )
+
+
+def _gzip(blocks):
+    # wbits=31 → gzip container, compressed incrementally
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(kind, filters, fmt='csv', compress=True, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Byte blocks of a CSV or JSONL export (gzip-compressed by default),
+    one block per chunk of rows.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unknown format '{fmt}'. Choose one of: {', '.join(EXPORT_FORMATS)}.")
+
+    queryset, columns = export_queryset(kind, filters)
+    chunks = iter_chunks(queryset, columns, chunk_size)
+
+    lines = _csv_lines(chunks, columns) if fmt == 'csv' else _jsonl_lines(chunks, columns)
+    blocks = (text.encode('utf-8') for text in lines)
+
+    return _gzip(blocks) if compress else blocks
+
+
+async def astream(blocks):
+    """
+    Serve a sync export generator from an async view: each block (one
+    chunk query + encoding) runs in the sync thread, the event loop is
+    free while the client downloads.
+    """
+    next_block = sync_to_async(next)
+    while True:
+        block = await next_block(blocks, None)
+        if block is None:
+            return
+        yield block
+
+
+def export_filename(kind, fmt, compress):
+    return f"{kind}.{fmt}.gz" if compress else f"{kind}.{fmt}"
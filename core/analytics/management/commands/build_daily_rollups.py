@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import build_daily_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild daily analytics rollups for the days that changed since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help="Rebuild every day (needed after items or claims were deleted).",
+        )
+
+    def handle(self, *args, **options):
+        days = build_daily_rollups(full=options['full'])
+
+        if days:
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt rollups for {len(days)} day(s): {days[0]} … {days[-1]}"
+            ))
+        else:
+            self.stdout.write("Rollups are up to date.")
@@ -0,0 +1,47 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, EXPORTS, ExportError, stream_export
+from items.forms import ItemSearchForm
+
+
+class Command(BaseCommand):
+    help = "Stream items, claims or notifications to CSV / JSONL (gzip by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(EXPORTS))
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--no-gzip', action='store_true', help="Write plain text.")
+        parser.add_argument('--output', '-o', help="File to write (default: stdout).")
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+        # same filters as the item search page
+        for name in ItemSearchForm.base_fields:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name)
+
+    def handle(self, *args, **options):
+        filters = {
+            name: options[name]
+            for name in ItemSearchForm.base_fields
+            if options.get(name)
+        }
+
+        try:
+            blocks = stream_export(
+                options['kind'],
+                filters,
+                fmt=options['format'],
+                compress=not options['no_gzip'],
+                chunk_size=options['chunk_size'],
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for block in blocks:
+                output.write(block)
+        finally:
+            if options['output']:
+                output.close()
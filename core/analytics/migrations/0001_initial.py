@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_built_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category', models.CharField(max_length=50)),
+                ('location', models.CharField(max_length=100)),
+                ('lost_reported', models.PositiveIntegerField(default=0)),
+                ('found_reported', models.PositiveIntegerField(default=0)),
+                ('matched', models.PositiveIntegerField(default=0)),
+                ('returned', models.PositiveIntegerField(default=0)),
+                ('median_return_hours', models.FloatField(blank=True, null=True)),
+                ('claims_created', models.PositiveIntegerField(default=0)),
+                ('claims_approved', models.PositiveIntegerField(default=0)),
+                ('claims_rejected', models.PositiveIntegerField(default=0)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'category', 'location'), name='daily_rollup_unique_day_category_location')],
+            },
+        ),
+    ]
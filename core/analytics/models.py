@@ -0,0 +1,52 @@
+from django.db import models
+
+
+class DailyRollup(models.Model):
+    """
+    Per-day lost/found/claim counters for one (category, location).
+    Item counters are by report day (date_reported); claim counters by
+    the day the claim was submitted. Built by build_daily_rollups.
+    """
+    day = models.DateField()
+    category = models.CharField(max_length=50)
+    location = models.CharField(max_length=100)
+
+    # Items reported that day
+    lost_reported = models.PositiveIntegerField(default=0)
+    found_reported = models.PositiveIntegerField(default=0)
+
+    # ...of which are now matched / returned
+    matched = models.PositiveIntegerField(default=0)
+    returned = models.PositiveIntegerField(default=0)
+
+    # Median hours from report to "returned" of the returned items above
+    median_return_hours = models.FloatField(null=True, blank=True)
+
+    # Claims submitted that day and their outcome so far
+    claims_created = models.PositiveIntegerField(default=0)
+    claims_approved = models.PositiveIntegerField(default=0)
+    claims_rejected = models.PositiveIntegerField(default=0)
+
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'category', 'location'],
+                name='daily_rollup_unique_day_category_location',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.category} @ {self.location}"
+
+
+class RollupCursor(models.Model):
+    """
+    Single row: when build_daily_rollups last ran. Only days touched by
+    items/claims updated after this are rebuilt on the next run.
+    """
+    last_built_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Rollups built at {self.last_built_at}"
@@ -0,0 +1,223 @@
+# analytics/rollups.py
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from statistics import median
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from claims.models import Claim
+from items.models import Item
+
+from .models import DailyRollup, RollupCursor
+
+
+CURSOR_PK = 1
+
+# Item statuses that count as "found its counterpart"
+MATCHED_STATUSES = ('matched', 'claimed', 'returned')
+
+COUNTERS = (
+    'lost_reported', 'found_reported', 'matched', 'returned',
+    'claims_created', 'claims_approved', 'claims_rejected',
+)
+
+
+# ---------------------------------------------------------
+# BUILD
+# ---------------------------------------------------------
+def _day_bounds(days):
+    # [first day 00:00, last day + 1 00:00) → index range scan on created_at
+    tz = timezone.get_current_timezone()
+    start = datetime.combine(min(days), time.min, tzinfo=tz)
+    end = datetime.combine(max(days) + timedelta(days=1), time.min, tzinfo=tz)
+    return start, end
+
+
+def changed_days(since):
+    """
+    Days whose rollup rows are stale: report days of items and submit days
+    of claims updated after `since`. Both lookups use the updated_at indexes.
+    """
+    days = set(
+        Item.objects.filter(updated_at__gt=since)
+        .values_list('date_reported', flat=True).distinct()
+    )
+    days.update(
+        Claim.objects.filter(updated_at__gt=since)
+        .annotate(day=TruncDate('created_at'))
+        .values_list('day', flat=True).distinct()
+    )
+    return days
+
+
+def all_days():
+    days = set(Item.objects.values_list('date_reported', flat=True).distinct())
+    days.update(
+        Claim.objects.annotate(day=TruncDate('created_at'))
+        .values_list('day', flat=True).distinct()
+    )
+    return days
+
+
+def compute_rollups(days):
+    """
+    Rollup rows (unsaved) for the given days: three grouped queries,
+    each restricted to those days through an index.
+    """
+    rows = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    item_counts = (
+        Item.objects.filter(date_reported__in=days)
+        .values('date_reported', 'category', 'location')
+        .annotate(
+            lost_reported=Count('id', filter=Q(item_type='lost')),
+            found_reported=Count('id', filter=Q(item_type='found')),
+            matched=Count('id', filter=Q(status__in=MATCHED_STATUSES)),
+            returned=Count('id', filter=Q(status='returned')),
+        )
+    )
+    for group in item_counts:
+        key = (group.pop('date_reported'), group.pop('category'), group.pop('location'))
+        rows[key].update(group)
+
+    # Report → returned, from the timestamp recorded at the transition
+    return_hours = defaultdict(list)
+    returned_items = Item.objects.filter(
+        date_reported__in=days, status='returned', returned_at__isnull=False,
+    ).values_list('date_reported', 'category', 'location', 'created_at', 'returned_at')
+    for day, category, location, created_at, returned_at in returned_items:
+        return_hours[(day, category, location)].append(
+            (returned_at - created_at).total_seconds() / 3600
+        )
+
+    start, end = _day_bounds(days)
+    claim_counts = (
+        Claim.objects.filter(created_at__gte=start, created_at__lt=end)
+        .annotate(day=TruncDate('created_at'))
+        .filter(day__in=days)
+        .values('day', 'item__category', 'item__location')
+        .annotate(
+            claims_created=Count('id'),
+            claims_approved=Count('id', filter=Q(status='approved')),
+            claims_rejected=Count('id', filter=Q(status='rejected')),
+        )
+    )
+    for group in claim_counts:
+        key = (group.pop('day'), group.pop('item__category'), group.pop('item__location'))
+        rows[key].update(group)
+
+    rollups = []
+    for (day, category, location), counters in rows.items():
+        hours = return_hours.get((day, category, location))
+        rollups.append(DailyRollup(
+            day=day,
+            category=category,
+            location=location,
+            median_return_hours=round(median(hours), 2) if hours else None,
+            **counters,
+        ))
+    return rollups
+
+
+def build_daily_rollups(full=False):
+    """
+    Rebuild the rollup rows of every day that changed since the last run
+    (or of every day with `full=True`, e.g. after items were deleted).
+    Each run replaces whole days in one transaction. Returns the rebuilt days.
+    """
+    cursor, _ = RollupCursor.objects.get_or_create(pk=CURSOR_PK)
+
+    # Taken *before* reading: a write that lands meanwhile is picked up next run
+    started_at = timezone.now()
+
+    if full or cursor.last_built_at is None:
+        days = all_days()
+    else:
+        days = changed_days(cursor.last_built_at)
+
+    with transaction.atomic():
+        if full:
+            DailyRollup.objects.all().delete()
+        if days:
+            DailyRollup.objects.filter(day__in=days).delete()
+            DailyRollup.objects.bulk_create(compute_rollups(days))
+
+        RollupCursor.objects.filter(pk=CURSOR_PK).update(last_built_at=started_at)
+
+    return sorted(days)
+
+
+# ---------------------------------------------------------
+# REPORTS (read rollup rows only)
+# ---------------------------------------------------------
+def _weighted_median(values):
+    # values: [(median_hours, returned_count)] → median of the pooled groups,
+    # approximated by the count-weighted median of the group medians
+    values = sorted((hours, weight) for hours, weight in values if hours is not None and weight)
+    total = sum(weight for _, weight in values)
+    if not total:
+        return None
+
+    seen = 0
+    for hours, weight in values:
+        seen += weight
+        if seen * 2 >= total:
+            return hours
+
+
+def _ratio(part, whole):
+    return round(part / whole, 3) if whole else None
+
+
+def _summarize(rows):
+    totals = {name: sum(row[name] for row in rows) for name in COUNTERS}
+    totals['median_return_hours'] = _weighted_median(
+        (row['median_return_hours'], row['returned']) for row in rows
+    )
+    return totals
+
+
+def build_report(start, end, category=None, location=None):
+    """
+    Trends between two dates (inclusive) from the rollup table: per-day
+    series, per-category breakdown and overall match / approval rates.
+    One query over at most days × categories × locations rows.
+    """
+    rollups = DailyRollup.objects.filter(day__gte=start, day__lte=end)
+    if category:
+        rollups = rollups.filter(category=category)
+    if location:
+        rollups = rollups.filter(location__icontains=location)
+
+    rows = list(rollups.order_by('day').values('day', 'category', 'median_return_hours', *COUNTERS))
+
+    by_day = defaultdict(list)
+    by_category = defaultdict(list)
+    for row in rows:
+        by_day[row['day']].append(row)
+        by_category[row['category']].append(row)
+
+    totals = _summarize(rows)
+    reported = totals['lost_reported'] + totals['found_reported']
+    totals['match_rate'] = _ratio(totals['matched'], reported)
+    totals['approval_rate'] = _ratio(
+        totals['claims_approved'], totals['claims_approved'] + totals['claims_rejected']
+    )
+
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'totals': totals,
+        'days': [
+            {'day': day.isoformat(), **_summarize(day_rows)}
+            for day, day_rows in by_day.items()
+        ],
+        'categories': [
+            {'category': name, **_summarize(category_rows)}
+            for name, category_rows in sorted(by_category.items())
+        ],
+    }
@@ -0,0 +1,131 @@
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from analytics.exports import stream_export
+from analytics.models import DailyRollup
+from analytics.rollups import build_daily_rollups, build_report
+from claims.models import Claim
+from items.models import Item
+from users.models import User
+
+
+def make_item(reporter, name="Wallet", item_type="lost", category="Bags", **fields):
+    return Item.objects.create(
+        reported_by=reporter, item_name=name, description="", category=category,
+        location="Library", item_type=item_type, **fields,
+    )
+
+
+class RollupTests(TestCase):
+
+    def setUp(self):
+        self.reporter = User.objects.create_user("reporter", password="x")
+        self.today = timezone.localdate()
+
+    def test_counters_per_day_category_and_location(self):
+        make_item(self.reporter)
+        make_item(self.reporter, item_type="found", status="matched")
+        make_item(self.reporter, category="Books")
+        Claim.objects.create(item=make_item(self.reporter, item_type="found"),
+                             claimed_by=self.reporter, message="Mine", status="approved")
+
+        self.assertEqual(build_daily_rollups(), [self.today])
+
+        bags = DailyRollup.objects.get(category="Bags")
+        self.assertEqual(
+            (bags.lost_reported, bags.found_reported, bags.matched, bags.claims_created, bags.claims_approved),
+            (1, 2, 1, 1, 1),
+        )
+        self.assertEqual(DailyRollup.objects.get(category="Books").lost_reported, 1)
+
+    def test_median_return_time_uses_returned_at(self):
+        item = make_item(self.reporter, status="returned")
+        Item.objects.filter(pk=item.pk).update(
+            created_at=item.returned_at - timedelta(hours=6),
+            updated_at=item.returned_at + timedelta(days=3),  # edited after the return
+        )
+
+        build_daily_rollups()
+
+        self.assertEqual(DailyRollup.objects.get().median_return_hours, 6)
+
+    def test_only_changed_days_are_rebuilt(self):
+        item = make_item(self.reporter)
+        build_daily_rollups()
+
+        self.assertEqual(build_daily_rollups(), [])
+
+        item.status = "returned"
+        item.save()
+        self.assertEqual(build_daily_rollups(), [self.today])
+        self.assertEqual(DailyRollup.objects.get().returned, 1)
+
+    def test_report_totals_and_rates(self):
+        make_item(self.reporter, status="matched")
+        make_item(self.reporter, item_type="found", status="matched")
+        make_item(self.reporter, category="Books")
+        build_daily_rollups()
+
+        report = build_report(self.today, self.today)
+
+        self.assertEqual(report["totals"]["lost_reported"], 2)
+        self.assertEqual(report["totals"]["match_rate"], round(2 / 3, 3))
+        self.assertEqual([row["category"] for row in report["categories"]], ["Bags", "Books"])
+        self.assertEqual(build_report(self.today, self.today, category="Books")["totals"]["matched"], 0)
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.staff = User.objects.create_user("staff", password="x", role="staff")
+        self.client.force_login(self.staff)
+
+    def export(self, kind, query=""):
+        return self.client.get(reverse("export_data", args=[kind]) + query)
+
+    def test_items_csv_streams_without_buffering(self):
+        for name in ("Wallet", "Phone"):
+            make_item(self.staff, name=name)
+
+        response = self.export("items", "?format=csv&gzip=0")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.is_async)
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(sorted(row["item_name"] for row in rows), ["Phone", "Wallet"])
+
+    def test_gzipped_jsonl_with_filters(self):
+        make_item(self.staff, name="Black wallet")
+        make_item(self.staff, name="Phone")
+
+        response = self.export("items", "?format=jsonl&keyword=wallet")
+
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="items.jsonl.gz"')
+        lines = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+        self.assertEqual([json.loads(line)["item_name"] for line in lines], ["Black wallet"])
+
+    def test_rows_are_read_in_keyset_chunks(self):
+        for i in range(5):
+            make_item(self.staff, name=f"Item {i}")
+
+        with self.assertNumQueries(4):  # chunks of 2, 2, 1 + the empty one that ends it
+            blocks = list(stream_export("items", {}, fmt="jsonl", compress=False, chunk_size=2))
+
+        self.assertEqual(len(blocks), 3)
+        self.assertEqual(sum(block.count(b"\n") for block in blocks), 5)
+
+    def test_unknown_kind_or_format(self):
+        self.assertEqual(self.export("passwords").status_code, 400)
+        self.assertEqual(self.export("items", "?format=xml").status_code, 400)
+
+    def test_students_cannot_export(self):
+        self.client.force_login(User.objects.create_user("student", password="x"))
+        self.assertEqual(self.export("items").status_code, 302)
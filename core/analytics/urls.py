@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import analytics_view, analytics_data, export_data
+
+urlpatterns = [
+    path('', analytics_view, name='analytics'),
+    path('data/', analytics_data, name='analytics_data'),
+    path('export/<str:kind>/', export_data, name='export_data'),
+]
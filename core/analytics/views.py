@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import render
+from django.utils import timezone
+
+from items.models import Item
+from users.views import is_staff_or_admin
+
+from .exports import ExportError, astream, export_filename, stream_export
+from .rollups import build_report
+
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+
+def _parse_date(value, default):
+    try:
+        return date.fromisoformat(value) if value else default
+    except ValueError:
+        return default
+
+
+def _report_params(request):
+    end = _parse_date(request.GET.get('end'), timezone.localdate())
+    start = _parse_date(request.GET.get('start'), end - timedelta(days=DEFAULT_RANGE_DAYS - 1))
+
+    # keep reports bounded to about a year of rollup rows
+    if start > end:
+        start, end = end, start
+    start = max(start, end - timedelta(days=MAX_RANGE_DAYS - 1))
+
+    return {
+        'start': start,
+        'end': end,
+        'category': request.GET.get('category', '').strip(),
+        'location': request.GET.get('location', '').strip(),
+    }
+
+
+# ---------------------------------------------------------
+# STAFF: charts
+# ---------------------------------------------------------
+@login_required
+@user_passes_test(is_staff_or_admin)
+def analytics_view(request):
+    params = _report_params(request)
+
+    return render(request, 'analytics/analytics.html', {
+        'report': build_report(**params),
+        'filters': params,
+        'categories': [value for value, _ in Item.CATEGORY_CHOICES],
+    })
+
+
+# ---------------------------------------------------------
+# STAFF: JSON (same report, for scripts / other dashboards)
+# ---------------------------------------------------------
+@login_required
+@user_passes_test(is_staff_or_admin)
+def analytics_data(request):
+    return JsonResponse(build_report(**_report_params(request)))
+
+
+# ---------------------------------------------------------
+# STAFF: streaming CSV / JSONL export
+# ---------------------------------------------------------
+@login_required
+@user_passes_test(is_staff_or_admin)
+def export_data(request, kind):
+    """
+    /analytics/export/<items|claims|notifications>/?format=csv|jsonl&gzip=0
+    plus any ItemSearchForm filter. Streams chunk by chunk: a plain
+    generator under WSGI, an async one under ASGI (core/asgi.py) so the
+    download doesn't hold a worker thread. Either way nothing is buffered.
+    """
+    fmt = request.GET.get('format', 'csv')
+    compress = request.GET.get('gzip', '1') != '0'
+
+    try:
+        blocks = stream_export(kind, request.GET, fmt=fmt, compress=compress)
+    except ExportError as e:
+        return HttpResponse(str(e), status=400)
+
+    # ASGI buffers sync iterators and WSGI buffers async ones
+    if isinstance(request, ASGIRequest):
+        blocks = astream(blocks)
+
+    response = StreamingHttpResponse(
+        blocks,
+        content_type='application/gzip' if compress else (
+            'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+        ),
+    )
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(kind, fmt, compress)}"'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,5 +1,7 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from items.concurrency import ConflictError
 from .models import Claim
+from .services import bulk_approve_claims, bulk_reject_claims
 
 
 @admin.register(Claim)
@@ -10,3 +12,21 @@ class ClaimAdmin(admin.ModelAdmin):
     )
     list_filter = ('status', 'created_at')
     search_fields = ('item__item_name', 'claimed_by__username', 'message')
+    actions = ('approve_selected', 'reject_selected')
+
+    def _decide(self, request, queryset, decide, verb):
+        claim_ids = list(queryset.filter(status='pending').values_list('id', flat=True))
+        try:
+            count = decide(claim_ids, request.user)
+        except ConflictError as e:
+            self.message_user(request, str(e), messages.ERROR)
+            return
+        self.message_user(request, f"{count} claim(s) {verb}.", messages.SUCCESS)
+
+    @admin.action(description="Approve selected pending claims")
+    def approve_selected(self, request, queryset):
+        self._decide(request, queryset, bulk_approve_claims, "approved")
+
+    @admin.action(description="Reject selected pending claims")
+    def reject_selected(self, request, queryset):
+        self._decide(request, queryset, bulk_reject_claims, "rejected")
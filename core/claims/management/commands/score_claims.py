@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from claims.models import Claim
+from items.matching import score_claim_evidence
+
+
+class Command(BaseCommand):
+    help = "Recompute evidence scores of pending claims (after upgrades or scorer changes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rescore every claim, not only pending ones.",
+        )
+
+    def handle(self, *args, **options):
+        claims = Claim.objects.select_related("item", "matched_found_item").order_by("id")
+        if not options["all"]:
+            claims = claims.filter(status="pending")
+
+        batch = []
+        total = 0
+
+        for claim in claims.iterator(chunk_size=options["batch_size"]):
+            claim.evidence_score = score_claim_evidence(claim)
+            batch.append(claim)
+
+            if len(batch) >= options["batch_size"]:
+                Claim.objects.bulk_update(batch, ["evidence_score"])
+                total += len(batch)
+                batch = []
+
+        if batch:
+            Claim.objects.bulk_update(batch, ["evidence_score"])
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Scored {total} claim(s)."))
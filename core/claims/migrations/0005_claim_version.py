@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claims', '0004_claim_created_by_system_claim_matched_found_item_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claim',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,119 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:47
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Frozen copy of items.matching.score_claim_evidence as of this migration
+# (colors compared as text: items had no color buckets yet). Later scorer
+# changes are applied with `manage.py score_claims`.
+MANUAL_EVIDENCE_MAX = 60
+CRITICAL_KEYWORDS = ('wallet', 'id', 'card', 'passport', 'license',
+                     'phone', 'iphone', 'android', 'laptop', 'macbook', 'keys', 'keychain')
+
+
+def _keywords(*texts):
+    words = set()
+    for text in texts:
+        text = (text or '').lower().replace(',', ' ').replace('.', ' ')
+        words.update(word for word in text.split() if len(word) >= 4)
+    return words
+
+
+def _keyword_points(keywords, *texts):
+    haystacks = [(text or '').lower() for text in texts]
+    shared = sum(1 for word in keywords if any(word in h for h in haystacks))
+    return 20 if shared >= 3 else 12 if shared == 2 else 5 if shared == 1 else 0
+
+
+def _location_points(a, b):
+    if a and b and (a.lower() in b.lower() or b.lower() in a.lower()):
+        return 20
+    return 0
+
+
+def _date_points(a, b):
+    if not a or not b:
+        return 0
+    diff = abs(a - b)
+    if diff <= timedelta(days=1):
+        return 20
+    if diff <= timedelta(days=3):
+        return 10
+    if diff <= timedelta(days=7):
+        return 5
+    return -5
+
+
+def _when(item):
+    return item.date_lost if item.item_type == 'lost' else item.date_found
+
+
+def _score(claim):
+    found = claim.matched_found_item or claim.item
+
+    if claim.matched_found_item_id:
+        lost = claim.item
+        score = 0
+        if lost.category and found.category:
+            score += 30 if lost.category == found.category else -20
+        if lost.color and found.color and lost.color.strip().lower() == found.color.strip().lower():
+            score += 15
+        score += _location_points(lost.location, found.location)
+        score += _date_points(_when(lost), _when(found))
+
+        name, description = (lost.item_name or '').lower(), (lost.description or '').lower()
+        score += _keyword_points(_keywords(name, description), found.item_name, found.description)
+        if 'money' in (lost.category or '').lower() or 'cash' in name or 'cash' in description:
+            score += 5
+        if any(word in name or word in description for word in CRITICAL_KEYWORDS):
+            score += 5
+    else:
+        score = (
+            _location_points(claim.where_lost, found.location)
+            + _date_points(claim.when_lost, _when(found))
+            + _keyword_points(_keywords(claim.identifying_marks, claim.message), found.item_name, found.description)
+        ) * 100 // MANUAL_EVIDENCE_MAX
+
+    return max(0, min(100, score))
+
+
+def score_existing_claims(apps, schema_editor):
+    # without this, every existing claim sorts as zero evidence
+    Claim = apps.get_model('claims', 'Claim')
+
+    batch = []
+    claims = Claim.objects.select_related('item', 'matched_found_item').order_by('id')
+    for claim in claims.iterator(chunk_size=500):
+        claim.evidence_score = _score(claim)
+        batch.append(claim)
+        if len(batch) >= 500:
+            Claim.objects.bulk_update(batch, ['evidence_score'])
+            batch = []
+
+    if batch:
+        Claim.objects.bulk_update(batch, ['evidence_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claims', '0005_claim_version'),
+        ('items', '0006_item_matched_lost_item_item_version_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claim',
+            name='evidence_score',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['status', '-evidence_score', 'created_at'], name='claim_review_queue_idx'),
+        ),
+        migrations.RunPython(score_existing_claims, migrations.RunPython.noop),
+    ]
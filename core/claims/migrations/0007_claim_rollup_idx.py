@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claims', '0006_claim_evidence_score'),
+        ('items', '0008_item_rollup_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['updated_at'], name='claim_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['created_at'], name='claim_created_idx'),
+        ),
+    ]
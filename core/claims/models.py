@@ -1,6 +1,9 @@
 from django.db import models
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
+from items.concurrency import conditional_update
+from items.matching import score_claim_evidence
 from items.models import Item
 
 
@@ -61,6 +64,10 @@ class Claim(models.Model):
         help_text="Explain why you believe this item belongs to you. (Optional for system claims)"
     )
 
+    # Automatic evidence score (0–100) against the claimed item,
+    # computed on save → strongest claims are reviewed first
+    evidence_score = models.PositiveSmallIntegerField(default=0)
+
     # -------------------------
     # CLAIM STATE
     # -------------------------
@@ -74,6 +81,9 @@ class Claim(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Bumped by every state transition (optimistic concurrency)
+    version = models.PositiveIntegerField(default=0)
+
     # -------------------------
     # ADMIN REVIEW FIELDS
     # -------------------------
@@ -89,43 +99,73 @@ class Claim(models.Model):
     reviewed_at = models.DateTimeField(null=True, blank=True)
     decision_note = models.TextField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # pending review queue: strongest evidence first
+            models.Index(
+                fields=['status', '-evidence_score', 'created_at'],
+                name='claim_review_queue_idx',
+            ),
+            # daily rollups: changed days since the last build, rows of one day
+            models.Index(fields=['updated_at'], name='claim_updated_idx'),
+            models.Index(fields=['created_at'], name='claim_created_idx'),
+        ]
+
+    # Fields that feed evidence_score
+    EVIDENCE_FIELDS = ('where_lost', 'when_lost', 'identifying_marks', 'message',
+                       'item', 'matched_found_item')
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+
+        if update_fields is None or set(update_fields) & set(self.EVIDENCE_FIELDS):
+            self.evidence_score = score_claim_evidence(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'evidence_score'}
+
+        super().save(*args, **kwargs)
+
     # -------------------------
     # CLAIM ACTION LOGIC
     # -------------------------
 
-    def mark_approved(self, reviewer, note=None):
-        self.status = 'approved'
-        self.reviewed_by = reviewer
-        self.reviewed_at = timezone.now()
+    # Each transition is a conditional UPDATE on the rows it touches;
+    # a concurrent change raises items.concurrency.ConflictError.
+    # Items are written before the claim so concurrent reviewers of the
+    # same item always queue on the item row first (no deadlocks).
 
-        if note:
-            self.decision_note = note
+    def _decide(self, status, reviewer, note, expected_version=None):
+        changes = {
+            'status': status,
+            'reviewed_by': reviewer,
+            'reviewed_at': timezone.now(),
+        }
 
-        self.save()
+        if note:
+            changes['decision_note'] = note
 
-        # Update lost item → returned
-        self.item.status = 'returned'
-        self.item.save()
+        conditional_update(self, expected_version, **changes)
 
-        # Update found item → returned
-        if self.matched_found_item:
-            self.matched_found_item.status = 'returned'
-            self.matched_found_item.save()
+    def mark_approved(self, reviewer, note=None, expected_version=None):
+        with transaction.atomic():
+            # Update lost item → returned
+            now = timezone.now()
+            conditional_update(self.item, status='returned', returned_at=now)
 
-    def mark_rejected(self, reviewer, note=None):
-        self.status = 'rejected'
-        self.reviewed_by = reviewer
-        self.reviewed_at = timezone.now()
+            # Update found item → returned
+            if self.matched_found_item:
+                conditional_update(self.matched_found_item, status='returned', returned_at=now)
 
-        if note:
-            self.decision_note = note
+            self._decide('approved', reviewer, note, expected_version)
 
-        self.save()
+    def mark_rejected(self, reviewer, note=None, expected_version=None):
+        with transaction.atomic():
+            # If rejected → found item goes back to unclaimed list, no
+            # longer tied to the claimant's lost report
+            if self.matched_found_item:
+                conditional_update(self.matched_found_item, status="unclaimed", matched_lost_item=None)
 
-        # If rejected → found item goes back to unclaimed list
-        if self.matched_found_item:
-            self.matched_found_item.status = "unclaimed"
-            self.matched_found_item.save()
+            self._decide('rejected', reviewer, note, expected_version)
 
     def __str__(self):
         return f"Claim #{self.id} on {self.item} by {self.claimed_by} [{self.status}]"
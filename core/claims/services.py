@@ -0,0 +1,261 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from items.concurrency import ConflictError, conditional_update
+from items.models import Item
+from items.signals import rows_updated
+from users.notifications import notify_many
+from .models import Claim
+
+
+class ClaimDecisionError(ConflictError):
+    """The claim can no longer be decided (already approved/rejected)."""
+
+
+# Notification texts (shared by single and bulk decisions)
+def _approved_message(item_name):
+    return f"Your claim for '{item_name}' has been APPROVED 🎉"
+
+
+def _auto_rejected_message(item_name):
+    return f'Your claim for "{item_name}" was automatically rejected'
+
+
+def _rejected_message(item_name):
+    return f"Your claim for '{item_name}' has been REJECTED ❌"
+
+
+def _back_in_pool_message(item_name):
+    return f"The item you found ('{item_name}') was not matched and is again visible in Found Items."
+
+
+def _load_pending_claim(claim_id):
+    claim = Claim.objects.select_related('item', 'matched_found_item').get(id=claim_id)
+
+    if claim.status != 'pending':
+        raise ClaimDecisionError(
+            f"Claim #{claim.id} was already {claim.get_status_display().lower()}."
+        )
+
+    return claim
+
+
+def approve_claim(claim_id, reviewer, note=None, version=None):
+    """
+    Approve a claim, mark its item returned and reject every other pending
+    claim on the same item — one transaction, constant number of queries.
+
+    No row locks: every write is a conditional UPDATE on the version that
+    was read (or `version`, the one the reviewer saw). If another reviewer
+    decided a claim on the same item first, the item's version has moved,
+    ConflictError is raised and nothing is written.
+    """
+    with transaction.atomic():
+        claim = _load_pending_claim(claim_id)
+        item = claim.item
+
+        claim.mark_approved(reviewer, note, expected_version=version)
+
+        competing = Claim.objects.filter(item=item, status='pending').exclude(id=claim.id)
+        others = list(competing.values_list('id', 'claimed_by_id'))
+
+        if others:
+            Claim.objects.filter(
+                id__in=[other_id for other_id, _ in others],
+                status='pending',
+            ).update(
+                status='rejected',
+                reviewed_by=reviewer,
+                reviewed_at=timezone.now(),
+                updated_at=timezone.now(),
+                version=F('version') + 1,
+            )
+            rows_updated.send(sender=Claim)
+
+        notifications = [
+            (
+                claimant_id,
+                _auto_rejected_message(item.item_name),
+                f"claim:{other_id}:rejected",
+            )
+            for other_id, claimant_id in others
+        ]
+        notifications.append((
+            claim.claimed_by_id,
+            _approved_message(item.item_name),
+            f"claim:{claim.id}:approved",
+        ))
+        notify_many(notifications)
+
+    return claim
+
+
+def reject_claim(claim_id, reviewer, note=None, version=None):
+    """
+    Reject a claim and put its item back into the unclaimed pool.
+    """
+    with transaction.atomic():
+        claim = _load_pending_claim(claim_id)
+        item = claim.item
+
+        # Put the item back into "unclaimed" pool (item row first, as in
+        # Claim.mark_approved)
+        conditional_update(item, status="unclaimed")
+
+        claim.mark_rejected(reviewer, note, expected_version=version)
+
+        notify_many([
+            (
+                claim.claimed_by_id,
+                _rejected_message(item.item_name),
+                f"claim:{claim.id}:rejected",
+            ),
+            (
+                item.reported_by_id,
+                _back_in_pool_message(item.item_name),
+                f"claim:{claim.id}:rejected:finder",
+            ),
+        ])
+
+    return claim
+
+
+# ===============================================================
+# BULK DECISIONS (pending claims page, ClaimAdmin actions)
+# ===============================================================
+def _decided(reviewer):
+    now = timezone.now()
+    return {
+        'reviewed_by': reviewer,
+        'reviewed_at': now,
+        'updated_at': now,
+        'version': F('version') + 1,
+    }
+
+
+def _set_item_status(item_ids, status, **changes):
+    if item_ids:
+        now = timezone.now()
+        Item.objects.filter(id__in=item_ids).update(
+            status=status,
+            updated_at=now,
+            version=F('version') + 1,
+            **({'returned_at': now} if status == 'returned' else {}),
+            **changes,
+        )
+        rows_updated.send(sender=Item)
+
+
+def _load_pending_claims(claim_ids):
+    rows = list(
+        Claim.objects.filter(id__in=claim_ids, status='pending').values(
+            'id', 'item_id', 'claimed_by_id', 'matched_found_item_id',
+            'item__item_name', 'item__reported_by_id',
+        )
+    )
+    if len(rows) != len(set(claim_ids)):
+        raise ClaimDecisionError(
+            "Some of the selected claims were already decided. Please reload the page."
+        )
+    return rows
+
+
+def _mark_claims(claim_ids, status, reviewer):
+    updated = Claim.objects.filter(id__in=claim_ids, status='pending').update(
+        status=status, **_decided(reviewer)
+    )
+    if updated != len(claim_ids):
+        # someone decided one of them in between → roll everything back
+        raise ConflictError(
+            "Some of the selected claims were changed by someone else. Please reload the page."
+        )
+
+    rows_updated.send(sender=Claim)
+
+
+def bulk_approve_claims(claim_ids, reviewer):
+    """
+    Approve many claims in one transaction with set-based updates:
+    claims → approved, their items (and matched found items) → returned,
+    other pending claims on those items → rejected, one notification insert.
+    Returns the number of claims approved.
+    """
+    claim_ids = list(set(claim_ids))
+
+    with transaction.atomic():
+        rows = _load_pending_claims(claim_ids)
+
+        item_ids = [row['item_id'] for row in rows]
+        if len(set(item_ids)) != len(item_ids):
+            raise ClaimDecisionError("Only one claim per item can be approved.")
+
+        # items before claims, the lock order of Claim.mark_approved
+        _set_item_status(
+            item_ids + [row['matched_found_item_id'] for row in rows if row['matched_found_item_id']],
+            'returned',
+        )
+
+        _mark_claims(claim_ids, 'approved', reviewer)
+
+        names = {row['item_id']: row['item__item_name'] for row in rows}
+        competing = list(
+            Claim.objects.filter(item_id__in=item_ids, status='pending')
+            .values_list('id', 'item_id', 'claimed_by_id')
+        )
+        if competing:
+            Claim.objects.filter(
+                id__in=[other_id for other_id, _, _ in competing], status='pending'
+            ).update(status='rejected', **_decided(reviewer))
+            rows_updated.send(sender=Claim)
+
+        notifications = [
+            (row['claimed_by_id'], _approved_message(row['item__item_name']), f"claim:{row['id']}:approved")
+            for row in rows
+        ]
+        notifications += [
+            (claimant_id, _auto_rejected_message(names[item_id]), f"claim:{other_id}:rejected")
+            for other_id, item_id, claimant_id in competing
+        ]
+        notify_many(notifications)
+
+    return len(rows)
+
+
+def bulk_reject_claims(claim_ids, reviewer):
+    """
+    Reject many claims in one transaction with set-based updates; their
+    items (and matched found items) go back to the unclaimed pool.
+    Returns the number of claims rejected.
+    """
+    claim_ids = list(set(claim_ids))
+
+    with transaction.atomic():
+        rows = _load_pending_claims(claim_ids)
+
+        # items before claims, as in bulk_approve_claims; matched found
+        # items are untied from the claimant's lost report (Claim.mark_rejected)
+        _set_item_status([row['item_id'] for row in rows], 'unclaimed')
+        _set_item_status(
+            [row['matched_found_item_id'] for row in rows if row['matched_found_item_id']],
+            'unclaimed',
+            matched_lost_item=None,
+        )
+
+        _mark_claims(claim_ids, 'rejected', reviewer)
+
+        notifications = []
+        for row in rows:
+            notifications.append((
+                row['claimed_by_id'],
+                _rejected_message(row['item__item_name']),
+                f"claim:{row['id']}:rejected",
+            ))
+            notifications.append((
+                row['item__reported_by_id'],
+                _back_in_pool_message(row['item__item_name']),
+                f"claim:{row['id']}:rejected:finder",
+            ))
+        notify_many(notifications)
+
+    return len(rows)
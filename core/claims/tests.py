@@ -1,3 +1,262 @@
+import importlib
+from datetime import date
+from unittest import mock
+
+from django.apps import apps
 from django.test import TestCase
+from django.urls import reverse
+
+from claims import services
+from claims.models import Claim
+from claims.services import (
+    ClaimDecisionError,
+    approve_claim,
+    bulk_approve_claims,
+    bulk_reject_claims,
+    reject_claim,
+)
+from items.colors import normalize_color
+from items.concurrency import ConflictError
+from items.matching import find_user_lost_reports
+from items.models import Item
+from items.testing import QueryBudgetMixin, make_items
+from users.models import NotificationOutbox, User
+
+
+class ClaimListQueryBudgetTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.student = User.objects.create_user("student", password="x", role="student")
+        self.admin = User.objects.create_user("admin", password="x", role="admin")
+        self.finder = User.objects.create_user("finder", password="x")
+        self.claimants = [self.student] + [
+            User.objects.create_user(f"claimant{i}", password="x") for i in range(2)
+        ]
+
+    def rows(self, status, claimants=None):
+        # `count` claims on as many found items, spread over several claimants
+        claimants = claimants or self.claimants
+
+        def make_rows(count):
+            Claim.objects.bulk_create(
+                Claim(
+                    item=item,
+                    claimed_by=claimants[i % len(claimants)],
+                    message="It is mine",
+                    status=status,
+                )
+                for i, item in enumerate(make_items(count, self.finder, "found"))
+            )
+        return make_rows
+
+    def test_my_claims(self):
+        # standalone page: session, user, claims + items in one join
+        self.client.force_login(self.student)
+        self.assertQueryBudget(reverse("my_claims"), 3, self.rows("pending", [self.student]))
+
+    def test_pending_claims(self):
+        # standalone page: session, user, claims + items + claimants
+        self.client.force_login(self.admin)
+        self.assertQueryBudget(reverse("pending_claims"), 3, self.rows("pending"))
+
+    def test_approved_claims(self):
+        # session, user, unread count (base.html), claims + items + claimants
+        self.client.force_login(self.admin)
+        self.assertQueryBudget(reverse("approved_claims"), 4, self.rows("approved"))
+
+    def test_rejected_claims(self):
+        # session, user, unread count (base.html), claims + items + claimants
+        self.client.force_login(self.admin)
+        self.assertQueryBudget(reverse("rejected_claims"), 4, self.rows("rejected"))
+
+
+class BulkClaimDecisionTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", password="x", role="admin")
+        self.finder = User.objects.create_user("finder", password="x")
+        self.alice = User.objects.create_user("alice", password="x")
+        self.bob = User.objects.create_user("bob", password="x")
+        self.items = make_items(2, self.finder, "found", status="claimed")
+
+    def claim(self, item, user):
+        return Claim.objects.create(item=item, claimed_by=user, message="It is mine")
+
+    def statuses(self, model):
+        return dict(model.objects.values_list("id", "status"))
+
+    def test_bulk_approve(self):
+        first = self.claim(self.items[0], self.alice)
+        second = self.claim(self.items[1], self.alice)
+        competing = self.claim(self.items[0], self.bob)
+
+        self.assertEqual(bulk_approve_claims([first.id, second.id], self.admin), 2)
+
+        self.assertEqual(self.statuses(Claim), {
+            first.id: "approved", second.id: "approved", competing.id: "rejected",
+        })
+        self.assertEqual(set(self.statuses(Item).values()), {"returned"})
+        self.assertEqual(
+            set(NotificationOutbox.objects.values_list("dedupe_key", flat=True)),
+            {f"claim:{first.id}:approved", f"claim:{second.id}:approved", f"claim:{competing.id}:rejected"},
+        )
+
+    def test_bulk_reject(self):
+        claim = self.claim(self.items[0], self.alice)
+
+        self.assertEqual(bulk_reject_claims([claim.id], self.admin), 1)
+
+        self.assertEqual(Claim.objects.get().status, "rejected")
+        self.assertEqual(Item.objects.get(pk=self.items[0].pk).status, "unclaimed")
+        self.assertEqual(NotificationOutbox.objects.count(), 2)
+
+    def system_claim(self):
+        lost = make_items(1, self.alice, "lost", status="potential_match")[0]
+        found = make_items(1, self.finder, "found", status="potential_match", matched_lost_item=lost)[0]
+        return Claim.objects.create(
+            item=lost, matched_found_item=found, claimed_by=self.alice, created_by_system=True,
+        )
+
+    def test_rejecting_a_system_claim_unties_the_found_item(self):
+        claim = self.system_claim()
+
+        reject_claim(claim.id, self.admin)
+
+        found = Item.objects.get(pk=claim.matched_found_item_id)
+        self.assertEqual((found.status, found.matched_lost_item_id), ("unclaimed", None))
+        self.assertEqual(Item.objects.get(pk=claim.item_id).status, "unclaimed")
+
+    def test_bulk_reject_unties_found_items(self):
+        claims = [self.system_claim(), self.claim(self.items[0], self.bob)]
+
+        bulk_reject_claims([claim.id for claim in claims], self.admin)
+
+        found = Item.objects.get(pk=claims[0].matched_found_item_id)
+        self.assertEqual((found.status, found.matched_lost_item_id), ("unclaimed", None))
+        self.assertEqual(Item.objects.get(pk=self.items[0].pk).status, "unclaimed")
+
+    def test_two_claims_on_one_item_cannot_both_be_approved(self):
+        claims = [self.claim(self.items[0], self.alice), self.claim(self.items[0], self.bob)]
+
+        with self.assertRaises(ClaimDecisionError):
+            bulk_approve_claims([claim.id for claim in claims], self.admin)
+
+        self.assertEqual(set(self.statuses(Claim).values()), {"pending"})
+
+    def test_already_decided_claims_are_refused(self):
+        claim = self.claim(self.items[0], self.alice)
+        bulk_reject_claims([claim.id], self.admin)
+
+        with self.assertRaises(ClaimDecisionError):
+            bulk_approve_claims([claim.id], self.admin)
+
+    def test_claim_decided_concurrently_rolls_back_everything(self):
+        first = self.claim(self.items[0], self.alice)
+        second = self.claim(self.items[1], self.bob)
+        load_pending_claims = services._load_pending_claims
+
+        def decided_in_between(claim_ids):
+            rows = load_pending_claims(claim_ids)
+            Claim.objects.filter(pk=second.pk).update(status="rejected")
+            return rows
+
+        with mock.patch.object(services, "_load_pending_claims", decided_in_between):
+            with self.assertRaises(ConflictError):
+                bulk_approve_claims([first.id, second.id], self.admin)
+
+        self.assertEqual(Claim.objects.get(pk=first.pk).status, "pending")
+        self.assertEqual(set(self.statuses(Item).values()), {"claimed"})
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+    def test_stale_version_is_a_conflict(self):
+        claim = self.claim(self.items[0], self.alice)
+
+        with self.assertRaises(ConflictError):
+            approve_claim(claim.id, self.admin, version=claim.version + 1)
+
+        self.assertEqual(Claim.objects.get().status, "pending")
+
+
+class ClaimantLostReportTests(TestCase):
+
+    def setUp(self):
+        self.student = User.objects.create_user("student", password="x")
+        self.found = Item.objects.create(
+            reported_by=User.objects.create_user("finder", password="x"),
+            item_name="Black backpack", description="Backpack with a laptop sleeve",
+            category="Bags", color="black", location="Library", item_type="found",
+        )
+        self.client.force_login(self.student)
+
+    def lost(self, name, description):
+        return Item.objects.create(
+            reported_by=self.student, item_name=name, description=description,
+            category="Bags", color="black", location="Gym", item_type="lost",
+        )
+
+    def test_category_and_color_alone_are_not_a_match(self):
+        self.lost("Umbrella", "Folding umbrella")  # same category and color
+
+        self.assertEqual(find_user_lost_reports(self.student, self.found), [])
+        response = self.client.get(reverse("create_claim", args=[self.found.id]))
+        self.assertTemplateUsed(response, "claims/missing_lost_warning.html")
+
+    def test_short_item_name_is_a_match(self):
+        bag = self.lost("Bag", "")
+        self.found.item_name, self.found.description = "Black bag", "Left in the reading room"
+        self.found.save()
+
+        self.assertEqual(find_user_lost_reports(self.student, self.found), [bag])
+
+        # whole words only: "bag" in "backpack" / "handbags" is no match
+        self.found.item_name, self.found.description = "Handbags", "Backpack"
+        self.found.save()
+        self.assertEqual(find_user_lost_reports(self.student, self.found), [])
+
+    def test_shared_keyword_is_a_match(self):
+        backpack = self.lost("Backpack", "Black backpack, red keychain")
+
+        self.assertEqual(find_user_lost_reports(self.student, self.found), [backpack])
+        response = self.client.get(reverse("create_claim", args=[self.found.id]))
+        self.assertTemplateUsed(response, "claims/create_claim.html")
+
+
+class EvidenceScoreTests(TestCase):
+
+    def setUp(self):
+        self.student = User.objects.create_user("student", password="x")
+        finder = User.objects.create_user("finder", password="x")
+        self.found = make_items(1, finder, "found", color_bucket=normalize_color("black"))[0]
+
+    def manual_claim(self, **evidence):
+        return Claim.objects.create(item=self.found, claimed_by=self.student, **evidence)
+
+    def test_manual_and_system_claims_share_one_scale(self):
+        manual = self.manual_claim(
+            where_lost="Library", when_lost=date(2025, 1, 2),
+            identifying_marks="Black leather wallet with my student card",
+        )
+        lost = make_items(1, self.student, "lost", color_bucket=normalize_color("black"))[0]
+        system = Claim.objects.create(
+            item=lost, matched_found_item=self.found, claimed_by=self.student, created_by_system=True,
+        )
+
+        self.assertEqual(manual.evidence_score, 100)
+        self.assertEqual(system.evidence_score, 100)
+
+    def test_backfill_migration_matches_the_scorer(self):
+        self.manual_claim(where_lost="Library", identifying_marks="Black wallet")
+        lost = make_items(1, self.student, "lost", color_bucket=normalize_color("black"))[0]
+        Claim.objects.create(item=lost, matched_found_item=self.found, claimed_by=self.student)
+        scores = dict(Claim.objects.values_list("id", "evidence_score"))
+
+        Claim.objects.update(evidence_score=0)
+        migration = importlib.import_module("claims.migrations.0006_claim_evidence_score")
+        migration.score_existing_claims(apps, None)
+
+        self.assertEqual(dict(Claim.objects.values_list("id", "evidence_score")), scores)
+
+    def test_partial_manual_evidence_is_scaled(self):
+        claim = self.manual_claim(where_lost="Library")  # location only: 20 of 60
 
-# Create your tests here.
+        self.assertEqual(claim.evidence_score, 33)
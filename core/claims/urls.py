@@ -3,6 +3,7 @@ from .views import (
     create_claim,
     my_claims,
     pending_claims,
+    bulk_claim_decision,
     review_claim,
     claim_confirmation,
     approved_claims,
@@ -13,6 +14,7 @@ urlpatterns = [
     path('create/<int:item_id>/', create_claim, name='create_claim'),
     path('my/', my_claims, name='my_claims'),
     path('pending/', pending_claims, name='pending_claims'),
+    path('pending/bulk/', bulk_claim_decision, name='bulk_claim_decision'),
     path('review/<int:claim_id>/', review_claim, name='review_claim'),
     path('confirm/<int:item_id>/', claim_confirmation, name= 'claim_confirmation'),
     path('approved/', approved_claims, name='approved_claims'),
@@ -4,10 +4,12 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.urls import reverse
 from django.utils import timezone
 
+from items.concurrency import ConflictError
+from items.matching import find_user_lost_reports
 from items.models import Item
 from .models import Claim
 from .forms import ClaimCreateForm, ClaimReviewForm
-from users.models import Notification
+from .services import approve_claim, reject_claim, bulk_approve_claims, bulk_reject_claims
 
 
 def is_staff_or_admin(user):
@@ -32,16 +34,10 @@ def create_claim(request, item_id):
     bypass = request.GET.get("bypass", "no") == "yes"
 
     # STEP 1 — Check if user has a matching lost item
-    similar_lost = Item.objects.filter(
-        reported_by=request.user,
-        item_type='lost',
-        item_name__icontains=item.item_name,
-        color__icontains=item.color,
-        category__icontains=item.category
-    )
+    similar_lost = find_user_lost_reports(request.user, item)
 
     # STEP 2 — If user has NO similar lost report AND not bypassed → show warning page
-    if not similar_lost.exists() and not bypass:
+    if not similar_lost and not bypass:
         return render(request, "claims/missing_lost_warning.html", {
             "item": item,
         })
@@ -53,7 +49,7 @@ def create_claim(request, item_id):
             claim = form.save(commit=False)
             claim.item = item
             claim.claimed_by = request.user
-            claim.matched_lost_exists = similar_lost.exists()
+            claim.matched_lost_exists = bool(similar_lost)
             claim.status = "pending"
             claim.save()
             return redirect('dashboard')
@@ -93,105 +89,80 @@ def claim_confirmation(request, item_id):
 # ===============================================================
 @user_passes_test(is_staff_or_admin)
 def pending_claims(request):
+    # Served from claim_review_queue_idx: strongest evidence first
     claims = Claim.objects.filter(
         status='pending'
-    ).select_related('item', 'claimed_by').order_by('created_at')
+    ).select_related('item', 'claimed_by').order_by('-evidence_score', 'created_at')
 
     return render(request, 'claims/pending_claims.html', {'claims': claims})
 
 
+# ===============================================================
+# ADMIN — BULK APPROVE / REJECT PENDING CLAIMS
+# ===============================================================
+@user_passes_test(is_staff_or_admin)
+def bulk_claim_decision(request):
+    if request.method != 'POST':
+        return redirect('pending_claims')
+
+    claim_ids = [int(i) for i in request.POST.getlist('claim_ids') if i.isdigit()]
+    decision = request.POST.get('decision')
+
+    if claim_ids:
+        try:
+            if decision == 'approve':
+                bulk_approve_claims(claim_ids, request.user)
+            elif decision == 'reject':
+                bulk_reject_claims(claim_ids, request.user)
+        except ConflictError as e:
+            return HttpResponse(str(e), status=409)
+
+    return redirect('pending_claims')
+
+
 # ===============================================================
 # ADMIN — REVIEW CLAIM (APPROVE / REJECT)
 # ===============================================================
 @login_required
 def review_claim(request, claim_id):
-    claim = get_object_or_404(Claim, id=claim_id)
-    item = claim.item
-
-    # Find matching lost items from the claimant
-    matching_lost = Item.objects.filter(
-        reported_by=claim.claimed_by,
-        item_type='lost',
-        item_name__icontains=item.item_name,
-        color__icontains=item.color,
-        category__icontains=item.category
+    claim = get_object_or_404(
+        Claim.objects.select_related('item', 'claimed_by'), id=claim_id
     )
+    item = claim.item
 
     if request.method == 'POST':
         decision = request.POST.get('decision')
-        claim.admin_note = request.POST.get('admin_note', '')
-
-        # =======================================================
-        # APPROVE CLAIM
-        # =======================================================
-        if decision == 'approve':
-            claim.status = 'approved'
-            claim.save()
+        note = request.POST.get('admin_note', '')
 
-            # Mark found item as returned
-            item.status = 'returned'
-            item.save()
+        # Version of the claim the reviewer saw when the page was rendered
+        try:
+            version = int(request.POST['version'])
+        except (KeyError, ValueError):
+            version = None
 
-            other_claims = Claim.objects.filter(
-                item = item
-            ).exclude(id=claim.id)
+        try:
+            # APPROVE CLAIM (competing claims are rejected automatically)
+            if decision == 'approve':
+                approve_claim(claim.id, request.user, note, version)
+                return redirect('dashboard')
 
-            for other in other_claims:
-                other.status = 'rejected'
-                other.save()
+            # REJECT CLAIM (item goes back to the unclaimed pool)
+            elif decision == 'reject':
+                reject_claim(claim.id, request.user, note, version)
+                return redirect('dashboard')
 
-                #Notify other users
-                Notification.objects.create(
-                    user=other.claimed_by,
-                    message=f'Your claim for "{item.item_name}" was automatically rejected'
-                )
-
-            # Notify student
-            Notification.objects.create(
-                user=claim.claimed_by,
-                message=f"Your claim for '{claim.item.item_name}' has been APPROVED 🎉"
-            )
-
-            return redirect('dashboard')
+        except ConflictError as e:
+            return HttpResponse(str(e), status=409)
 
-        # =======================================================
-        # REJECT CLAIM
-        # =======================================================
-        elif decision == 'reject':
-            claim.status = 'rejected'
-            claim.save()
-
-            # Put the item back into "unclaimed" pool
-            item.status = "unclaimed"
-            item.save()
-
-            # Reset matched lost item (if any)
-            if hasattr(item, "matched_lost_item") and item.matched_lost_item:
-                lost = item.matched_lost_item
-                lost.status = "unmatched"
-                lost.save()
-                item.matched_lost_item = None
-                item.save()
-
-            # Notify student
-            Notification.objects.create(
-                user=claim.claimed_by,
-                message=f"Your claim for '{claim.item.item_name}' has been REJECTED ❌"
-            )
-
-            # Notify finder (optional)
-            Notification.objects.create(
-                user=item.reported_by,
-                message=f"The item you found ('{item.item_name}') was not matched and is again visible in Found Items."
-            )
-
-            return redirect('dashboard')
+    # Find matching lost items from the claimant
+    matching_lost = find_user_lost_reports(claim.claimed_by, item)
 
     # RENDER CLAIM REVIEW PAGE
     return render(request, 'claims/review_claim.html', {
         'claim': claim,
         'item': item,
         'matching_lost': matching_lost,
+        'claimant_matching_lost': matching_lost,
     })
 
 from django.contrib.auth.decorators import login_required, user_passes_test
@@ -14,3 +14,19 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+# Single-node: deliver outbox notifications in this process so the
+# in-memory broker can push them to open dashboards.
+from django.conf import settings  # noqa: E402
+
+if getattr(settings, 'NOTIFICATION_DISPATCH_IN_PROCESS', False):
+    from users.notifications import start_dispatcher_thread
+
+    start_dispatcher_thread()
+
+# Same for uploaded images: the request only stores the file, this
+# worker resizes it (Pillow work in a process pool).
+if getattr(settings, 'IMAGE_PROCESSING_IN_PROCESS', False):
+    from items.images import start_image_worker_thread
+
+    start_image_worker_thread()
@@ -43,10 +43,14 @@ INSTALLED_APPS = [
     'users',
     'items',
     'claims',
-    'search_ai'
+    'search_ai',
+    'analytics',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
+    # first: its timings cover every other middleware
+    'monitoring.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,13 +58,16 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # last: runs the view itself when a staff member asks for a profile
+    'monitoring.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates + render timing for monitoring
+        'BACKEND': 'monitoring.template_backend.TimedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -73,6 +80,7 @@ TEMPLATES = [
                 'django.template.context_processors.i18n',
                 'django.template.context_processors.media',
                 'django.template.context_processors.tz',
+                'users.context_processors.notifications',
             ],
         },
     },
@@ -86,6 +94,23 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 # Required fields
 DEFAULT_FROM_EMAIL = "noreply@lostfound.com"
 
+# Notification email digests (manage.py send_notification_digests)
+NOTIFICATION_DIGEST_WINDOW_HOURS = 24
+
+# Read notifications older than this move to the archive table
+# (manage.py archive_notifications)
+NOTIFICATION_RETENTION_DAYS = 30
+
+# Staff dashboard counters from the DashboardStats row
+# (refresh with manage.py reconcile_dashboard_stats, e.g. every 15 min).
+# After writes the row is recounted on read at most every
+# DASHBOARD_STATS_MIN_AGE seconds: counts lag writes by up to that long,
+# and one dashboard view per window pays the full recount (an aggregate
+# scan of items and claims). Lower it for fresher counts, raise it when
+# the tables grow.
+DASHBOARD_STATS_MATERIALIZED = True
+DASHBOARD_STATS_MIN_AGE = 30
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -102,6 +127,52 @@ DATABASES = {
 }
 
 
+# Cache (unread notification counters, ...)
+# Use a shared backend (Redis / Memcached) when running several processes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'lostfound',
+    }
+}
+
+
+# Real-time notifications
+# The site is served over WSGI, where the dashboard polls
+# /notifications/unread-count/ every NOTIFICATION_POLL_SECONDS.
+# NOTIFICATION_SSE turns on the Server-Sent Events stream, which is only
+# served to requests coming through core/asgi.py. InMemoryBroker only
+# reaches streams in the same process, so SSE with it requires a single
+# ASGI process with NOTIFICATION_DISPATCH_IN_PROCESS on; with several
+# processes plug in a shared NotificationBroker (Redis pub/sub, ...) and
+# run `manage.py dispatch_notifications --loop` instead.
+NOTIFICATION_BROKER = 'users.broker.InMemoryBroker'
+NOTIFICATION_SSE = False
+NOTIFICATION_DISPATCH_IN_PROCESS = False
+NOTIFICATION_POLL_SECONDS = 30
+
+# notify() queues rows in NotificationOutbox. Without a worker draining
+# it (dispatch_notifications --loop, or the ASGI thread above) the rows
+# of the users just notified are dispatched right after the writing
+# transaction commits (one batch; older backlog is left to the worker).
+# Turn this off once a worker runs, to keep the dispatch out of the request.
+NOTIFICATION_DISPATCH_ON_COMMIT = True
+
+# Uploaded item images are stored as-is and processed off-request
+# (items.images): auto-orient, strip metadata, downscale originals above
+# IMAGE_MAX_EDGE px, WebP/JPEG derivatives. Run the worker next to the web
+# server:
+#   python manage.py process_images --loop
+# Until it runs, new uploads stay image_status='pending' (no derivatives).
+# IMAGE_PROCESSING_IN_PROCESS instead starts a worker thread in every web
+# process (core/wsgi.py, core/asgi.py) — only sensible with one process.
+# Each worker has its own pool of IMAGE_WORKER_PROCESSES processes
+# (None → one per core), so N workers use up to N × that many.
+IMAGE_MAX_EDGE = 2560
+IMAGE_WORKER_PROCESSES = None
+IMAGE_PROCESSING_IN_PROCESS = False
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -139,6 +210,19 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    # Item photos: named by SHA-256, stored once, reference counted
+    'item_images': {
+        'BACKEND': 'items.storage.ContentAddressedStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -146,3 +230,35 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Media is served by items.media.serve_media (permission check, ETag /
+# Last-Modified, Range, year-long Cache-Control for content-addressed
+# names). The bytes go out through the front server when
+# MEDIA_SENDFILE_BACKEND is set:
+#   'nginx'    → X-Accel-Redirect to MEDIA_ACCEL_PREFIX, e.g.
+#                location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+#   'sendfile' → X-Sendfile (Apache mod_xsendfile, lighttpd)
+#   None       → FileResponse (sendfile through wsgi.file_wrapper)
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_REQUIRE_LOGIN = False
+MEDIA_CACHE_SECONDS = 3600
+
+# Request metrics (monitoring): per-view histograms at /monitoring/metrics/
+# for staff or a scraper sending "Authorization: Bearer <METRICS_TOKEN>".
+# Requests slower than REQUEST_SLOW_MS are logged with their slowest query.
+METRICS_TOKEN = None
+REQUEST_SLOW_MS = 500
+
+# View queries slower than SLOW_QUERY_MS are grouped by normalized SQL with
+# an EXPLAIN (monitoring.SlowQuery, `manage.py slow_queries`). None → off.
+# The EXPLAIN and the writes run in a background thread per process, after
+# the response; requests beyond MAX_PENDING_FLUSHES waiting are dropped.
+SLOW_QUERY_MS = 100
+
+# On-demand profiling (monitoring.profiling): staff add ?_profile=1 (or
+# send "X-Profile: 1") to profile that one request. Profiles are listed
+# at /monitoring/profiles/; only the newest PROFILE_KEEP are kept.
+PROFILING_ENABLED = False
+PROFILE_DIR = os.path.join(BASE_DIR, 'profiles')
+PROFILE_KEEP = 50
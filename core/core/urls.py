@@ -17,10 +17,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
 from django.shortcuts import redirect
 from django.contrib.auth import views as auth_views
 
+from items.media import serve_media
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', lambda request: redirect('login'), name='root_redirect'),
@@ -28,7 +29,7 @@ urlpatterns = [
     path('items/',include('items.urls')),
     path('ai/',include('search_ai.urls')),
     path('claims/',include('claims.urls')),
+    path('analytics/',include('analytics.urls')),
+    path('monitoring/',include('monitoring.urls')),
+    path(settings.MEDIA_URL.lstrip('/') + '<path:path>', serve_media, name='serve_media'),
 ]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root = settings.MEDIA_ROOT)
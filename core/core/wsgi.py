@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+# Single-process deployments: resize uploaded images in this process
+# (see IMAGE_PROCESSING_IN_PROCESS); otherwise run `process_images --loop`.
+from django.conf import settings  # noqa: E402
+
+if getattr(settings, 'IMAGE_PROCESSING_IN_PROCESS', False):
+    from items.images import start_image_worker_thread
+
+    start_image_worker_thread()
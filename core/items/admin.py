@@ -1,5 +1,7 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from .concurrency import ConflictError
 from .models import Item
+from .services import bulk_approve_matches, bulk_reject_matches
 
 @admin.register(Item)
 class ItemAdmin(admin.ModelAdmin):
@@ -7,3 +9,24 @@ class ItemAdmin(admin.ModelAdmin):
                     'status','reported_by','date_reported')
     list_filter = ('item_type','category','status','location')
     search_fields = ('item_name','description','location','reported_by_username')
+    actions = ('approve_matches', 'reject_matches')
+
+    def _decide(self, request, queryset, decide, verb):
+        found_ids = list(
+            queryset.filter(item_type='found', status='potential_match')
+            .values_list('id', flat=True)
+        )
+        try:
+            count = decide(found_ids)
+        except ConflictError as e:
+            self.message_user(request, str(e), messages.ERROR)
+            return
+        self.message_user(request, f"{count} match(es) {verb}.", messages.SUCCESS)
+
+    @admin.action(description="Approve selected pending matches")
+    def approve_matches(self, request, queryset):
+        self._decide(request, queryset, bulk_approve_matches, "approved")
+
+    @admin.action(description="Reject selected pending matches")
+    def reject_matches(self, request, queryset):
+        self._decide(request, queryset, bulk_reject_matches, "rejected")
@@ -0,0 +1,80 @@
+# items/blobs.py
+
+import logging
+
+from django.db import transaction
+from django.db.models import F
+
+from .image_ops import DERIVATIVE_FORMATS, DERIVATIVE_SIZES, derivative_name
+from .models import StoredBlob, item_image_storage
+from .storage import is_content_addressed
+
+
+logger = logging.getLogger(__name__)
+
+
+def retain_blob(name, content=None):
+    """
+    An item now points at `name`: one more reference. `content` (the
+    uploaded file) is written again if a release that raced with the
+    upload deleted the file after storage.save() found it in place.
+    """
+    if not is_content_addressed(name):
+        return
+
+    storage = item_image_storage()
+    with transaction.atomic():
+        blob, _ = StoredBlob.objects.select_for_update().get_or_create(name=name)
+
+        if blob.refcount == 0:
+            # new, or released and its files possibly gone (_delete_files)
+            if not storage.exists(name):
+                if content is None:
+                    logger.warning("Blob %s is missing and cannot be restored", name)
+                else:
+                    storage._save(name, content)
+            blob.size = storage.size(name) if storage.exists(name) else 0
+
+        StoredBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') + 1, size=blob.size)
+
+
+def _delete_files(name):
+    """
+    on_commit of the last release. Re-checked under the row lock: an
+    upload of the same bytes may have retained the blob again since.
+    """
+    storage = item_image_storage()
+    names = [name] + [
+        derivative_name(name, size, extension)
+        for size in DERIVATIVE_SIZES
+        for _, extension, _ in DERIVATIVE_FORMATS.values()
+    ]
+
+    with transaction.atomic():
+        blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+        if blob is None or blob.refcount:
+            return
+
+        for stored in names:
+            if storage.exists(stored):
+                storage.delete(stored)
+        blob.delete()
+
+
+def release_blob(name):
+    """
+    An item stopped pointing at `name` (deleted / image replaced). The
+    last reference deletes the blob and its derivatives once committed;
+    the row stays at refcount 0 until then so retain_blob() waits on it.
+    """
+    if not is_content_addressed(name):
+        return
+
+    with transaction.atomic():
+        blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+        if blob is None or blob.refcount == 0:
+            return
+
+        StoredBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') - 1)
+        if blob.refcount == 1:
+            transaction.on_commit(lambda: _delete_files(name))
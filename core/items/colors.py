@@ -0,0 +1,99 @@
+# items/colors.py
+#
+# Canonical color buckets shared by free-text colors and photos.
+# No Django imports: dominant_color runs in the image worker's process pool.
+
+import re
+
+import numpy as np
+from PIL import Image
+
+
+# (bucket id, name, reference RGB) — ids are stored in Item.color_bucket,
+# never renumber them
+PALETTE = (
+    (1, 'black', (20, 20, 20)),
+    (2, 'white', (240, 240, 240)),
+    (3, 'gray', (128, 128, 128)),
+    (4, 'red', (200, 30, 30)),
+    (5, 'orange', (240, 130, 30)),
+    (6, 'yellow', (240, 220, 40)),
+    (7, 'green', (40, 150, 60)),
+    (8, 'blue', (40, 80, 200)),
+    (9, 'purple', (120, 50, 160)),
+    (10, 'pink', (240, 140, 180)),
+    (11, 'brown', (110, 70, 35)),
+    (12, 'beige', (220, 200, 160)),
+)
+
+COLOR_BUCKET_CHOICES = tuple((bucket, name.capitalize()) for bucket, name, _ in PALETTE)
+
+BUCKET_IDS = {name: bucket for bucket, name, _ in PALETTE}
+
+# Free-text color words → bucket name
+COLOR_SYNONYMS = {
+    'black': 'black', 'jet': 'black', 'ebony': 'black', 'onyx': 'black', 'charcoal': 'black',
+    'white': 'white', 'ivory': 'white', 'cream': 'white', 'offwhite': 'white', 'snow': 'white',
+    'gray': 'gray', 'grey': 'gray', 'silver': 'gray', 'ash': 'gray', 'slate': 'gray',
+    'graphite': 'gray', 'metallic': 'gray', 'gunmetal': 'gray',
+    'red': 'red', 'maroon': 'red', 'burgundy': 'red', 'crimson': 'red', 'scarlet': 'red',
+    'wine': 'red', 'cherry': 'red', 'ruby': 'red',
+    'orange': 'orange', 'coral': 'orange', 'peach': 'orange', 'amber': 'orange', 'rust': 'orange',
+    'yellow': 'yellow', 'gold': 'yellow', 'golden': 'yellow', 'mustard': 'yellow', 'lemon': 'yellow',
+    'green': 'green', 'olive': 'green', 'lime': 'green', 'mint': 'green', 'teal': 'green',
+    'emerald': 'green', 'khaki': 'green', 'sage': 'green', 'forest': 'green',
+    'blue': 'blue', 'navy': 'blue', 'azure': 'blue', 'cyan': 'blue', 'turquoise': 'blue',
+    'cobalt': 'blue', 'indigo': 'blue', 'denim': 'blue', 'sky': 'blue', 'royal': 'blue',
+    'purple': 'purple', 'violet': 'purple', 'lavender': 'purple', 'lilac': 'purple',
+    'plum': 'purple', 'magenta': 'purple', 'mauve': 'purple',
+    'pink': 'pink', 'rose': 'pink', 'fuchsia': 'pink', 'salmon': 'pink', 'blush': 'pink',
+    'brown': 'brown', 'tan': 'brown', 'chocolate': 'brown', 'coffee': 'brown', 'camel': 'brown',
+    'leather': 'brown', 'mocha': 'brown', 'bronze': 'brown', 'copper': 'brown',
+    'beige': 'beige', 'sand': 'beige', 'nude': 'beige', 'taupe': 'beige', 'champagne': 'beige',
+}
+
+
+def normalize_color(text):
+    """
+    Bucket id for a free-text color ("Navy", "dark blue ", "grey/black")
+    or None when no word is known. The last known word wins, so
+    "light grey-blue" → blue.
+    """
+    words = re.findall(r"[a-z]+", (text or "").lower().replace("off-white", "offwhite"))
+    for word in reversed(words):
+        name = COLOR_SYNONYMS.get(word)
+        if name:
+            return BUCKET_IDS[name]
+    return None
+
+
+# ---------------------------------------------------------
+# DOMINANT COLOR OF A PHOTO
+# ---------------------------------------------------------
+_PALETTE_IDS = np.array([bucket for bucket, _, _ in PALETTE])
+_PALETTE_RGB = np.array([rgb for _, _, rgb in PALETTE], dtype=np.float32)
+
+# Perceptual-ish weights for RGB distance (green differences stand out most)
+_CHANNEL_WEIGHTS = np.array([0.30, 0.59, 0.11], dtype=np.float32) * 3
+
+
+def dominant_color(image, sample_size=64):
+    """
+    Bucket id of the dominant color of a PIL image. Works on a
+    `sample_size` px downsample: every pixel is assigned to its nearest
+    palette color in one vectorized step, votes are weighted towards the
+    centre (the item) and away from the borders (table, floor, background).
+    """
+    small = image.resize((sample_size, sample_size), Image.BILINEAR, reducing_gap=3.0).convert('RGB')
+    pixels = np.asarray(small, dtype=np.float32).reshape(-1, 3)
+
+    # (pixels, palette) squared distances by broadcasting
+    diff = pixels[:, None, :] - _PALETTE_RGB[None, :, :]
+    nearest = np.argmin((diff * diff * _CHANNEL_WEIGHTS).sum(axis=2), axis=1)
+
+    # gaussian centre weighting
+    axis = np.linspace(-1.0, 1.0, sample_size, dtype=np.float32)
+    weights = np.exp(-(axis[:, None] ** 2 + axis[None, :] ** 2) / 0.5).reshape(-1)
+
+    votes = np.bincount(nearest, weights=weights, minlength=len(PALETTE))
+    return int(_PALETTE_IDS[int(np.argmax(votes))])
@@ -0,0 +1,49 @@
+# items/concurrency.py
+
+from django.db.models import F
+from django.utils import timezone
+
+from .signals import rows_updated
+
+
+class ConflictError(Exception):
+    """Someone else changed the row since it was read."""
+
+
+def conditional_update(instance, expected_version=None, **changes):
+    """
+    Optimistic state transition:
+
+        UPDATE ... SET <changes>, version = version + 1
+        WHERE id = <pk> AND version = <expected_version>
+
+    Only the given fields are written. `expected_version` defaults to the
+    version the instance was loaded with (pass the one the user saw on the
+    page to catch changes made between page view and submit).
+    Raises ConflictError when the row changed in between.
+    """
+    model = type(instance)
+
+    if expected_version is None:
+        expected_version = instance.version
+
+    # .update() skips auto_now
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        changes.setdefault("updated_at", timezone.now())
+
+    updated = model.objects.filter(pk=instance.pk, version=expected_version).update(
+        version=F("version") + 1,
+        **changes,
+    )
+
+    if not updated:
+        raise ConflictError(
+            f"{model._meta.verbose_name.capitalize()} #{instance.pk} was changed by "
+            f"someone else. Please reload the page and try again."
+        )
+
+    for name, value in changes.items():
+        setattr(instance, name, value)
+    instance.version = expected_version + 1
+
+    rows_updated.send(sender=model)
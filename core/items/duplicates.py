@@ -0,0 +1,158 @@
+# items/duplicates.py
+
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from itertools import combinations
+
+from django.utils import timezone
+
+from .image_ops import hamming_distance
+from .models import Item
+
+
+# Max differing bits (of 64) for two photos to count as the same item
+DUPLICATE_HASH_DISTANCE = 6
+
+# How often (seconds) a process pulls hashes written by other processes
+DUPLICATE_INDEX_REFRESH = 1.0
+
+# Found items that can still be reported twice
+OPEN_FOUND_STATUSES = ('unclaimed', 'unmatched', 'potential_match', 'matched', 'claimed')
+
+
+# Item.image_hash is a signed BIGINT; hashes are unsigned 64-bit
+def to_signed(value):
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+class MultiIndexHash:
+    """
+    Multi-index hashing over 64-bit hashes: each hash is filed under its
+    four 16-bit chunks. Two hashes within distance r share at least one
+    chunk within r // 4 bits (pigeonhole), so a lookup probes each chunk's
+    near neighbours (17 buckets per chunk for r <= 7) and checks only the
+    few hashes found there — instead of scanning every hash.
+    """
+
+    CHUNKS = 4
+    CHUNK_BITS = 16
+
+    def __init__(self):
+        self.tables = [defaultdict(set) for _ in range(self.CHUNKS)]
+
+    def _chunks(self, value):
+        mask = (1 << self.CHUNK_BITS) - 1
+        return [(value >> (i * self.CHUNK_BITS)) & mask for i in range(self.CHUNKS)]
+
+    def _probes(self, chunk, radius):
+        for flips in range(radius + 1):
+            for bits in combinations(range(self.CHUNK_BITS), flips):
+                probe = chunk
+                for bit in bits:
+                    probe ^= 1 << bit
+                yield probe
+
+    def add(self, value, item_id):
+        for table, chunk in zip(self.tables, self._chunks(value)):
+            table[chunk].add((value, item_id))
+
+    def search(self, value, radius):
+        """[(distance, item_id)] of every hash within `radius`."""
+        found = set()
+        for table, chunk in zip(self.tables, self._chunks(value)):
+            for probe in self._probes(chunk, radius // self.CHUNKS):
+                for other, item_id in table.get(probe, ()):
+                    distance = hamming_distance(value, other)
+                    if distance <= radius:
+                        found.add((distance, item_id))
+        return list(found)
+
+
+class FoundImageIndex:
+    """
+    Per-process multi-index table of found-item image hashes. Loaded on first use,
+    then topped up from rows updated since the last sync (item_updated_idx);
+    lookups re-check candidates against the database, so stale entries
+    (item returned, image replaced) never surface.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.table = None
+        self.indexed = {}   # item id → hash already in the table
+        self.synced_at = None
+        self.checked_at = 0.0
+
+    def _add(self, item_id, value):
+        value = to_unsigned(value)
+        if self.indexed.get(item_id) != value:
+            self.indexed[item_id] = value
+            self.table.add(value, item_id)
+
+    def _load(self, queryset):
+        for item_id, value in queryset.values_list('id', 'image_hash'):
+            self._add(item_id, value)
+
+    def refresh(self, force=False):
+        with self.lock:
+            if not force and self.table is not None and time.monotonic() - self.checked_at < DUPLICATE_INDEX_REFRESH:
+                return
+
+            found = Item.objects.filter(item_type='found', image_hash__isnull=False)
+            now = timezone.now()
+
+            if self.table is None or force:
+                self.table = MultiIndexHash()
+                self.indexed = {}
+                self._load(found)
+            else:
+                # small overlap so rows committed around the last sync aren't missed
+                self._load(found.filter(updated_at__gte=self.synced_at - timedelta(seconds=5)))
+
+            self.synced_at = now
+            self.checked_at = time.monotonic()
+
+    def add(self, item):
+        with self.lock:
+            if self.table is not None and item.image_hash is not None:
+                self._add(item.pk, item.image_hash)
+
+    def candidates(self, value, radius):
+        self.refresh()
+        with self.lock:
+            return self.table.search(value, radius)
+
+
+found_image_index = FoundImageIndex()
+
+
+def find_duplicate_found_items(image_hash, max_distance=DUPLICATE_HASH_DISTANCE, exclude_id=None):
+    """
+    Open FOUND items whose photo looks like `image_hash` (unsigned dhash),
+    closest first. In-memory multi-index lookup + one primary-key query.
+    """
+    distances = {}
+    for distance, item_id in found_image_index.candidates(image_hash, max_distance):
+        if item_id != exclude_id:
+            distances[item_id] = min(distance, distances.get(item_id, distance))
+
+    if not distances:
+        return []
+
+    items = [
+        item
+        for item in Item.objects.filter(
+            id__in=distances, item_type='found', status__in=OPEN_FOUND_STATUSES,
+            image_hash__isnull=False,
+        )
+        # image replaced since it was indexed → use the current hash
+        if hamming_distance(to_unsigned(item.image_hash), image_hash) <= max_distance
+    ]
+    items.sort(key=lambda item: hamming_distance(to_unsigned(item.image_hash), image_hash))
+    return items
@@ -1,4 +1,6 @@
 from django import forms
+from django.db.models import Q
+from .colors import normalize_color
 from .models import Item
 
 
@@ -133,6 +135,63 @@ class ItemSearchForm(forms.Form):
         label="To date"
     )
 
+    def filter_items(self, queryset, prefix=""):
+        """
+        Apply the cleaned filters to an Item queryset — or, with a prefix
+        like "item__", to a queryset of rows pointing at items (claims).
+        """
+        data = self.cleaned_data
+
+        keyword = data.get("keyword")
+        if keyword:
+            queryset = queryset.filter(
+                Q(**{f"{prefix}item_name__icontains": keyword})
+                | Q(**{f"{prefix}description__icontains": keyword})
+            )
+
+        for name in ("category", "location"):
+            if data.get(name):
+                queryset = queryset.filter(**{f"{prefix}{name}__icontains": data[name]})
+
+        # known color words → indexed bucket lookup; anything else → text match
+        color = data.get("color")
+        if color:
+            bucket = normalize_color(color)
+            if bucket:
+                queryset = queryset.filter(**{f"{prefix}color_bucket": bucket})
+            else:
+                queryset = queryset.filter(**{f"{prefix}color__icontains": color})
+
+        if data.get("item_type"):
+            queryset = queryset.filter(**{f"{prefix}item_type": data["item_type"]})
+
+        # Lost and found dates are separate columns: both bounds must hold
+        # on the same one, or a range could match across the two
+        date_range = date_range_q(data.get("start_date"), data.get("end_date"), prefix)
+        if date_range:
+            queryset = queryset.filter(date_range)
+
+        return queryset
+
+
+def date_range_q(start_date, end_date, prefix=""):
+    """
+    Q for items whose lost or found date lies within [start_date, end_date]
+    (either bound may be None); None when neither is given.
+    """
+    if not start_date and not end_date:
+        return None
+
+    query = Q()
+    for field in ("date_lost", "date_found"):
+        bounds = {}
+        if start_date:
+            bounds[f"{prefix}{field}__gte"] = start_date
+        if end_date:
+            bounds[f"{prefix}{field}__lte"] = end_date
+        query |= Q(**bounds)
+    return query
+
 class FoundFromLostItemForm(forms.ModelForm):
     class Meta:
         model = Item
@@ -0,0 +1,130 @@
+# items/image_ops.py
+#
+# Pure Pillow/NumPy work (no Django imports): runs inside the image worker's
+# process pool, see items.images.
+
+import io
+import os
+
+from PIL import Image, ImageOps
+
+from .colors import dominant_color
+
+
+# Originals larger than this (longest edge, px) are downscaled in place
+MAX_ORIGINAL_EDGE = 2560
+
+# Longest edge in px of each derivative (listings use thumb/card, detail
+# views the biggest one). Never upscaled.
+DERIVATIVE_SIZES = {
+    'thumb': 200,
+    'card': 480,
+    'detail': 1200,
+}
+
+# format → (Pillow format, file extension, save options)
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Formats an original is re-encoded in (keeps its file name valid); others
+# are kept as uploaded
+ORIGINAL_FORMATS = {
+    'JPEG': {'quality': 88, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 85},
+}
+
+
+def derivative_name(original_name, size, extension):
+    # item_images/IMG_1234.jpg → item_images/IMG_1234.card.webp (next to the original)
+    root, _ = os.path.splitext(original_name)
+    return f"{root}.{size}.{extension}"
+
+
+def _encode(image, pil_format, options):
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def dhash(image, hash_size=8):
+    """
+    64-bit difference hash of a PIL image: grayscale, shrink to 9×8 and
+    compare neighbouring pixels. Re-encodes, resizes and small edits move
+    only a few bits (compare with hamming_distance).
+    """
+    small = image.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(small.getdata())
+
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hash_upload(file):
+    """dhash of an uploaded file; JPEGs are decoded at reduced size (fast)."""
+    file.seek(0)
+    image = Image.open(file)
+    image.draft('L', (64, 64))
+    value = dhash(ImageOps.exif_transpose(image))
+    file.seek(0)
+    return value
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+def render_image(data, max_edge=MAX_ORIGINAL_EDGE):
+    """
+    Decode an upload, rotate it according to EXIF and render every
+    derivative size × format; metadata is dropped (pixels only, the
+    color profile is kept on the original).
+    Returns {"original": bytes | None, "files": {(size, format): bytes},
+    "derivatives": {size: {"width", "height"}}, "hash": dhash,
+    "color_bucket": dominant color} where "original" is the upload
+    re-encoded without metadata (EXIF / GPS, XMP, comments), downscaled
+    to `max_edge`; None for formats outside ORIGINAL_FORMATS.
+    """
+    image = Image.open(io.BytesIO(data))
+    original_format = image.format
+    icc_profile = image.info.get('icc_profile')
+    image.load()
+    image = ImageOps.exif_transpose(image)
+
+    original = None
+    if original_format in ORIGINAL_FORMATS:
+        if max(image.size) > max_edge:
+            image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        stripped = image if original_format != 'JPEG' else image.convert('RGB')
+        options = dict(ORIGINAL_FORMATS[original_format])
+        if icc_profile:
+            options['icc_profile'] = icc_profile
+        original = _encode(stripped, original_format, options)
+
+    source = image.convert('RGB')
+
+    files = {}
+    derivatives = {}
+
+    for size, edge in DERIVATIVE_SIZES.items():
+        resized = source.copy()
+        resized.thumbnail((edge, edge), Image.LANCZOS)
+
+        derivatives[size] = {'width': resized.width, 'height': resized.height}
+        for fmt, (pil_format, _, options) in DERIVATIVE_FORMATS.items():
+            files[(size, fmt)] = _encode(resized, pil_format, options)
+
+    return {
+        'original': original,
+        'files': files,
+        'derivatives': derivatives,
+        'hash': dhash(source),
+        'color_bucket': dominant_color(source),
+    }
@@ -0,0 +1,237 @@
+# items/images.py
+
+import logging
+import multiprocessing
+import os
+import posixpath
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .blobs import release_blob, retain_blob
+from .colors import normalize_color
+from .duplicates import to_signed
+from .image_ops import DERIVATIVE_FORMATS, MAX_ORIGINAL_EDGE, derivative_name, render_image
+from .list_cache import bump_list_generation
+from .models import Item, item_image_storage
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------
+# QUEUE (uploads are stored as-is, processed by the worker)
+# ---------------------------------------------------------
+def needs_derivatives(item):
+    return bool(item.image) and (item.image_derivatives or {}).get('source') != item.image.name
+
+
+def queue_image_processing(item):
+    # one cheap UPDATE inside the request; the worker does the rest
+    Item.objects.filter(pk=item.pk).update(image_status='pending')
+    item.image_status = 'pending'
+
+
+# ---------------------------------------------------------
+# WORKER
+# ---------------------------------------------------------
+def _claimed(item):
+    # the item as this worker claimed it (same image, still 'processing')
+    claimed = Item.objects.filter(pk=item.pk, image_status='processing')
+    return claimed.filter(image=item.image.name) if item.image else claimed
+
+
+def _read(item):
+    item.image.open('rb')
+    try:
+        return item.image.read()
+    finally:
+        item.image.close()
+
+
+def _store_result(item, result):
+    storage = item.image.storage
+    name = item.image.name
+
+    # content-addressed storage: the re-encoded (stripped, maybe
+    # downscaled) original is a new blob (others sharing the upload keep it)
+    original = None
+    if result['original'] is not None:
+        upload_name = item.image.field.generate_filename(item, posixpath.basename(name))
+        original = ContentFile(result['original'])
+        name = storage.save(upload_name, original)
+
+    # derivative names follow the blob name → identical photos share them
+    derivatives = {'source': name}
+    for size, entry in result['derivatives'].items():
+        entry = dict(entry)
+        for fmt, (_, extension, _) in DERIVATIVE_FORMATS.items():
+            entry[fmt] = storage.save(
+                derivative_name(name, size, extension),
+                ContentFile(result['files'][(size, fmt)]),
+            )
+        derivatives[size] = entry
+
+    changes = {}
+    if item.image_hash is None:
+        # uploads hashed in the request keep that hash
+        changes['image_hash'] = to_signed(result['hash'])
+    if normalize_color(item.color) is None:
+        # the reporter's color wins; the photo fills in blank/unknown ones
+        changes['color_bucket'] = result['color_bucket']
+
+    if name != item.image.name:
+        changes['image'] = name
+
+    with transaction.atomic():
+        # .update(): no post_save → the item is not queued again. Only if
+        # it is still ours: a replaced image was queued again meanwhile
+        now = timezone.now()
+        updated = _claimed(item).update(
+            image_status='ready',
+            image_derivatives=derivatives,
+            image_processed_at=now,
+            updated_at=now,  # new <picture> → cached list cards are stale
+            **changes,
+        )
+
+        if name != item.image.name:
+            retain_blob(name, original)
+            # not applied → drop the re-encoded copy again (unless shared)
+            release_blob(item.image.name if updated else name)
+
+        if updated:
+            transaction.on_commit(bump_list_generation)
+        else:
+            _discard_derivatives(name, derivatives)
+
+
+def _discard_derivatives(name, derivatives):
+    # claim lost (image replaced / item deleted): the files written above
+    # stay only if an item still shows `name` (they are shared by name)
+    if Item.objects.filter(image=name).exists():
+        return
+
+    storage = item_image_storage()
+    for size, entry in derivatives.items():
+        if size == 'source':
+            continue
+        for fmt in DERIVATIVE_FORMATS:
+            storage.delete(entry[fmt])
+
+
+def _submit(executor, fn, *args):
+    if executor is not None:
+        return executor.submit(fn, *args)
+
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def process_image_batch(batch_size=20, executor=None):
+    """
+    Process one batch of pending item images: decode, auto-orient,
+    re-encode originals without metadata (downscaled when oversized),
+    write derivatives, mark ready/failed.
+    Pillow work runs on `executor` (a process pool → all cores) or inline.
+    Items of a worker that died stay 'processing' until
+    `manage.py process_images --requeue`.
+    Returns the number of items handled (0 → nothing pending).
+    """
+    max_edge = getattr(settings, 'IMAGE_MAX_EDGE', MAX_ORIGINAL_EDGE)
+
+    # claim the batch in a short transaction; the rendering and storage
+    # writes below run outside of it, so no row lock waits on Pillow
+    with transaction.atomic():
+        batch = list(
+            Item.objects.select_for_update(skip_locked=True)
+            .filter(image_status='pending')
+            .order_by('id')[:batch_size]
+        )
+        if not batch:
+            return 0
+        Item.objects.filter(pk__in=[item.pk for item in batch]).update(image_status='processing')
+
+    jobs = {}
+    for item in batch:
+        try:
+            if not item.image:
+                _claimed(item).update(image_status='')
+                continue
+            data = _read(item)
+        except OSError:
+            logger.warning("Image of item %s is missing (%s)", item.pk, item.image.name)
+            _claimed(item).update(image_status='failed')
+            continue
+
+        jobs[item] = _submit(executor, render_image, data, max_edge)
+
+    for item, job in jobs.items():
+        try:
+            _store_result(item, job.result())
+        except Exception:
+            logger.exception("Image processing failed for item %s", item.pk)
+            _claimed(item).update(image_status='failed')
+
+    return len(batch)
+
+
+def image_worker_pool(processes=None):
+    """
+    Bounded process pool for Pillow work; IMAGE_WORKER_PROCESSES caps it
+    (default: one per core, 0 → process inline). The bound is per worker:
+    every process running one (each `process_images` command, each web
+    process with IMAGE_PROCESSING_IN_PROCESS) starts its own pool.
+    """
+    if processes is None:
+        processes = getattr(settings, 'IMAGE_WORKER_PROCESSES', None) or os.cpu_count()
+    if not processes:
+        return None
+
+    # spawn: the pool may be started from a threaded server process
+    return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+
+
+def process_images_forever(batch_size=20, interval=1.0, processes=None):
+    """
+    Keep processing pending images; sleep `interval` seconds whenever
+    there is nothing to do. Errors are logged and retried.
+    """
+    executor = image_worker_pool(processes)
+    try:
+        while True:
+            try:
+                handled = process_image_batch(batch_size=batch_size, executor=executor)
+            except Exception:
+                logger.exception("Image processing batch failed")
+                close_old_connections()
+                handled = 0
+
+            if not handled:
+                time.sleep(interval)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def start_image_worker_thread(batch_size=20, interval=1.0):
+    """
+    Run the image worker in a daemon thread of the current process; the
+    Pillow work itself still runs in the process pool.
+    """
+    thread = threading.Thread(
+        target=process_images_forever,
+        kwargs={'batch_size': batch_size, 'interval': interval},
+        name='image-worker',
+        daemon=True,
+    )
+    thread.start()
+    return thread
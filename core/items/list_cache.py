@@ -0,0 +1,55 @@
+# items/list_cache.py
+
+from django.core.cache import cache
+
+
+# Lost / found list pages are cached as template fragments:
+#   - the whole list, keyed by the list generation + viewer variant
+#   - each item card, keyed by item id + updated_at + viewer variant
+#     + reporter username
+# Every Item save / delete / bulk status update and every User save
+# (a rename) bumps the generation.
+# The timeout bounds staleness when the cache is not shared between processes.
+LIST_CACHE_TIMEOUT = 300
+
+LIST_GENERATION_KEY = "items:list_generation"
+
+
+def list_generation():
+    generation = cache.get(LIST_GENERATION_KEY)
+    if generation is None:
+        # add(): don't reset a counter another request just created
+        cache.add(LIST_GENERATION_KEY, 1, None)
+        generation = cache.get(LIST_GENERATION_KEY, 1)
+    return generation
+
+
+def bump_list_generation():
+    """Invalidate every cached item list (cards stay valid: keyed by updated_at)."""
+    try:
+        cache.incr(LIST_GENERATION_KEY)
+    except ValueError:
+        cache.add(LIST_GENERATION_KEY, 1, None)
+
+
+def viewer_variant(user):
+    """Which version of an item card `user` sees: admin / student / user / anon."""
+    if not user.is_authenticated:
+        return "anon"
+    if user.role == "admin" or user.is_superuser:
+        return "admin"
+    if user.role == "student":
+        return "student"
+    return "user"
+
+
+def list_cache_context(request):
+    """Template context for {% cache %} tags of the list pages."""
+    variant = viewer_variant(request.user)
+    return {
+        # admin lists hold delete forms with the admin's CSRF token → cards only
+        "list_cache_timeout": 0 if variant == "admin" else LIST_CACHE_TIMEOUT,
+        "card_cache_timeout": LIST_CACHE_TIMEOUT,
+        "list_generation": list_generation(),
+        "viewer_variant": variant,
+    }
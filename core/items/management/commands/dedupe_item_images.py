@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from items.blobs import retain_blob
+from items.models import Item
+from items.storage import is_content_addressed
+
+
+class Command(BaseCommand):
+    help = "Move item images uploaded before content-addressed storage into it (one copy per distinct photo)."
+
+    def handle(self, *args, **options):
+        items = Item.objects.exclude(image="").exclude(image__isnull=True).order_by("id")
+
+        moved = 0
+        legacy_names = set()
+        for item in items.iterator(chunk_size=200):
+            if is_content_addressed(item.image.name):
+                continue
+
+            storage = item.image.storage
+            legacy = item.image.name
+            try:
+                with storage.open(legacy, "rb") as file:
+                    name = storage.save(legacy, file)
+
+                    with transaction.atomic():
+                        # new name → derivatives are rebuilt under it by the image worker
+                        Item.objects.filter(pk=item.pk).update(
+                            image=name, image_derivatives={}, image_status="pending",
+                        )
+                        retain_blob(name, file)
+            except OSError:
+                self.stderr.write(f"Item {item.id}: {legacy} is missing, skipped.")
+                continue
+
+            legacy_names.add((legacy, tuple(
+                entry[fmt]
+                for entry in (item.image_derivatives or {}).values() if isinstance(entry, dict)
+                for fmt in ("webp", "jpeg") if fmt in entry
+            )))
+            moved += 1
+
+        # legacy files no item points at any more
+        still_used = set(Item.objects.values_list("image", flat=True))
+        for legacy, derivatives in legacy_names:
+            if legacy in still_used:
+                continue
+            for stored in (legacy, *derivatives):
+                if storage.exists(stored):
+                    storage.delete(stored)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved {moved} image(s) to content-addressed storage; "
+            f"run 'manage.py process_images' to rebuild their derivatives."
+        ))
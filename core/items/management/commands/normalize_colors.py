@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from items.colors import PALETTE, normalize_color
+from items.models import Item
+
+
+class Command(BaseCommand):
+    help = "Map free-text item colors to canonical color buckets (after upgrades or synonym changes)."
+
+    def handle(self, *args, **options):
+        # one UPDATE per bucket instead of one per item
+        by_bucket = {}
+        unknown = 0
+        for item_id, color in Item.objects.exclude(color="").values_list("id", "color").iterator(chunk_size=2000):
+            bucket = normalize_color(color)
+            if bucket:
+                by_bucket.setdefault(bucket, []).append(item_id)
+            else:
+                unknown += 1
+
+        names = {bucket: name for bucket, name, _ in PALETTE}
+        for bucket, ids in by_bucket.items():
+            Item.objects.filter(id__in=ids).update(color_bucket=bucket)
+            self.stdout.write(f"{names[bucket]}: {len(ids)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Normalized {sum(len(ids) for ids in by_bucket.values())} item(s); "
+            f"{unknown} unknown color(s) left to the image worker "
+            f"(manage.py process_images --requeue --all)."
+        ))
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+
+from items.images import image_worker_pool, needs_derivatives, process_image_batch, process_images_forever
+from items.models import Item
+
+
+class Command(BaseCommand):
+    help = "Process uploaded item images (orient, downscale, derivatives) in a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Size of the process pool (default: IMAGE_WORKER_PROCESSES or one per core, 0 = inline).",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll for new uploads instead of exiting when done.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when --loop is given.",
+        )
+        parser.add_argument(
+            "--requeue",
+            action="store_true",
+            help="First queue every image without up-to-date derivatives (backfill, retry failed or interrupted).",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="With --requeue: queue every image, not only those without up-to-date derivatives.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requeue"]:
+            items = Item.objects.exclude(image="").exclude(image__isnull=True).exclude(image_status="pending")
+            stale = [
+                item.pk for item in items.only("id", "image", "image_derivatives")
+                if options["all"] or needs_derivatives(item)
+            ]
+            Item.objects.filter(pk__in=stale).update(image_status="pending")
+            self.stdout.write(f"Queued {len(stale)} image(s).")
+
+        if options["loop"]:
+            process_images_forever(
+                batch_size=options["batch_size"],
+                interval=options["interval"],
+                processes=options["processes"],
+            )
+            return
+
+        executor = image_worker_pool(options["processes"])
+        total = 0
+        try:
+            while True:
+                handled = process_image_batch(batch_size=options["batch_size"], executor=executor)
+                if not handled:
+                    break
+                total += handled
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} image(s)."))
@@ -1,80 +1,142 @@
 # items/matching.py
 
+import heapq
+import re
 from datetime import timedelta
 
 from django.db.models import Q
 
+from .colors import normalize_color
 from .models import Item
 
 
-def score_lost_found_pair(lost_item, found_item):
+# ---------------------------------------------------------
+# SIGNALS (shared by lost/found matching and AI search ranking)
+# ---------------------------------------------------------
+def extract_keywords(*texts):
     """
-    Return an integer score (0–100) for how well a lost_item matches a found_item.
-    Higher = better match.
+    Very simple keyword extraction: lowercase words of 4+ characters.
     """
-    score = 0
-
-    # 1) Category – strong signal
-    if lost_item.category and found_item.category:
-        if lost_item.category == found_item.category:
-            score += 30
-        else:
-            # totally different category → very weak match
-            score -= 20
-
-    # 2) Color – medium signal
-    if lost_item.color and found_item.color:
-        if lost_item.color.lower().strip() == found_item.color.lower().strip():
-            score += 15
-
-    # 3) Location – medium signal (only if both given)
-    if lost_item.location and found_item.location:
-        loc_l = lost_item.location.lower()
-        loc_f = found_item.location.lower()
-        if loc_l in loc_f or loc_f in loc_l:
-            score += 20
-
-    # 4) Date proximity – important
-    if lost_item.date_lost_or_found and found_item.date_lost_or_found:
-        diff = abs(lost_item.date_lost_or_found - found_item.date_lost_or_found)
-        if diff <= timedelta(days=1):
-            score += 20
-        elif diff <= timedelta(days=3):
-            score += 10
-        elif diff <= timedelta(days=7):
-            score += 5
-        else:
-            # far apart in time → small penalty
-            score -= 5
-
-    # 5) Name / description keyword overlap – soft signal
-    name_l = (lost_item.item_name or "").lower()
-    name_f = (found_item.item_name or "").lower()
-    desc_l = (lost_item.description or "").lower()
-    desc_f = (found_item.description or "").lower()
-
-    # very simple shared keyword logic
-    keywords = []
+    keywords = set()
 
-    for text in [name_l, desc_l]:
+    for text in texts:
+        text = (text or "").lower()
         for word in text.replace(",", " ").replace(".", " ").split():
             w = word.strip()
             if len(w) >= 4:  # ignore tiny words like "a", "of"
-                keywords.append(w)
+                keywords.add(w)
+
+    return keywords
+
+
+# Words too common in item names to say anything about the item
+NAME_STOPWORDS = frozenset(("a", "an", "the", "my", "of", "and", "or", "with", "in", "on", "for"))
+
+
+def name_words(*texts):
+    """
+    Every lowercase word of the texts, short ones included ("bag", "id"),
+    without NAME_STOPWORDS. For item names, where extract_keywords'
+    4-character minimum would drop the whole name.
+    """
+    words = set()
+    for text in texts:
+        words.update(re.findall(r"\w+", (text or "").lower()))
+    return words - NAME_STOPWORDS
+
+
+def category_signal(category_a, category_b):
+    # Category – strong signal
+    if not category_a or not category_b:
+        return 0
+    if category_a == category_b:
+        return 30
+    # totally different category → very weak match
+    return -20
+
+
+def color_signal(bucket_a, bucket_b, text_a=None, text_b=None):
+    # Color – medium signal (canonical buckets, see items.colors); colors
+    # outside the synonym table have no bucket → compare the text itself
+    if bucket_a and bucket_b:
+        return 15 if bucket_a == bucket_b else 0
+    text_a = (text_a or "").strip().lower()
+    if text_a and text_a == (text_b or "").strip().lower():
+        return 15
+    return 0
+
+
+def location_signal(location_a, location_b):
+    # Location – medium signal (only if both given)
+    if location_a and location_b:
+        loc_a = location_a.lower()
+        loc_b = location_b.lower()
+        if loc_a in loc_b or loc_b in loc_a:
+            return 20
+    return 0
+
+
+def date_signal(date_a, date_b):
+    # Date proximity – important
+    if not date_a or not date_b:
+        return 0
+
+    diff = abs(date_a - date_b)
+    if diff <= timedelta(days=1):
+        return 20
+    elif diff <= timedelta(days=3):
+        return 10
+    elif diff <= timedelta(days=7):
+        return 5
+    # far apart in time → small penalty
+    return -5
+
+
+def keyword_signal(keywords, *texts):
+    # Name / description keyword overlap – soft signal
+    haystacks = [(text or "").lower() for text in texts]
 
     shared = 0
-    for w in set(keywords):
-        if w in name_f or w in desc_f:
+    for w in keywords:
+        if any(w in h for h in haystacks):
             shared += 1
 
     if shared >= 3:
-        score += 20
+        return 20
     elif shared == 2:
-        score += 12
+        return 12
     elif shared == 1:
-        score += 5
+        return 5
+    return 0
+
+
+def clamp_score(score):
+    # Clamp score to [0, 100]
+    return max(0, min(100, score))
+
+
+def score_lost_found_pair(lost_item, found_item):
+    """
+    Return an integer score (0–100) for how well a lost_item matches a found_item.
+    Higher = better match.
+    """
+    score = 0
+
+    score += category_signal(lost_item.category, found_item.category)
+    score += color_signal(lost_item.color_bucket, found_item.color_bucket, lost_item.color, found_item.color)
+    score += location_signal(lost_item.location, found_item.location)
+    score += date_signal(lost_item.date_lost_or_found, found_item.date_lost_or_found)
 
-    # 6) Special rules for money & critical items
+    name_l = (lost_item.item_name or "").lower()
+    desc_l = (lost_item.description or "").lower()
+
+    score += keyword_signal(
+        extract_keywords(name_l, desc_l),
+        found_item.item_name,
+        found_item.description,
+    )
+
+    # Special rules for money & critical items
     cat = (lost_item.category or "").lower()
 
     # Money
@@ -89,13 +151,106 @@ def score_lost_found_pair(lost_item, found_item):
     if any(kw in name_l or kw in desc_l for kw in critical_keywords):
         score += 5  # small global boost for critical items
 
-    # Clamp score to [0, 100]
-    if score < 0:
-        score = 0
-    if score > 100:
-        score = 100
+    return clamp_score(score)
+
+
+def score_item_for_filters(item, filters, target_date=None):
+    """
+    Return an integer score (0–100) for how well an item matches a set of
+    search filters (keyword/category/color/location, as parsed by the AI search).
+    Uses the same signals as score_lost_found_pair.
+    """
+    score = 0
+
+    # free-text category from the query → compare case-insensitively
+    category = (filters.get("category") or "").lower().strip()
+    score += category_signal(category, (item.category or "").lower())
+
+    score += color_signal(normalize_color(filters.get("color")), item.color_bucket, filters.get("color"), item.color)
+    score += location_signal(filters.get("location"), item.location)
+    score += date_signal(target_date, item.date_lost_or_found)
+    score += keyword_signal(
+        extract_keywords(filters.get("keyword")),
+        item.item_name,
+        item.description,
+    )
+
+    return clamp_score(score)
+
+
+def rank_items_for_filters(items, filters, target_date=None, limit=10):
+    """
+    Score an iterable of items against search filters and keep only the best
+    `limit` of them (earlier in `items` first on ties). Returns a list of
+    (score, item). Only the items passed in are ranked: callers bound the
+    candidates (the AI search scores its newest AI_SEARCH_CANDIDATE_POOL).
+    """
+    scored = (
+        (score_item_for_filters(item, filters, target_date), -index, item)
+        for index, item in enumerate(items)
+    )
+    best = heapq.nlargest(limit, scored, key=lambda entry: entry[:2])
+    return [(score, item) for score, _, item in best]
+
+
+# Best raw score of a manual claim: location + date + keyword signals
+MANUAL_EVIDENCE_MAX = 20 + 20 + 20
+
+
+def score_claim_evidence(claim):
+    """
+    Return an integer score (0–100) for how well a claim's evidence fits
+    the found item it is claiming. Higher = stronger evidence.
+
+    - System claims (lost report ↔ found report) → score_lost_found_pair
+    - Manual claims → where/when lost and identifying marks vs. the found item,
+      scaled from 0–MANUAL_EVIDENCE_MAX to 0–100 so both kinds share one
+      review queue
+    """
+    if claim.matched_found_item_id:
+        return score_lost_found_pair(claim.item, claim.matched_found_item)
+
+    found_item = claim.item
+    score = 0
+
+    score += location_signal(claim.where_lost, found_item.location)
+    score += date_signal(claim.when_lost, found_item.date_lost_or_found)
+    score += keyword_signal(
+        extract_keywords(claim.identifying_marks, claim.message),
+        found_item.item_name,
+        found_item.description,
+    )
+
+    return clamp_score(score * 100 // MANUAL_EVIDENCE_MAX)
+
+
+def find_user_lost_reports(user, found_item, min_score=40):
+    """
+    Return the user's own LOST reports that look like `found_item`, best first.
+    One query through the (reported_by, item_type) index; similarity is
+    decided by score_lost_found_pair instead of substring LIKE filters.
+
+    A report must also share a name / description keyword with the found
+    item: category and color alone reach `min_score`, and would make any
+    black bag look like the user's lost black bag. Words of the item name
+    count whatever their length ("Bag", "ID"), as whole words.
+    """
+    lost_reports = Item.objects.filter(reported_by=user, item_type="lost")
+    found_words = name_words(found_item.item_name, found_item.description)
+
+    scored = [
+        (score_lost_found_pair(lost, found_item), lost)
+        for lost in lost_reports
+        if keyword_signal(
+            extract_keywords(lost.item_name, lost.description),
+            found_item.item_name,
+            found_item.description,
+        )
+        or found_words & name_words(lost.item_name)
+    ]
+    scored.sort(key=lambda pair: pair[0], reverse=True)
 
-    return score
+    return [lost for s, lost in scored if s >= min_score]
 
 
 def find_matching_lost_for_found(found_item, min_score=30, limit=10):
@@ -0,0 +1,162 @@
+# items/media.py
+
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .storage import CONTENT_ADDRESSED_NAME
+
+
+# Only these MEDIA_ROOT subdirectories are served
+MEDIA_SERVED_DIRS = ('item_images/',)
+
+# Content-addressed names never change content
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+def can_view_media(request, name):
+    """
+    Permission check for one media file. Item photos are public like the
+    listings that show them, unless MEDIA_REQUIRE_LOGIN is set.
+    """
+    if not name.startswith(MEDIA_SERVED_DIRS):
+        return False
+    # temp files of uploads in progress (items.storage), dotfiles
+    if any(part.startswith('.') for part in name.split('/')):
+        return False
+    if getattr(settings, 'MEDIA_REQUIRE_LOGIN', False):
+        return request.user.is_authenticated
+    return True
+
+
+def _cache_headers(response, name, stat):
+    match = CONTENT_ADDRESSED_NAME.search(name)
+    if match:
+        response['ETag'] = f'"{match.group(3)}"'
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response['ETag'] = f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+        response['Cache-Control'] = f"public, max-age={getattr(settings, 'MEDIA_CACHE_SECONDS', 3600)}"
+
+    if getattr(settings, 'MEDIA_REQUIRE_LOGIN', False):
+        response['Cache-Control'] = response['Cache-Control'].replace('public', 'private')
+
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _byte_range(request, size):
+    # single "bytes=a-b" / "bytes=a-" / "bytes=-n" range → (start, end) inclusive
+    match = RANGE_HEADER.match(request.headers.get('Range', '').strip())
+    if not match or size == 0:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if first:
+        start, end = int(first), int(last) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start > end or start >= size:
+        return 'unsatisfiable'
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(request, validators):
+    # If-Range: resume only the version the client has, else send it all
+    if_range = request.headers.get('If-Range', '').strip()
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == validators['ETag']  # strong comparison: no W/
+    return if_range == validators['Last-Modified']
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def _offload(name, full_path):
+    """X-Accel-Redirect (nginx) / X-Sendfile (Apache, lighttpd) response, or None."""
+    backend = getattr(settings, 'MEDIA_SENDFILE_BACKEND', None)
+    if backend == 'nginx':
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = posixpath.join(settings.MEDIA_ACCEL_PREFIX, quote(name))
+        return response
+    if backend == 'sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = full_path
+        return response
+    return None
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a MEDIA_ROOT file after the permission check. With
+    MEDIA_SENDFILE_BACKEND set the front server sends the bytes;
+    otherwise FileResponse (zero-copy sendfile via wsgi.file_wrapper),
+    or a streamed 206 for Range requests (a full 200 when If-Range no
+    longer matches). Conditional requests get 304.
+    """
+    name = posixpath.normpath(path).lstrip('/')
+    if not can_view_media(request, name):
+        raise Http404("Media not found")
+
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+        stat = os.stat(full_path)
+    except (OSError, ValueError):
+        raise Http404("Media not found")
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+    # 304 before any file is opened
+    probe = _cache_headers(HttpResponse(), name, stat)
+    not_modified = get_conditional_response(
+        request, etag=probe['ETag'], last_modified=int(stat.st_mtime), response=probe,
+    )
+    if not_modified is not probe:
+        return not_modified
+
+    response = _offload(name, full_path)
+    if response is None:
+        byte_range = _byte_range(request, stat.st_size) if _if_range_matches(request, probe) else None
+        if byte_range == 'unsatisfiable':
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(full_path, start, end - start + 1), status=206,
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(end - start + 1)
+        else:
+            response = FileResponse(open(full_path, 'rb'))
+
+    response['Content-Type'] = content_type
+    return _cache_headers(response, name, stat)
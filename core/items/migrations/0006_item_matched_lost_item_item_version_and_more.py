@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0005_remove_item_date_lost_or_found_item_date_found_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='matched_lost_item',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='matched_found_items', to='items.item'),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='item',
+            name='status',
+            field=models.CharField(choices=[('unmatched', 'Unmatched'), ('potential_match', 'Potential Match'), ('matched', 'Matched'), ('claimed', 'Claimed'), ('unclaimed', 'Unclaimed'), ('returned', 'Returned'), ('disposed', 'Disposed')], default='unclaimed', max_length=20),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0006_item_matched_lost_item_item_version_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['reported_by', 'item_type'], name='item_reporter_type_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0011_item_image_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='color_bucket',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 'Black'), (2, 'White'), (3, 'Gray'), (4, 'Red'), (5, 'Orange'), (6, 'Yellow'), (7, 'Green'), (8, 'Blue'), (9, 'Purple'), (10, 'Pink'), (11, 'Brown'), (12, 'Beige')], null=True),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['color_bucket'], name='item_color_bucket_idx'),
+        ),
+    ]
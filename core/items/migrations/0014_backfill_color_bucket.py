@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:38
+
+import re
+
+from django.db import migrations
+
+
+# Frozen copy of items.colors (bucket id → color words) as of this
+# migration; later synonyms are picked up by `manage.py normalize_colors`
+COLOR_WORDS = {
+    1: ('black', 'jet', 'ebony', 'onyx', 'charcoal'),
+    2: ('white', 'ivory', 'cream', 'offwhite', 'snow'),
+    3: ('gray', 'grey', 'silver', 'ash', 'slate', 'graphite', 'metallic', 'gunmetal'),
+    4: ('red', 'maroon', 'burgundy', 'crimson', 'scarlet', 'wine', 'cherry', 'ruby'),
+    5: ('orange', 'coral', 'peach', 'amber', 'rust'),
+    6: ('yellow', 'gold', 'golden', 'mustard', 'lemon'),
+    7: ('green', 'olive', 'lime', 'mint', 'teal', 'emerald', 'khaki', 'sage', 'forest'),
+    8: ('blue', 'navy', 'azure', 'cyan', 'turquoise', 'cobalt', 'indigo', 'denim', 'sky', 'royal'),
+    9: ('purple', 'violet', 'lavender', 'lilac', 'plum', 'magenta', 'mauve'),
+    10: ('pink', 'rose', 'fuchsia', 'salmon', 'blush'),
+    11: ('brown', 'tan', 'chocolate', 'coffee', 'camel', 'leather', 'mocha', 'bronze', 'copper'),
+    12: ('beige', 'sand', 'nude', 'taupe', 'champagne'),
+}
+BUCKET_OF_WORD = {word: bucket for bucket, words in COLOR_WORDS.items() for word in words}
+
+
+def normalize_color(text):
+    # last known word wins ("light grey-blue" → blue)
+    words = re.findall(r"[a-z]+", (text or "").lower().replace("off-white", "offwhite"))
+    for word in reversed(words):
+        if word in BUCKET_OF_WORD:
+            return BUCKET_OF_WORD[word]
+    return None
+
+
+def backfill_color_bucket(apps, schema_editor):
+    # same as `manage.py normalize_colors`: one UPDATE per bucket
+    Item = apps.get_model('items', 'Item')
+
+    by_bucket = {}
+    rows = Item.objects.filter(color_bucket__isnull=True).exclude(color='').values_list('id', 'color')
+    for item_id, color in rows.iterator(chunk_size=2000):
+        bucket = normalize_color(color)
+        if bucket:
+            by_bucket.setdefault(bucket, []).append(item_id)
+
+    for bucket, ids in by_bucket.items():
+        for start in range(0, len(ids), 2000):
+            Item.objects.filter(id__in=ids[start:start + 2000]).update(color_bucket=bucket)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0013_stored_blob'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_color_bucket, migrations.RunPython.noop),
+    ]
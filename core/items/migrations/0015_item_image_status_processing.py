@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0014_backfill_color_bucket'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='item',
+            name='image_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='', max_length=10),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:43
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_returned_at(apps, schema_editor):
+    # best estimate for items returned before the column existed
+    Item = apps.get_model('items', 'Item')
+    Item.objects.filter(status='returned', returned_at__isnull=True).update(returned_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0015_item_image_status_processing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='returned_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_returned_at, migrations.RunPython.noop),
+    ]
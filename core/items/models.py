@@ -1,5 +1,15 @@
 from django.db import models
+from django.utils import timezone
 from django.conf import settings
+from django.core.files.storage import storages
+
+from .colors import COLOR_BUCKET_CHOICES, normalize_color
+
+
+def item_image_storage():
+    # content-addressed, see STORAGES["item_images"] and items.storage
+    return storages['item_images']
+
 
 class Item(models.Model):
     ITEM_TYPE_CHOICES = (
@@ -9,6 +19,7 @@ class Item(models.Model):
 
     STATUS_CHOICES = (
         ('unmatched','Unmatched'),
+        ('potential_match','Potential Match'),
         ('matched','Matched'),
         ('claimed','Claimed'),
         ('unclaimed','Unclaimed'),
@@ -39,6 +50,9 @@ class Item(models.Model):
 
     category = models.CharField(max_length=50, choices=CATEGORY_CHOICES)
     color = models.CharField(max_length=30, blank=True)
+    # Canonical color (items.colors): from `color` when it names a known
+    # color, otherwise the photo's dominant color (image worker)
+    color_bucket = models.PositiveSmallIntegerField(choices=COLOR_BUCKET_CHOICES, null=True, blank=True)
     location = models.CharField(max_length=100)
 
     item_type = models.CharField(
@@ -66,14 +80,116 @@ class Item(models.Model):
         default="unclaimed"
     )
 
+    # FOUND item reported via "I found this" → the LOST report it answers
+    matched_lost_item = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='matched_found_items'
+    )
+
     image = models.ImageField(
         upload_to='item_images/',
+        storage=item_image_storage,
         null=True,
         blank=True
     )
 
+    # Resized WebP/JPEG copies of `image` (items.images), e.g.
+    # {"source": <image name>, "thumb": {"width", "height", "webp", "jpeg"}, ...}
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+
+    IMAGE_STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    )
+
+    # Set by the image worker; '' when the item has no image
+    image_status = models.CharField(max_length=10, choices=IMAGE_STATUS_CHOICES, blank=True, default='')
+    image_processed_at = models.DateTimeField(null=True, blank=True)
+
+    # 64-bit perceptual hash (dHash) of `image`, stored signed;
+    # duplicate found reports are looked up by it (items.duplicates)
+    image_hash = models.BigIntegerField(null=True, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # When the item was handed back (status → returned); analytics rollups
+    returned_at = models.DateTimeField(null=True, blank=True)
+
+    # Bumped by every state transition (optimistic concurrency,
+    # see items.concurrency.conditional_update)
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # "my lost reports" / claimant lost-report lookups
+            models.Index(fields=['reported_by', 'item_type'], name='item_reporter_type_idx'),
+            # daily rollups: changed days since the last build, rows of one day
+            models.Index(fields=['updated_at'], name='item_updated_idx'),
+            models.Index(fields=['date_reported'], name='item_reported_day_idx'),
+            # image worker queue
+            models.Index(fields=['image_status'], name='item_image_status_idx'),
+            # color filters (search, matching)
+            models.Index(fields=['color_bucket'], name='item_color_bucket_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # image name as stored, to reference-count blobs on change (items.blobs)
+        if 'image' in field_names:
+            instance._stored_image = values[field_names.index('image')] or None
+        # color as stored, so an edit to an unknown color clears color_bucket
+        if 'color' in field_names:
+            instance._stored_color = values[field_names.index('color')]
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+
+        if update_fields is None or 'color' in update_fields:
+            bucket = normalize_color(self.color)
+            # unknown color: keep a bucket the photo filled in (items.images)
+            # unless the color text itself changed
+            if bucket or self.color != getattr(self, '_stored_color', self.color):
+                self.color_bucket = bucket
+                if update_fields is not None:
+                    kwargs['update_fields'] = set(update_fields) | {'color_bucket'}
+
+        if self.status == 'returned' and self.returned_at is None:
+            # set-based transitions pass returned_at themselves
+            self.returned_at = timezone.now()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'returned_at'}
+
+        super().save(*args, **kwargs)
+        self._stored_color = self.color
+
+    @property
+    def date_lost_or_found(self):
+        # Lost and found dates live in separate columns since 0005;
+        # matching and templates still want a single "when" date.
+        if self.item_type == "lost":
+            return self.date_lost
+        return self.date_found
 
     def __str__(self):
         return f"{self.item_name} ({self.item_type}) - {self.status}"
+
+
+class StoredBlob(models.Model):
+    """
+    One content-addressed upload (items.storage) and how many items use
+    it. The file and its derivatives are deleted when refcount drops to 0.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    refcount = models.PositiveIntegerField(default=0)
+    size = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
@@ -0,0 +1,79 @@
+# items/pending_uploads.py
+#
+# The photo of a found report held back by the duplicate warning
+# (items.views._duplicate_photo_warning): written to the default storage
+# under PENDING_UPLOAD_DIR (not served, see items.media) and remembered in
+# the session, so "Proceed Anyway" does not need the photo attached again.
+
+import os
+from datetime import timedelta
+from uuid import uuid4
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+
+PENDING_UPLOAD_DIR = 'pending_uploads/'
+
+# Session key: {"name": <storage name>, "filename": ..., "content_type": ...}
+PENDING_UPLOAD_SESSION_KEY = 'pending_found_photo'
+
+# Uploads of warnings nobody confirmed are deleted after this long
+PENDING_UPLOAD_MAX_AGE = timedelta(days=1)
+
+
+def keep_pending_upload(request, upload):
+    """Store `upload` until the user confirms (or replaces) it."""
+    discard_pending_upload(request)
+    _purge_stale_uploads()
+
+    extension = os.path.splitext(upload.name)[1].lower()
+    upload.seek(0)
+    name = default_storage.save(f'{PENDING_UPLOAD_DIR}{uuid4().hex}{extension}', upload)
+    upload.seek(0)
+
+    request.session[PENDING_UPLOAD_SESSION_KEY] = {
+        'name': name,
+        'filename': os.path.basename(upload.name),
+        'content_type': getattr(upload, 'content_type', None),
+    }
+
+
+def restore_pending_upload(request):
+    """The kept upload as a fresh uploaded file, or None. It stays stored."""
+    pending = request.session.get(PENDING_UPLOAD_SESSION_KEY)
+    if not pending:
+        return None
+
+    try:
+        with default_storage.open(pending['name']) as stored:
+            content = stored.read()
+    except FileNotFoundError:
+        del request.session[PENDING_UPLOAD_SESSION_KEY]
+        return None
+
+    return SimpleUploadedFile(pending['filename'], content, pending['content_type'])
+
+
+def discard_pending_upload(request):
+    pending = request.session.pop(PENDING_UPLOAD_SESSION_KEY, None)
+    if pending:
+        default_storage.delete(pending['name'])
+
+
+def _purge_stale_uploads():
+    # warnings are rare: sweep abandoned uploads whenever a new one is kept
+    try:
+        _, names = default_storage.listdir(PENDING_UPLOAD_DIR)
+    except FileNotFoundError:
+        return
+
+    cutoff = timezone.now() - PENDING_UPLOAD_MAX_AGE
+    for filename in names:
+        name = PENDING_UPLOAD_DIR + filename
+        try:
+            if default_storage.get_modified_time(name) < cutoff:
+                default_storage.delete(name)
+        except FileNotFoundError:
+            pass  # removed by a concurrent sweep
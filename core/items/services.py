@@ -0,0 +1,126 @@
+# items/services.py
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from users.notifications import notify_many
+
+from .concurrency import ConflictError
+from .models import Item
+from .signals import rows_updated
+
+
+# Notification entries for notify_many (shared by single and bulk decisions)
+# `version`: the found item's version after the decision, so a later
+# re-match of the same pair is notified again
+def match_approved_notifications(found_id, version, finder_id, lost_id, lost_name, owner_id):
+    match = f"match:{found_id}:v{version}:{lost_id}:approved"
+    return [
+        (
+            owner_id,
+            f"Match confirmed! Your item '{lost_name}' has been found. "
+            f"Please visit the Lost & Found desk.",
+            f"{match}:owner",
+        ),
+        (
+            finder_id,
+            "The item you reported as found has been confirmed by the owner!",
+            f"{match}:finder",
+        ),
+    ]
+
+
+def match_rejected_notifications(found_id, version, finder_id, lost_id, owner_id):
+    match = f"match:{found_id}:v{version}:{lost_id}:rejected"
+    return [
+        (owner_id, "The found item did NOT match your lost item.", f"{match}:owner"),
+        (finder_id, "Your reported found item did not match the lost report.", f"{match}:finder"),
+    ]
+
+
+# ===============================================================
+# BULK MATCH DECISIONS (pending matches page, ItemAdmin actions)
+# ===============================================================
+def _load_pending_matches(found_ids):
+    rows = list(
+        Item.objects.filter(
+            id__in=found_ids,
+            item_type="found",
+            status="potential_match",
+            matched_lost_item__isnull=False,
+        ).values(
+            "id", "version", "reported_by_id", "matched_lost_item_id",
+            "matched_lost_item__item_name", "matched_lost_item__reported_by_id",
+        )
+    )
+    if len(rows) != len(set(found_ids)):
+        raise ConflictError(
+            "Some of the selected matches were already decided. Please reload the page."
+        )
+    return rows
+
+
+def _transition(ids, expected_status, **changes):
+    updated = Item.objects.filter(id__in=ids, status=expected_status).update(
+        updated_at=timezone.now(),
+        version=F("version") + 1,
+        **changes,
+    )
+    if updated != len(ids):
+        # someone decided one of them in between → roll everything back
+        raise ConflictError(
+            "Some of the selected matches were changed by someone else. Please reload the page."
+        )
+
+    rows_updated.send(sender=Item)
+
+
+def bulk_approve_matches(found_ids):
+    """
+    Confirm many found ↔ lost matches in one transaction:
+    two UPDATEs (found, lost → matched) and one notification insert.
+    Returns the number of matches approved.
+    """
+    found_ids = list(set(found_ids))
+
+    with transaction.atomic():
+        rows = _load_pending_matches(found_ids)
+
+        _transition(found_ids, "potential_match", status="matched")
+        _transition(list({row["matched_lost_item_id"] for row in rows}), "potential_match", status="matched")
+
+        notifications = []
+        for row in rows:
+            notifications += match_approved_notifications(
+                row["id"], row["version"] + 1, row["reported_by_id"], row["matched_lost_item_id"],
+                row["matched_lost_item__item_name"], row["matched_lost_item__reported_by_id"],
+            )
+        notify_many(notifications)
+
+    return len(rows)
+
+
+def bulk_reject_matches(found_ids):
+    """
+    Reject many found ↔ lost matches in one transaction: found items go
+    back to unclaimed, lost reports to unmatched.
+    Returns the number of matches rejected.
+    """
+    found_ids = list(set(found_ids))
+
+    with transaction.atomic():
+        rows = _load_pending_matches(found_ids)
+
+        _transition(found_ids, "potential_match", status="unclaimed", matched_lost_item=None)
+        _transition(list({row["matched_lost_item_id"] for row in rows}), "potential_match", status="unmatched")
+
+        notifications = []
+        for row in rows:
+            notifications += match_rejected_notifications(
+                row["id"], row["version"] + 1, row["reported_by_id"], row["matched_lost_item_id"],
+                row["matched_lost_item__reported_by_id"],
+            )
+        notify_many(notifications)
+
+    return len(rows)
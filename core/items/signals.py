@@ -0,0 +1,85 @@
+# items/signals.py
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .models import Item
+
+
+# Sent after a set-based / conditional UPDATE changed Item or Claim rows
+# (QuerySet.update() does not send post_save). sender = the model class.
+rows_updated = Signal()
+
+
+@receiver(post_save, sender='items.Item')
+def queue_image_derivatives(sender, instance, **kwargs):
+    # New or replaced upload → hand it to the image worker (items.images)
+    from .images import needs_derivatives, queue_image_processing
+
+    if needs_derivatives(instance) and instance.image_status != 'pending':
+        queue_image_processing(instance)
+
+
+@receiver(post_save, sender='items.Item')
+def index_image_hash(sender, instance, **kwargs):
+    # visible to this process's duplicate lookups right away
+    if instance.item_type == 'found' and instance.image_hash is not None:
+        from .duplicates import found_image_index
+
+        found_image_index.add(instance)
+
+
+@receiver(pre_save, sender='items.Item')
+def keep_image_upload(sender, instance, **kwargs):
+    # saving the field drops the uploaded file; count_image_blob may need it
+    if instance.image and not instance.image._committed:
+        instance._image_upload = instance.image.file
+
+
+@receiver(post_save, sender='items.Item')
+def count_image_blob(sender, instance, created, **kwargs):
+    # content-addressed uploads are shared: keep StoredBlob.refcount in step
+    upload = instance.__dict__.pop('_image_upload', None)
+    if not created and not hasattr(instance, '_stored_image'):
+        return  # loaded without the image column → unknown, untouched
+
+    from .blobs import release_blob, retain_blob
+
+    old = None if created else instance._stored_image
+    new = instance.image.name or None
+    if new != old:
+        if new:
+            retain_blob(new, upload)
+        if old:
+            release_blob(old)
+    instance._stored_image = new
+
+
+@receiver(post_delete, sender='items.Item')
+def release_image_blob(sender, instance, **kwargs):
+    # last item using the photo → file + derivatives removed (delete_item, admin)
+    if instance.image:
+        from .blobs import release_blob
+
+        release_blob(instance.image.name)
+
+
+@receiver(post_save, sender='items.Item')
+@receiver(post_delete, sender='items.Item')
+@receiver(rows_updated, sender=Item)
+def invalidate_item_lists(sender, **kwargs):
+    # cached lost / found list pages (items.list_cache) are rebuilt after commit
+    from .list_cache import bump_list_generation
+
+    transaction.on_commit(bump_list_generation)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_lists_on_rename(sender, update_fields=None, **kwargs):
+    # cards show the reporter's username; logins only touch last_login
+    if update_fields is None or 'username' in update_fields:
+        from .list_cache import bump_list_generation
+
+        transaction.on_commit(bump_list_generation)
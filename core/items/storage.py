@@ -0,0 +1,78 @@
+# items/storage.py
+
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+# item_images/3f/a2/3fa2…e1.jpg, item_images/3f/a2/3fa2…e1.card.webp
+CONTENT_ADDRESSED_NAME = re.compile(r"(?:^|/)([0-9a-f]{2})/([0-9a-f]{2})/(\1\2[0-9a-f]{60})(\.[^/]*)?$")
+
+
+def is_content_addressed(name):
+    return bool(name and CONTENT_ADDRESSED_NAME.search(name))
+
+
+def content_address(name, content):
+    """Sharded name of `content` under the directory of `name`."""
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    digest = digest.hexdigest()
+
+    extension = os.path.splitext(name)[1].lower()
+    return posixpath.join(posixpath.dirname(name), digest[:2], digest[2:4], digest + extension)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names uploads by their SHA-256
+    (<dir>/ab/cd/abcd….jpg): identical files are stored once and a name
+    never changes content, so it can be cached forever.
+
+    Names that are already content-addressed (or derived from one, like
+    image derivatives <hash>.card.webp) are kept as given. Saving content
+    that is already stored writes nothing. Files are reference counted
+    per item (items.blobs) and deleted when the last item lets go.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        if not is_content_addressed(name):
+            name = content_address(name, content)
+
+        if self.exists(name):
+            return name
+
+        return self._save(name, content)
+
+    def _save(self, name, content):
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+
+        # write aside, then rename: concurrent uploads of the same file
+        # just replace it with identical bytes
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in content.chunks():
+                    tmp.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(tmp_path, self.file_permissions_mode)
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return name
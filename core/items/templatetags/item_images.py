@@ -0,0 +1,45 @@
+from django import template
+
+from items.image_ops import DERIVATIVE_SIZES
+
+register = template.Library()
+
+
+def _srcset(item, fmt):
+    storage = item.image.storage
+    derivatives = item.image_derivatives
+    return ", ".join(
+        f"{storage.url(derivatives[size][fmt])} {derivatives[size]['width']}w"
+        for size in DERIVATIVE_SIZES
+        if size in derivatives
+    )
+
+
+@register.inclusion_tag('items/item_picture.html')
+def item_picture(item, size='card', sizes=None, css_class='', style=''):
+    """
+    <picture> for an item image: WebP srcset with JPEG fallback, `size`
+    being the derivative used as plain src. Items without derivatives
+    (not generated yet / unreadable upload) fall back to the original.
+
+        {% item_picture item "thumb" sizes="150px" %}
+    """
+    derivatives = item.image_derivatives or {}
+    ready = bool(item.image) and derivatives.get('source') == item.image.name and size in derivatives
+
+    picture = {
+        'item': item,
+        'ready': ready,
+        'css_class': css_class,
+        'style': style,
+        'sizes': sizes or f"{DERIVATIVE_SIZES[size]}px",
+    }
+    if ready:
+        picture.update(
+            webp_srcset=_srcset(item, 'webp'),
+            jpeg_srcset=_srcset(item, 'jpeg'),
+            src=item.image.storage.url(derivatives[size]['jpeg']),
+            width=derivatives[size]['width'],
+            height=derivatives[size]['height'],
+        )
+    return picture
@@ -0,0 +1,56 @@
+# items/testing.py
+#
+# Helpers shared by the apps' tests.py modules (no tests in here).
+
+from datetime import date
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Item
+
+
+# A list view renders with the same number of queries at both sizes → no N+1
+QUERY_BUDGET_ROW_COUNTS = (10, 1000)
+
+
+def make_items(count, reporter, item_type, **fields):
+    # bulk_create: no signals (image worker, caches) while setting up rows
+    return Item.objects.bulk_create(
+        Item(
+            reported_by=reporter,
+            item_name=f"Item {i}",
+            description="Black leather wallet",
+            category="wallet",
+            color="black",
+            location="Library",
+            item_type=item_type,
+            date_lost=date(2025, 1, 1) if item_type == "lost" else None,
+            date_found=date(2025, 1, 2) if item_type == "found" else None,
+            **fields,
+        )
+        for i in range(count)
+    )
+
+
+class QueryBudgetMixin:
+    """
+    assertQueryBudget(url, budget, make_rows): render `url` once per
+    QUERY_BUDGET_ROW_COUNTS after make_rows(count); both renders must
+    take exactly `budget` queries. Rows are rolled back after each render.
+    """
+
+    def assertQueryBudget(self, url, budget, make_rows):
+        for count in QUERY_BUDGET_ROW_COUNTS:
+            with self.subTest(rows=count):
+                savepoint = transaction.savepoint()
+                try:
+                    make_rows(count)
+                    cache.clear()  # list fragment caches would hide the queries
+
+                    with self.assertNumQueries(budget):
+                        response = self.client.get(url)
+
+                    self.assertEqual(response.status_code, 200)
+                finally:
+                    transaction.savepoint_rollback(savepoint)
@@ -1,3 +1,613 @@
-from django.test import TestCase
+import importlib
+import io
+import itertools
+import os
+import shutil
+import tempfile
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.apps import apps
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from items.blobs import retain_blob
+from items import images
+from items.image_ops import DERIVATIVE_FORMATS, DERIVATIVE_SIZES, render_image
+from items.concurrency import ConflictError
+from items.forms import ItemSearchForm
+from items.list_cache import list_generation
+from items.matching import color_signal
+from items.models import Item, StoredBlob, item_image_storage
+from items.pending_uploads import PENDING_UPLOAD_DIR, PENDING_UPLOAD_SESSION_KEY
+from items.services import bulk_approve_matches, bulk_reject_matches
+from items.signals import rows_updated
+from items.testing import QueryBudgetMixin, make_items
+from users.models import NotificationOutbox, User
+
+
+class ItemListQueryBudgetTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.student = User.objects.create_user("student", password="x", role="student")
+        self.admin = User.objects.create_user("admin", password="x", role="admin")
+        self.reporters = [
+            User.objects.create_user(f"reporter{i}", password="x") for i in range(3)
+        ]
+
+    def rows(self, item_type, reporters=None, **fields):
+        # `count` items spread over several reporters
+        reporters = reporters or self.reporters
+
+        def make_rows(count):
+            for i, reporter in enumerate(reporters):
+                make_items(count // len(reporters) + (i < count % len(reporters)),
+                           reporter, item_type, **fields)
+        return make_rows
+
+    def test_found_list_anonymous(self):
+        # items + reporters in one join
+        self.assertQueryBudget(reverse("list_found_items"), 1, self.rows("found"))
+
+    def test_found_list_student(self):
+        # session, user, unread notification count (base.html), items
+        self.client.force_login(self.student)
+        self.assertQueryBudget(reverse("list_found_items"), 4, self.rows("found"))
+
+    def test_found_list_admin(self):
+        # session, user, unread count, items + reporters shown on admin cards
+        self.client.force_login(self.admin)
+        self.assertQueryBudget(reverse("list_found_items"), 4, self.rows("found"))
+
+    def test_lost_list_admin(self):
+        # session, user, unread count, items + reporters
+        self.client.force_login(self.admin)
+        self.assertQueryBudget(reverse("list_lost_items"), 4, self.rows("lost"))
+
+    def test_my_lost_items(self):
+        # standalone page: session, user, items
+        self.client.force_login(self.student)
+        self.assertQueryBudget(reverse("my_lost_items"), 3, self.rows("lost", [self.student]))
+
+    def test_search_items(self):
+        # items + reporters in one join
+        self.assertQueryBudget(reverse("search_items") + "?keyword=Item", 1, self.rows("found"))
+
+    def test_pending_matches(self):
+        # standalone page: session, user, matches + reporters in one join
+        lost = make_items(1, self.student, "lost")[0]
+        self.client.force_login(self.admin)
+        self.assertQueryBudget(
+            reverse("pending_matches"), 3,
+            self.rows("found", status="potential_match", matched_lost_item=lost),
+        )
+
+
+class ItemSearchTests(TestCase):
+
+    def setUp(self):
+        self.reporter = User.objects.create_user("finder", password="x")
+
+    def item(self, name, **dates):
+        return Item.objects.create(
+            reported_by=self.reporter, item_name=name, description="", category="Other",
+            location="Library", item_type="found", **dates,
+        )
+
+    def search(self, **params):
+        form = ItemSearchForm(params)
+        self.assertTrue(form.is_valid())
+        return set(form.filter_items(Item.objects.all()))
+
+    def test_date_range_applies_to_one_date_field(self):
+        inside = self.item("Inside", date_found=date(2025, 2, 10))
+        # lost before and found after the range: neither date is inside it
+        across = self.item("Across", date_lost=date(2025, 1, 1), date_found=date(2025, 3, 1))
+
+        self.assertEqual(self.search(start_date="2025-02-01", end_date="2025-02-28"), {inside})
+        self.assertEqual(self.search(start_date="2025-02-01"), {inside, across})
+        self.assertEqual(self.search(end_date="2025-02-28"), {inside, across})
+
+
+class StoredBlobTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.storage = item_image_storage()
+        self.reporter = User.objects.create_user("finder", password="x")
+
+    def make_item(self, data=b"photo bytes", filename="wallet.jpg"):
+        return Item.objects.create(
+            reported_by=self.reporter, item_name="Wallet", description="",
+            category="Other", location="Library", item_type="found",
+            image=SimpleUploadedFile(filename, data),
+        )
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.make_item(filename="a.jpg")
+        second = self.make_item(filename="b.jpg")
+
+        self.assertEqual(first.image.name, second.image.name)
+        blob = StoredBlob.objects.get()
+        self.assertEqual((blob.name, blob.refcount, blob.size), (first.image.name, 2, 11))
+
+    def test_last_release_deletes_the_file(self):
+        first, second = self.make_item(), self.make_item()
+        name = first.image.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(StoredBlob.objects.get().refcount, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(StoredBlob.objects.exists())
+
+    def test_upload_racing_the_last_release_keeps_the_file(self):
+        first = self.make_item()
+
+        with self.captureOnCommitCallbacks() as pending_deletes:
+            first.delete()
+        second = self.make_item()  # storage.save() finds the file, writes nothing
+        for callback in pending_deletes:
+            callback()
+
+        self.assertTrue(self.storage.exists(second.image.name))
+        self.assertEqual(StoredBlob.objects.get().refcount, 1)
+
+    def test_retain_restores_a_file_deleted_in_between(self):
+        name = self.make_item().image.name
+        Item.objects.all().delete()
+        self.storage.delete(name)
+        StoredBlob.objects.all().delete()
+
+        retain_blob(name, ContentFile(b"photo bytes"))
+
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(StoredBlob.objects.get().refcount, 1)
+
+    def test_dedupe_command_moves_legacy_images(self):
+        legacy_names = []
+        for legacy in ("item_images/one.jpg", "item_images/two.jpg"):
+            os.makedirs(os.path.dirname(self.storage.path(legacy)), exist_ok=True)
+            with open(self.storage.path(legacy), "wb") as file:
+                file.write(b"same photo")
+            legacy_names.append(legacy)
+        items = make_items(2, self.reporter, "found")
+        for item, legacy in zip(items, legacy_names):
+            Item.objects.filter(pk=item.pk).update(image=legacy)
+
+        call_command("dedupe_item_images", stdout=open(os.devnull, "w"))
+
+        names = set(Item.objects.values_list("image", flat=True))
+        self.assertEqual(len(names), 1)
+        blob = StoredBlob.objects.get()
+        self.assertEqual((blob.name, blob.refcount), (names.pop(), 2))
+        self.assertTrue(self.storage.exists(blob.name))
+        self.assertFalse(any(self.storage.exists(legacy) for legacy in legacy_names))
+
+
+class ColorBucketTests(TestCase):
+
+    def setUp(self):
+        self.reporter = User.objects.create_user("finder", password="x")
+        self.item = Item.objects.create(
+            reported_by=self.reporter, item_name="Umbrella", description="",
+            category="Other", location="Library", item_type="found", color="navy",
+        )
+
+    def test_backfill_migration(self):
+        Item.objects.filter(pk=self.item.pk).update(color_bucket=None)
+        migration = importlib.import_module("items.migrations.0014_backfill_color_bucket")
+
+        migration.backfill_color_bucket(apps, None)
+
+        self.assertEqual(Item.objects.get(pk=self.item.pk).get_color_bucket_display(), "Blue")
+
+    def test_identical_unknown_colors_still_match(self):
+        lost, found = (
+            Item.objects.create(
+                reported_by=self.reporter, item_name="Scarf", description="",
+                category="Other", color=color, location="Gym", item_type=item_type,
+            )
+            for item_type, color in (("lost", "Sparkly"), ("found", "sparkly "))
+        )
+        self.assertIsNone(lost.color_bucket)
+
+        self.assertEqual(color_signal(lost.color_bucket, found.color_bucket, lost.color, found.color), 15)
+        self.assertEqual(color_signal(None, None, "sparkly", "striped"), 0)
+        self.assertEqual(color_signal(None, None, "", ""), 0)
+
+    def test_unknown_color_clears_the_bucket(self):
+        item = Item.objects.get(pk=self.item.pk)
+        item.color = "sparkly"
+        item.save()
+
+        self.assertIsNone(Item.objects.get(pk=item.pk).color_bucket)
+
+    def test_photo_bucket_survives_unrelated_edits(self):
+        Item.objects.filter(pk=self.item.pk).update(color="sparkly", color_bucket=7)
+        item = Item.objects.get(pk=self.item.pk)
+        item.status = "matched"
+        item.save()
+
+        self.assertEqual(Item.objects.get(pk=item.pk).color_bucket, 7)
+
+
+class BulkMatchDecisionTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="x")
+        self.finder = User.objects.create_user("finder", password="x")
+        self.lost = make_items(2, self.owner, "lost", status="potential_match")
+        self.found = [
+            make_items(1, self.finder, "found", status="potential_match", matched_lost_item=lost)[0]
+            for lost in self.lost
+        ]
+
+    def test_bulk_approve(self):
+        self.assertEqual(bulk_approve_matches([item.id for item in self.found]), 2)
+
+        self.assertEqual(set(Item.objects.values_list("status", flat=True)), {"matched"})
+        self.assertEqual(NotificationOutbox.objects.count(), 4)
+
+    def test_bulk_reject(self):
+        bulk_reject_matches([self.found[0].id])
+
+        found, lost = Item.objects.get(pk=self.found[0].pk), Item.objects.get(pk=self.lost[0].pk)
+        self.assertEqual((found.status, found.matched_lost_item_id), ("unclaimed", None))
+        self.assertEqual(lost.status, "unmatched")
+
+    def test_decided_match_is_a_conflict(self):
+        bulk_reject_matches([self.found[0].id])
+
+        with self.assertRaises(ConflictError):
+            bulk_approve_matches([item.id for item in self.found])
+
+        self.assertEqual(Item.objects.get(pk=self.found[1].pk).status, "potential_match")
+        self.assertEqual(NotificationOutbox.objects.count(), 2)
+
+    def test_second_rejection_of_the_same_pair_is_notified(self):
+        found, lost = self.found[0], self.lost[0]
+        bulk_reject_matches([found.id])
+
+        # reported as found for the same lost item again
+        Item.objects.filter(pk=found.pk).update(status="potential_match", matched_lost_item=lost)
+        Item.objects.filter(pk=lost.pk).update(status="potential_match")
+        bulk_reject_matches([found.id])
+
+        self.assertEqual(NotificationOutbox.objects.filter(user=self.owner).count(), 2)
+
+
+class ImageWorkerTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 48), (40, 80, 200)).save(buffer, "JPEG")
+        self.item = Item.objects.create(
+            reported_by=User.objects.create_user("finder", password="x"),
+            item_name="Umbrella", description="", category="Other",
+            location="Library", item_type="found",
+            image=SimpleUploadedFile("umbrella.jpg", buffer.getvalue()),
+        )
+
+    def process(self, during_render=lambda: None):
+        render_image = images.render_image
+
+        def render(*args):
+            during_render()
+            return render_image(*args)
+
+        with mock.patch.object(images, "render_image", render):
+            return images.process_image_batch()
+
+    def test_batch_is_claimed_before_rendering(self):
+        statuses = []
+        self.process(lambda: statuses.append(Item.objects.get(pk=self.item.pk).image_status))
+
+        item = Item.objects.get(pk=self.item.pk)
+        self.assertEqual(statuses, ["processing"])
+        self.assertEqual(item.image_status, "ready")
+        self.assertEqual(item.image_derivatives["source"], item.image.name)
+        self.assertEqual(item.get_color_bucket_display(), "Blue")
+
+    def test_image_replaced_while_rendering_is_left_queued(self):
+        def replace_image():
+            item = Item.objects.get(pk=self.item.pk)
+            item.image = SimpleUploadedFile("other.jpg", b"another photo")
+            item.save()
+
+        self.process(replace_image)
+
+        item = Item.objects.get(pk=self.item.pk)
+        self.assertEqual(item.image_status, "pending")
+        self.assertEqual(item.image_derivatives, {})
+
+        # the derivatives rendered for the old photo are not left behind
+        root = os.path.splitext(self.item.image.name)[0]
+        for size, (_, extension, _) in itertools.product(DERIVATIVE_SIZES, DERIVATIVE_FORMATS.values()):
+            self.assertFalse(item_image_storage().exists(f"{root}.{size}.{extension}"))
+
+
+class ImageRenderingTests(TestCase):
+
+    def jpeg(self, size, exif=None):
+        buffer = io.BytesIO()
+        Image.new("RGB", size, (200, 30, 30)).save(buffer, "JPEG", **({"exif": exif} if exif else {}))
+        return buffer.getvalue()
+
+    def test_every_size_and_format_is_rendered(self):
+        result = render_image(self.jpeg((3000, 1500)), max_edge=2560)
+
+        self.assertEqual(Image.open(io.BytesIO(result["original"])).size, (2560, 1280))
+        self.assertEqual(
+            {size: entry["width"] for size, entry in result["derivatives"].items()},
+            {"thumb": 200, "card": 480, "detail": 1200},
+        )
+        for (size, fmt), data in result["files"].items():
+            image = Image.open(io.BytesIO(data))
+            self.assertEqual(image.format, DERIVATIVE_FORMATS[fmt][0])
+            self.assertEqual(image.width, result["derivatives"][size]["width"])
+
+    def test_small_photos_are_not_upscaled(self):
+        result = render_image(self.jpeg((150, 100)))
+
+        self.assertEqual(result["derivatives"]["detail"], {"width": 150, "height": 100})
+
+    def test_exif_orientation_is_applied_and_metadata_stripped(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotate 90° clockwise
+        exif[0x010e] = "Taken at home"
+        exif.get_ifd(0x8825).update({1: "N", 2: (51.0, 30.0, 12.0)})  # GPS
+
+        # small enough to keep its size: the original is still re-encoded
+        result = render_image(self.jpeg((60, 40), exif))
+
+        original = Image.open(io.BytesIO(result["original"]))
+        self.assertEqual(original.size, (40, 60))
+        self.assertEqual(dict(original.getexif()), {})
+        for data in result["files"].values():
+            self.assertEqual(dict(Image.open(io.BytesIO(data)).getexif()), {})
+        self.assertEqual(result["derivatives"]["thumb"], {"width": 40, "height": 60})
+
+    def test_item_picture_srcset(self):
+        item = Item(item_name="Umbrella", image="item_images/u.jpg", image_derivatives={
+            "source": "item_images/u.jpg",
+            "thumb": {"width": 200, "height": 150, "webp": "item_images/u.thumb.webp", "jpeg": "item_images/u.thumb.jpg"},
+            "card": {"width": 480, "height": 360, "webp": "item_images/u.card.webp", "jpeg": "item_images/u.card.jpg"},
+        })
+
+        html = Template('{% load item_images %}{% item_picture item "card" %}').render(Context({"item": item}))
+
+        self.assertInHTML(
+            '<source type="image/webp" sizes="480px" srcset="'
+            '/media/item_images/u.thumb.webp 200w, /media/item_images/u.card.webp 480w">',
+            html,
+        )
+        self.assertIn('src="/media/item_images/u.card.jpg"', html)
+        self.assertIn('srcset="/media/item_images/u.thumb.jpg 200w, /media/item_images/u.card.jpg 480w"', html)
+        self.assertIn('width="480" height="360"', html)
+
+    def test_item_picture_falls_back_to_the_original(self):
+        item = Item(item_name="Umbrella", image="item_images/u.jpg", image_derivatives={})
+
+        html = Template('{% load item_images %}{% item_picture item %}').render(Context({"item": item}))
+
+        self.assertNotIn("<picture>", html)
+        self.assertIn('src="/media/item_images/u.jpg"', html)
+
+
+class MediaServingTests(TestCase):
+
+    NAME = "item_images/ab/cd/abcd" + "0" * 60 + ".jpg"
+    DATA = b"0123456789"
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+        for name in (self.NAME, "item_images/.upload-x", "private/notes.txt"):
+            path = os.path.join(media_root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(self.DATA)
+
+    def get(self, name=NAME, **headers):
+        return self.client.get("/media/" + name, headers=headers)
+
+    def test_serves_with_cache_validators(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.DATA)
+        self.assertEqual(response["ETag"], '"abcd' + "0" * 60 + '"')
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertEqual(self.client.post("/media/" + self.NAME).status_code, 405)
+
+    def test_only_served_dirs_and_no_dotfiles_or_traversal(self):
+        for name in ("private/notes.txt", "item_images/.upload-x",
+                     "item_images/../private/notes.txt", "item_images/%2e%2e/private/notes.txt",
+                     "item_images/missing.jpg"):
+            with self.subTest(name=name):
+                self.assertEqual(self.get(name).status_code, 404)
+
+    @override_settings(MEDIA_REQUIRE_LOGIN=True)
+    def test_login_required(self):
+        self.assertEqual(self.get().status_code, 404)
+
+        self.client.force_login(User.objects.create_user("student", password="x"))
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Cache-Control"].startswith("private"))
+
+    def test_not_modified(self):
+        etag = self.get()["ETag"]
+
+        response = self.get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_ranges(self):
+        response = self.get(range="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+
+        response = self.get(range="bytes=-3")
+        self.assertEqual(b"".join(response.streaming_content), b"789")
+
+        response = self.get(range="bytes=20-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+    def test_if_range(self):
+        validators = self.get()
+
+        response = self.get(range="bytes=2-5", if_range=validators["ETag"])
+        self.assertEqual(response.status_code, 206)
+        response = self.get(range="bytes=2-5", if_range=validators["Last-Modified"])
+        self.assertEqual(response.status_code, 206)
+
+        for stale in ('"other"', "W/" + validators["ETag"], "Mon, 01 Jan 2024 00:00:00 GMT"):
+            with self.subTest(if_range=stale):
+                response = self.get(range="bytes=2-5", if_range=stale)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(b"".join(response.streaming_content), self.DATA)
+
+    def test_front_server_offload(self):
+        with override_settings(MEDIA_SENDFILE_BACKEND="nginx"):
+            response = self.get()
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/" + self.NAME)
+        self.assertEqual(response.content, b"")
+
+        with override_settings(MEDIA_SENDFILE_BACKEND="sendfile"):
+            response = self.get()
+        self.assertEqual(response["X-Sendfile"], os.path.join(settings.MEDIA_ROOT, self.NAME))
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+
+
+class ListCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.finder = User.objects.create_user("finder", password="x")
+        self.item = make_items(1, self.finder, "found", status="unclaimed")[0]
+
+    def assertBumps(self, change):
+        before = list_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertEqual(list_generation(), before + 1)
+
+    def test_item_writes_bump_the_generation(self):
+        self.assertBumps(lambda: self.item.save())
+        self.assertBumps(lambda: rows_updated.send(sender=Item))
+        self.assertBumps(lambda: self.item.delete())
+
+    def test_logins_do_not_bump_the_generation(self):
+        before = list_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.force_login(self.finder)
+        self.assertEqual(list_generation(), before)
+
+    def test_each_viewer_variant_gets_its_own_fragments(self):
+        url = reverse("list_found_items")
+        claim_url = reverse("claim_confirmation", args=[self.item.id])
+
+        self.client.force_login(User.objects.create_user("student", password="x", role="student"))
+        self.assertContains(self.client.get(url), claim_url)
+
+        self.client.logout()
+        page = self.client.get(url)
+        self.assertContains(page, "Item 0")
+        self.assertNotContains(page, claim_url)
+
+        self.client.force_login(User.objects.create_user("admin", password="x", role="admin"))
+        page = self.client.get(url)
+        self.assertContains(page, "Reported By:</strong> finder")
+        self.assertNotContains(page, claim_url)
+
+    def test_renamed_reporter_is_shown(self):
+        self.client.force_login(User.objects.create_user("admin", password="x", role="admin"))
+        url = reverse("list_lost_items")
+        make_items(1, self.finder, "lost", status="unclaimed")
+        self.assertContains(self.client.get(url), "Reported by:</strong> finder")
+
+        self.finder.username = "finder2"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.finder.save()
+
+        self.assertContains(self.client.get(url), "Reported by:</strong> finder2")
+
+
+class DuplicateWarningTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.pending_dir = os.path.join(media_root, PENDING_UPLOAD_DIR)
+
+        self.client.force_login(User.objects.create_user("finder", password="x"))
+        self.report(self.photo((200, 40, 40)))  # the report the next ones duplicate
+
+    def photo(self, color, name="wallet.jpg"):
+        buffer = io.BytesIO()
+        image = Image.new("RGB", (64, 48), color)
+        image.paste((250, 250, 250), (0, 0, 32, 24))
+        image.save(buffer, "JPEG")
+        return SimpleUploadedFile(name, buffer.getvalue(), "image/jpeg")
+
+    def report(self, photo=None, **extra):
+        data = {
+            "item_name": "Wallet", "description": "Red wallet", "category": "Other",
+            "color": "red", "location": "Library", **extra,
+        }
+        if photo is not None:
+            data["image"] = photo
+        return self.client.post(reverse("report_found"), data)
+
+    def test_confirming_keeps_the_photo(self):
+        response = self.report(self.photo((200, 40, 40), "again.jpg"))
+        self.assertTemplateUsed(response, "items/duplicate_warning.html")
+        self.assertEqual(len(os.listdir(self.pending_dir)), 1)
+
+        response = self.report(bypass_warning="yes")  # no photo attached
+
+        self.assertRedirects(response, reverse("dashboard"), fetch_redirect_response=False)
+        first, second = Item.objects.order_by("id")
+        self.assertEqual(second.image.name, first.image.name)  # same bytes, same blob
+        self.assertEqual(os.listdir(self.pending_dir), [])
+        self.assertNotIn(PENDING_UPLOAD_SESSION_KEY, self.client.session)
+
+    def test_new_photo_on_confirm_replaces_the_kept_one(self):
+        self.report(self.photo((200, 40, 40), "again.jpg"))
+
+        self.report(self.photo((40, 200, 40), "other.jpg"), bypass_warning="yes")
+
+        first, second = Item.objects.order_by("id")
+        self.assertNotEqual(second.image.name, first.image.name)
+        self.assertEqual(os.listdir(self.pending_dir), [])
+
+    def test_confirm_without_a_kept_photo_still_asks_for_one(self):
+        response = self.report(bypass_warning="yes")
+
+        self.assertFormError(response.context["form"], "image", "You must upload an image for a FOUND item.")
+        self.assertEqual(Item.objects.count(), 1)
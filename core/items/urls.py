@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import report_lost_item, report_found_item,list_lost_items,list_found_items,search_items,delete_item,my_lost_items,found_from_lost,pending_matches,approve_match,reject_match
+from .views import report_lost_item, report_found_item,list_lost_items,list_found_items,search_items,delete_item,my_lost_items,found_from_lost,pending_matches,approve_match,reject_match,bulk_match_decision
 
 urlpatterns = [
     path('report-lost/', report_lost_item, name='report_lost'),
@@ -13,6 +13,7 @@ urlpatterns = [
     path("pending-matches/", pending_matches, name="pending_matches"),
     path("approve-match/<int:item_id>/", approve_match, name="approve_match"),
     path("reject-match/<int:item_id>/", reject_match, name="reject_match"),
+    path("pending-matches/bulk/", bulk_match_decision, name="bulk_match_decision"),
 
 
 ]   
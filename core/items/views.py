@@ -1,6 +1,6 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.db.models import Q
+from django.db import transaction
 from django.http import HttpResponse
 
 from .forms import (
@@ -10,8 +10,19 @@ from .forms import (
     FoundFromLostItemForm,
 )
 
+from .concurrency import ConflictError, conditional_update
+from .duplicates import find_duplicate_found_items, to_signed
+from .image_ops import hash_upload
+from .list_cache import list_cache_context
 from .models import Item
-from users.models import Notification
+from .pending_uploads import discard_pending_upload, keep_pending_upload, restore_pending_upload
+from .services import (
+    bulk_approve_matches,
+    bulk_reject_matches,
+    match_approved_notifications,
+    match_rejected_notifications,
+)
+from users.notifications import notify_many
 from claims.models import Claim   # ✅ IMPORTANT: import Claim for auto-claims
 
 
@@ -22,6 +33,16 @@ def is_admin(user):
     return user.is_superuser or getattr(user, "role", None) in ["admin", "staff"]
 
 
+# Columns the item list / search templates read ({% item_picture %} needs
+# image + image_derivatives, the list caches key on updated_at).
+# A template reading anything else costs one query per row — add it here.
+ITEM_LIST_FIELDS = (
+    "id", "item_name", "description", "category", "color", "location",
+    "item_type", "date_lost", "date_found", "status", "updated_at",
+    "image", "image_derivatives",
+)
+
+
 @user_passes_test(is_admin)
 def delete_item(request, item_id):
     item = get_object_or_404(Item, id=item_id)
@@ -49,20 +70,74 @@ def report_lost_item(request):
     return render(request, "items/report_lost.html", {"form": form})
 
 
+# ---------------------------------------------------------
+# DUPLICATE PHOTO CHECK (found reports)
+# ---------------------------------------------------------
+def _found_report_files(request):
+    """
+    request.FILES for a found report form. On "Proceed Anyway" without a
+    new photo attached, the one kept by the duplicate warning is used.
+    """
+    if request.POST.get("bypass_warning") != "yes" or request.FILES.get("image"):
+        return request.FILES
+
+    photo = restore_pending_upload(request)
+    if photo is None:
+        return request.FILES
+
+    files = request.FILES.copy()
+    files["image"] = photo
+    return files
+
+
+def _duplicate_photo_warning(request, form, found_item):
+    """
+    Hash the uploaded photo onto `found_item`. If it looks like an open
+    found report, keep the photo (items.pending_uploads) and return the
+    duplicate warning page (unless the user already chose "Proceed Anyway").
+    """
+    image = form.cleaned_data.get("image")
+    if not image:
+        return None
+
+    image_hash = hash_upload(image)
+    found_item.image_hash = to_signed(image_hash)
+
+    if request.POST.get("bypass_warning") == "yes":
+        return None
+
+    similar_items = find_duplicate_found_items(image_hash)
+    if not similar_items:
+        return None
+
+    keep_pending_upload(request, image)
+    return render(
+        request,
+        "items/duplicate_warning.html",
+        {"form": form, "similar_items": similar_items},
+    )
+
+
 # ---------------------------------------------------------
 # REPORT FOUND ITEM (NORMAL WORKFLOW)
 # ---------------------------------------------------------
 @login_required
 def report_found_item(request):
     if request.method == "POST":
-        form = FoundItemForm(request.POST, request.FILES)
+        form = FoundItemForm(request.POST, _found_report_files(request))
 
         if form.is_valid():
             found_item = form.save(commit=False)
+
+            warning = _duplicate_photo_warning(request, form, found_item)
+            if warning:
+                return warning
+
             found_item.item_type = "found"
             found_item.reported_by = request.user
             found_item.status = "unclaimed"
             found_item.save()
+            discard_pending_upload(request)
             return redirect("dashboard")
 
     else:
@@ -77,10 +152,17 @@ def report_found_item(request):
 def list_lost_items(request):
     items = (
         Item.objects.filter(item_type="lost", status="unclaimed")
+        .select_related("reported_by")
+        .only(*ITEM_LIST_FIELDS, "reported_by__username")
         .order_by("-date_reported")
     )
 
-    return render(request, "items/list_lost_items.html", {"items": items})
+    # the query only runs when the cached list fragment has expired
+    return render(
+        request,
+        "items/list_lost_items.html",
+        {"items": items, **list_cache_context(request)},
+    )
 
 
 # ---------------------------------------------------------
@@ -90,6 +172,7 @@ def list_lost_items(request):
 def my_lost_items(request):
     items = (
         Item.objects.filter(item_type="lost", reported_by=request.user)
+        .only(*ITEM_LIST_FIELDS)
         .order_by("-date_reported")
     )
 
@@ -118,11 +201,15 @@ def found_from_lost(request, item_id):
         return HttpResponse("You cannot mark your own item as found.", status=403)
 
     if request.method == "POST":
-        form = FoundFromLostItemForm(request.POST, request.FILES)
+        form = FoundFromLostItemForm(request.POST, _found_report_files(request))
 
         if form.is_valid():
             found_item = form.save(commit=False)
 
+            warning = _duplicate_photo_warning(request, form, found_item)
+            if warning:
+                return warning
+
             # Copy essential fields from LOST item (name, category, color)
             found_item.item_type = "found"
             found_item.item_name = lost_item.item_name
@@ -133,45 +220,52 @@ def found_from_lost(request, item_id):
             found_item.status = "potential_match"
             found_item.matched_lost_item = lost_item
 
-            # Lost item also becomes potential_match
-            lost_item.status = "potential_match"
-
-            # Save both
-            found_item.save()
-            lost_item.save()
-
-            # 🔥 AUTO-CREATE CLAIM for User A (system-generated)
-            Claim.objects.create(
-                item=lost_item,                     # The lost item being claimed
-                claimed_by=lost_item.reported_by,   # User A
-                matched_found_item=found_item,      # The found item from User B
-                created_by_system=True,             # Mark as system-created
-                matched_lost_exists=True,           # There IS a lost report
-                status="pending",                   # Goes to pending_claims
-                message=(
-                    "System auto-created this claim because another user "
-                    "reported a found item matching your lost report."
-                ),
-            )
-
-            # Notify User A (owner of lost item)
-            Notification.objects.create(
-                user=lost_item.reported_by,
-                message=(
-                    f"A possible match has been found for your lost item "
-                    f"'{lost_item.item_name}'. Please visit the Lost & Found Desk to confirm."
-                ),
-            )
-
-            # Optional: Notify User B (finder)
-            Notification.objects.create(
-                user=request.user,
-                message=(
-                    f"Thank you! Your found item report for '{lost_item.item_name}' "
-                    f"is pending confirmation by the owner and admin."
-                ),
-            )
-
+            # Save both + queue the claim and notifications atomically
+            try:
+                with transaction.atomic():
+                    found_item.save()
+
+                    # Lost item also becomes potential_match
+                    conditional_update(lost_item, status="potential_match")
+
+                    # 🔥 AUTO-CREATE CLAIM for User A (system-generated)
+                    Claim.objects.create(
+                        item=lost_item,                     # The lost item being claimed
+                        claimed_by=lost_item.reported_by,   # User A
+                        matched_found_item=found_item,      # The found item from User B
+                        created_by_system=True,             # Mark as system-created
+                        matched_lost_exists=True,           # There IS a lost report
+                        status="pending",                   # Goes to pending_claims
+                        message=(
+                            "System auto-created this claim because another user "
+                            "reported a found item matching your lost report."
+                        ),
+                    )
+
+                    notify_many([
+                        # Notify User A (owner of lost item)
+                        (
+                            lost_item.reported_by,
+                            f"A possible match has been found for your lost item "
+                            f"'{lost_item.item_name}'. Please visit the Lost & Found Desk to confirm.",
+                            f"found:{found_item.id}:owner",
+                        ),
+                        # Optional: Notify User B (finder)
+                        (
+                            request.user,
+                            f"Thank you! Your found item report for '{lost_item.item_name}' "
+                            f"is pending confirmation by the owner and admin.",
+                            f"found:{found_item.id}:finder",
+                        ),
+                    ])
+            except ConflictError:
+                # someone else changed the lost report meanwhile
+                return HttpResponse(
+                    "This lost item was updated by someone else. Please go back and try again.",
+                    status=409,
+                )
+
+            discard_pending_upload(request)
             return redirect("dashboard")
 
     else:
@@ -190,10 +284,16 @@ def found_from_lost(request, item_id):
 def list_found_items(request):
     items = (
         Item.objects.filter(item_type="found", status="unclaimed")
+        .select_related("reported_by")
+        .only(*ITEM_LIST_FIELDS, "reported_by__username")
         .order_by("-date_reported")
     )
 
-    return render(request, "items/list_found_items.html", {"items": items})
+    return render(
+        request,
+        "items/list_found_items.html",
+        {"items": items, **list_cache_context(request)},
+    )
 
 
 # ---------------------------------------------------------
@@ -201,44 +301,14 @@ def list_found_items(request):
 # ---------------------------------------------------------
 def search_items(request):
     form = ItemSearchForm(request.GET or None)
-    items = Item.objects.all().order_by("-date_reported")
+    items = (
+        Item.objects.select_related("reported_by")
+        .only(*ITEM_LIST_FIELDS, "reported_by__username")
+        .order_by("-date_reported")
+    )
 
     if form.is_valid():
-        keyword = form.cleaned_data.get("keyword")
-        category = form.cleaned_data.get("category")
-        color = form.cleaned_data.get("color")
-        location = form.cleaned_data.get("location")
-        item_type = form.cleaned_data.get("item_type")
-        start_date = form.cleaned_data.get("start_date")
-        end_date = form.cleaned_data.get("end_date")
-
-        if keyword:
-            items = items.filter(
-                Q(item_name__icontains=keyword) | Q(description__icontains=keyword)
-            )
-
-        if category:
-            items = items.filter(category__icontains=category)
-
-        if color:
-            items = items.filter(color__icontains=color)
-
-        if location:
-            items = items.filter(location__icontains=location)
-
-        if item_type:
-            items = items.filter(item_type=item_type)
-
-        # Correct date filter for separated lost/found dates
-        if start_date:
-            items = items.filter(
-                Q(date_lost__gte=start_date) | Q(date_found__gte=start_date)
-            )
-
-        if end_date:
-            items = items.filter(
-                Q(date_lost__lte=end_date) | Q(date_found__lte=end_date)
-            )
+        items = form.filter_items(items)
 
     return render(
         request,
@@ -254,7 +324,7 @@ def search_items(request):
 def pending_matches(request):
     matches = (
         Item.objects.filter(item_type="found", status="potential_match")
-        .select_related("matched_lost_item")
+        .select_related("reported_by", "matched_lost_item__reported_by")
     )
 
     return render(
@@ -264,34 +334,39 @@ def pending_matches(request):
     )
 
 
+def _seen_version(request):
+    # Version of the item the reviewer saw on the page (?v=), if given
+    try:
+        return int(request.GET["v"])
+    except (KeyError, ValueError):
+        return None
+
+
 # ---------------------------------------------------------
 # ADMIN — APPROVE MATCH
 # ---------------------------------------------------------
 @user_passes_test(is_admin)
 def approve_match(request, item_id):
-    found_item = get_object_or_404(Item, id=item_id, item_type="found")
+    found_item = get_object_or_404(
+        Item.objects.select_related("matched_lost_item"), id=item_id, item_type="found"
+    )
     lost_item = found_item.matched_lost_item
 
-    found_item.status = "matched"
-    lost_item.status = "matched"
-
-    found_item.save()
-    lost_item.save()
+    if lost_item is None:
+        return HttpResponse("This found item is not linked to a lost report.", status=409)
 
-    # Notify owner
-    Notification.objects.create(
-        user=lost_item.reported_by,
-        message=(
-            f"Match confirmed! Your item '{lost_item.item_name}' has been found. "
-            f"Please visit the Lost & Found desk."
-        ),
-    )
+    try:
+        with transaction.atomic():
+            conditional_update(found_item, _seen_version(request), status="matched")
+            conditional_update(lost_item, status="matched")
 
-    # Notify finder
-    Notification.objects.create(
-        user=found_item.reported_by,
-        message="The item you reported as found has been confirmed by the owner!",
-    )
+            # Notify owner and finder
+            notify_many(match_approved_notifications(
+                found_item.id, found_item.version, found_item.reported_by_id,
+                lost_item.id, lost_item.item_name, lost_item.reported_by_id,
+            ))
+    except ConflictError as e:
+        return HttpResponse(str(e), status=409)
 
     return redirect("pending_matches")
 
@@ -301,26 +376,53 @@ def approve_match(request, item_id):
 # ---------------------------------------------------------
 @user_passes_test(is_admin)
 def reject_match(request, item_id):
-    found_item = get_object_or_404(Item, id=item_id, item_type="found")
+    found_item = get_object_or_404(
+        Item.objects.select_related("matched_lost_item"), id=item_id, item_type="found"
+    )
     lost_item = found_item.matched_lost_item
 
-    # Revert statuses
-    found_item.status = "unclaimed"
-    found_item.matched_lost_item = None
+    if lost_item is None:
+        return HttpResponse("This found item is not linked to a lost report.", status=409)
+
+    try:
+        with transaction.atomic():
+            # Revert statuses
+            conditional_update(
+                found_item,
+                _seen_version(request),
+                status="unclaimed",
+                matched_lost_item=None,
+            )
+            conditional_update(lost_item, status="unmatched")
 
-    lost_item.status = "unmatched"
+            notify_many(match_rejected_notifications(
+                found_item.id, found_item.version, found_item.reported_by_id,
+                lost_item.id, lost_item.reported_by_id,
+            ))
+    except ConflictError as e:
+        return HttpResponse(str(e), status=409)
 
-    found_item.save()
-    lost_item.save()
+    return redirect("pending_matches")
 
-    Notification.objects.create(
-        user=lost_item.reported_by,
-        message="The found item did NOT match your lost item.",
-    )
 
-    Notification.objects.create(
-        user=found_item.reported_by,
-        message="Your reported found item did not match the lost report.",
-    )
+# ---------------------------------------------------------
+# ADMIN — BULK APPROVE / REJECT MATCHES
+# ---------------------------------------------------------
+@user_passes_test(is_admin)
+def bulk_match_decision(request):
+    if request.method != "POST":
+        return redirect("pending_matches")
+
+    found_ids = [int(i) for i in request.POST.getlist("item_ids") if i.isdigit()]
+    decision = request.POST.get("decision")
+
+    if found_ids:
+        try:
+            if decision == "approve":
+                bulk_approve_matches(found_ids)
+            elif decision == "reject":
+                bulk_reject_matches(found_ids)
+        except ConflictError as e:
+            return HttpResponse(str(e), status=409)
 
     return redirect("pending_matches")
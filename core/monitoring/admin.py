@@ -0,0 +1,15 @@
+from django.contrib import admin
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ('short_sql', 'view', 'count', 'total_ms', 'max_ms', 'last_seen')
+    list_filter = ('view',)
+    ordering = ('-total_ms',)
+    readonly_fields = ('fingerprint', 'sql', 'view', 'call_site', 'explain',
+                       'count', 'total_ms', 'max_ms', 'first_seen', 'last_seen')
+
+    @admin.display(description='SQL')
+    def short_sql(self, obj):
+        return obj.sql[:120]
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from monitoring.models import SlowQuery
+
+
+ORDERINGS = {
+    'total': F('total_ms').desc(),
+    'count': F('count').desc(),
+    'max': F('max_ms').desc(),
+    'avg': (F('total_ms') / F('count')).desc(),
+}
+
+
+class Command(BaseCommand):
+    help = "Print the slowest view queries captured by monitoring (SLOW_QUERY_MS), grouped by SQL shape."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help="Number of queries to show.")
+        parser.add_argument(
+            '--order', choices=sorted(ORDERINGS), default='total',
+            help="Rank by total time (default), count, max or average time.",
+        )
+        parser.add_argument('--view', help="Only queries first seen in this view (URL name).")
+        parser.add_argument('--explain', action='store_true', help="Also print the query plans.")
+        parser.add_argument('--reset', action='store_true', help="Delete all captured queries and exit.")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            deleted, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} slow queries."))
+            return
+
+        queries = SlowQuery.objects.order_by(ORDERINGS[options['order']])
+        if options['view']:
+            queries = queries.filter(view=options['view'])
+        queries = list(queries[:options['limit']])
+
+        if not queries:
+            self.stdout.write("No slow queries captured.")
+            return
+
+        for rank, query in enumerate(queries, 1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"#{rank}  {query.total_ms:.1f} ms total · {query.count}× · "
+                f"avg {query.avg_ms:.1f} ms · max {query.max_ms:.1f} ms"
+            ))
+            self.stdout.write(f"    view: {query.view or '-'}   at: {query.call_site or '(template / Django)'}")
+            self.stdout.write(f"    last seen: {query.last_seen:%Y-%m-%d %H:%M}")
+            self.stdout.write(f"    {query.sql}")
+            if options['explain'] and query.explain:
+                for line in query.explain.splitlines():
+                    self.stdout.write(f"      {line}")
+            self.stdout.write("")
@@ -0,0 +1,169 @@
+# monitoring/metrics.py
+#
+# In-process request metrics: per-request counters in a ContextVar, folded
+# into per-view histograms when the response is done. Each process keeps
+# its own histograms; Prometheus sums them across scrape targets.
+
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter_ns
+
+from .slow_queries import capture_slow_query
+
+
+# Histogram upper bounds (Prometheus `le`)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000)
+
+# Method label values; anything else a client sends is counted as 'other'
+# so arbitrary verbs can't grow the registry
+HTTP_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+# (metric name, help, buckets) — one histogram per metric and view
+METRICS = (
+    ('http_request_duration_seconds', 'Wall time from first middleware to response.', DURATION_BUCKETS),
+    ('http_request_db_queries', 'Database queries per request.', QUERY_COUNT_BUCKETS),
+    ('http_request_db_seconds', 'Time spent in database queries per request.', DURATION_BUCKETS),
+    ('http_request_template_seconds', 'Time spent rendering templates per request.', DURATION_BUCKETS),
+    ('http_response_size_bytes', 'Response body size (non-streaming responses).', SIZE_BUCKETS),
+)
+
+
+class RequestMetrics:
+    """What one request did so far; filled by the query / template hooks."""
+
+    __slots__ = ('started_ns', 'queries', 'db_ns', 'template_ns', 'template_depth',
+                 'slowest_ns', 'slowest_sql', 'slow_query_ns', 'slow_queries')
+
+    def __init__(self, slow_query_ns):
+        self.started_ns = perf_counter_ns()
+        self.queries = 0
+        self.db_ns = 0
+        self.template_ns = 0
+        self.template_depth = 0
+        self.slowest_ns = 0
+        self.slowest_sql = None
+        self.slow_query_ns = slow_query_ns
+        self.slow_queries = None  # monitoring.slow_queries, saved after the response
+
+
+# The request being handled in this context. asgiref copies the context
+# into sync_to_async threads, so queries of async views are counted too.
+current_request_metrics = ContextVar('current_request_metrics', default=None)
+
+
+# ---------------------------------------------------------
+# HOOKS
+# ---------------------------------------------------------
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection (monitoring.apps)."""
+    metrics = current_request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = perf_counter_ns()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = perf_counter_ns() - start
+        metrics.queries += 1
+        metrics.db_ns += elapsed
+        if elapsed > metrics.slowest_ns:
+            metrics.slowest_ns = elapsed
+            metrics.slowest_sql = sql
+        if elapsed >= metrics.slow_query_ns:
+            capture_slow_query(metrics, sql, params, many, context, elapsed)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    # connection_created fires again after a reconnect on the same wrapper
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# ---------------------------------------------------------
+# HISTOGRAMS
+# ---------------------------------------------------------
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot: +Inf
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}  # (metric, view, method) → Histogram
+        self._responses = {}   # (view, method, status) → count
+
+    def observe_request(self, view, method, status, values):
+        """`values`: one observation per METRICS entry, in order (None = skip)."""
+        if method not in HTTP_METHODS:
+            method = 'other'
+
+        with self._lock:
+            for (name, _, buckets), value in zip(METRICS, values):
+                if value is None:
+                    continue
+                key = (name, view, method)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(buckets)
+                histogram.observe(value)
+
+            key = (view, method, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._responses.clear()
+
+    def render_prometheus(self):
+        """Everything recorded so far in the Prometheus text format (0.0.4)."""
+        with self._lock:
+            histograms = {key: (list(h.counts), h.sum, h.count) for key, h in self._histograms.items()}
+            responses = dict(self._responses)
+
+        lines = [
+            '# HELP http_responses_total Responses by view, method and status code.',
+            '# TYPE http_responses_total counter',
+        ]
+        for (view, method, status), count in sorted(responses.items()):
+            lines.append(
+                f'http_responses_total{{view="{_escape(view)}",method="{_escape(method)}",status="{status}"}} {count}'
+            )
+
+        for name, help_text, buckets in METRICS:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for (metric, view, method), (counts, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                labels = f'view="{_escape(view)}",method="{_escape(method)}"'
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{labels}}} {total:g}')
+                lines.append(f'{name}_count{{{labels}}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,112 @@
+# monitoring/middleware.py
+
+import logging
+from time import perf_counter_ns
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from .metrics import RequestMetrics, current_request_metrics, registry
+from .profiling import profile_view, profiling_requested
+from .slow_queries import defer_slow_queries
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Per-view wall time, DB query count / time, template render time and
+    response size, folded into monitoring.metrics histograms. Requests
+    slower than REQUEST_SLOW_MS are logged with their slowest SQL;
+    queries slower than SLOW_QUERY_MS are saved as SlowQuery rows
+    (monitoring.slow_queries) by a background thread, after the response.
+
+    Keep it first in MIDDLEWARE so the wall time covers the whole stack.
+    Streaming responses are measured up to their first byte.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.slow_ns = getattr(settings, 'REQUEST_SLOW_MS', 500) * 1_000_000
+
+        slow_query_ms = getattr(settings, 'SLOW_QUERY_MS', 100)
+        self.slow_query_ns = float('inf') if slow_query_ms is None else slow_query_ms * 1_000_000
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        metrics = RequestMetrics(self.slow_query_ns)
+        token = current_request_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+
+        view = self.record(request, response, metrics)
+        if metrics.slow_queries:
+            defer_slow_queries(view, metrics.slow_queries)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics(self.slow_query_ns)
+        token = current_request_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+
+        view = self.record(request, response, metrics)
+        if metrics.slow_queries:
+            defer_slow_queries(view, metrics.slow_queries)
+        return response
+
+    def record(self, request, response, metrics):
+        elapsed_ns = perf_counter_ns() - metrics.started_ns
+
+        match = request.resolver_match
+        view = (match.view_name if match else None) or '<unresolved>'
+        size = None if response.streaming else len(response.content)
+
+        registry.observe_request(view, request.method, response.status_code, (
+            elapsed_ns / 1e9,
+            metrics.queries,
+            metrics.db_ns / 1e9,
+            metrics.template_ns / 1e9,
+            size,
+        ))
+
+        if elapsed_ns >= self.slow_ns:
+            logger.warning(
+                "Slow request %s %s (%s): %.0f ms, %d queries in %.0f ms, templates %.0f ms; "
+                "slowest query %.0f ms: %s",
+                request.method, request.path, view, elapsed_ns / 1e6,
+                metrics.queries, metrics.db_ns / 1e6, metrics.template_ns / 1e6,
+                metrics.slowest_ns / 1e6, metrics.slowest_sql,
+            )
+        return view
+
+
+class ProfilingMiddleware(MiddlewareMixin):
+    """
+    Profile one request on demand (monitoring.profiling): staff only,
+    PROFILING_ENABLED on, ?_profile=1 or "X-Profile: 1". Put it last in
+    MIDDLEWARE so auth / CSRF checks run before the view is called here.
+
+    process_view runs in the thread the sync view would run in (also
+    under ASGI), so the profile covers the view and its template
+    rendering. Async views are not profiled.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if iscoroutinefunction(view_func) or not profiling_requested(request):
+            return None
+        return profile_view(request, view_func, view_args, view_kwargs)
@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """
+    Queries from views slower than SLOW_QUERY_MS, one row per normalized
+    SQL shape (monitoring.slow_queries). Shown by `manage.py slow_queries`.
+    """
+    fingerprint = models.CharField(max_length=40, unique=True)
+    sql = models.TextField()  # normalized: literals / parameters → ?
+
+    # first view / project line seen running it (later ones only count)
+    view = models.CharField(max_length=200, blank=True)
+    call_site = models.CharField(max_length=255, blank=True)
+    explain = models.TextField(blank=True)
+
+    count = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-total_ms'], name='slow_query_total_idx'),
+        ]
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.count if self.count else 0
+
+    def __str__(self):
+        return f"{self.count}× {self.total_ms:.0f} ms: {self.sql[:80]}"
@@ -0,0 +1,173 @@
+# monitoring/profiling.py
+#
+# One-request profiles for staff: ?_profile=1 or "X-Profile: 1" on any sync
+# view when PROFILING_ENABLED is on. Each profile is saved as
+#   <name>.pstats     cProfile stats (python -m pstats, snakeviz)
+#   <name>.collapsed  sampled stacks, one "a;b;c count" line per stack
+#                     (flamegraph.pl, speedscope, inferno)
+#   <name>.json       request / timing summary for the staff page
+# in PROFILE_DIR; only the newest PROFILE_KEEP are kept.
+
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+
+from users.views import is_staff_or_admin
+
+
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'X-Profile'
+
+# Stack sampling period; cProfile alone has no full call stacks
+SAMPLE_INTERVAL = 0.001
+
+# 20261019-181700-123456-9f3a.pstats: names sort by time
+PROFILE_NAME = re.compile(r'^\d{8}-\d{6}-\d{6}-[0-9a-f]{4}\.(pstats|collapsed|json)$')
+
+
+def profile_dir():
+    return getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles'))
+
+
+def profiling_requested(request):
+    if not getattr(settings, 'PROFILING_ENABLED', False):
+        return False
+    if request.GET.get(PROFILE_PARAM) != '1' and request.headers.get(PROFILE_HEADER) != '1':
+        return False
+    return request.user.is_authenticated and is_staff_or_admin(request.user)
+
+
+class StackSampler(threading.Thread):
+    """Counts the call stacks of one thread every `interval` seconds."""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})')
+                frame = frame.f_back
+
+            stack = ';'.join(reversed(names))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# One profile at a time per process: Python 3.12+ refuses a second active
+# cProfile ("Another profiling tool is already active")
+_profiling = threading.Lock()
+
+
+def profile_view(request, view_func, args, kwargs):
+    """
+    Call the view under cProfile + the stack sampler and save the profile.
+    While another request is being profiled the view just runs.
+    """
+    if not _profiling.acquire(blocking=False):
+        return view_func(request, *args, **kwargs)
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # another profiling tool is active (coverage, a debugger)
+        _profiling.release()
+        return view_func(request, *args, **kwargs)
+
+    sampler = StackSampler(threading.get_ident())
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        response = view_func(request, *args, **kwargs)
+    finally:
+        profiler.disable()
+        _profiling.release()
+        sampler.stop()
+        elapsed = time.perf_counter() - started
+
+    name = save_profile(request, profiler, sampler.stacks, elapsed)
+    response['X-Profile-Id'] = name
+    return response
+
+
+def save_profile(request, profiler, stacks, elapsed):
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    now = datetime.now()
+    name = f"{now:%Y%m%d-%H%M%S-%f}-{uuid.uuid4().hex[:4]}"
+    base = os.path.join(directory, name)
+
+    profiler.dump_stats(base + '.pstats')
+    with open(base + '.collapsed', 'w') as out:
+        for stack, count in sorted(stacks.items()):
+            out.write(f'{stack} {count}\n')
+
+    match = request.resolver_match
+    with open(base + '.json', 'w') as out:
+        json.dump({
+            'name': name,
+            'created': now.isoformat(timespec='seconds'),
+            'view': match.view_name if match else '',
+            'path': request.get_full_path(),
+            'method': request.method,
+            'user': request.user.get_username(),
+            'seconds': round(elapsed, 4),
+            'samples': sum(stacks.values()),
+        }, out)
+
+    rotate_profiles(directory, getattr(settings, 'PROFILE_KEEP', 50))
+    return name
+
+
+def rotate_profiles(directory, keep):
+    names = sorted(
+        {entry.split('.')[0] for entry in os.listdir(directory) if PROFILE_NAME.match(entry)},
+        reverse=True,
+    )
+    for name in names[keep:]:
+        for extension in ('pstats', 'collapsed', 'json'):
+            try:
+                os.remove(os.path.join(directory, f'{name}.{extension}'))
+            except FileNotFoundError:
+                pass
+
+
+def recent_profiles():
+    """Summaries of the saved profiles, newest first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+
+    profiles = []
+    for entry in sorted(os.listdir(directory), reverse=True):
+        if not entry.endswith('.json') or not PROFILE_NAME.match(entry):
+            continue
+        try:
+            with open(os.path.join(directory, entry)) as summary:
+                profiles.append(json.load(summary))
+        except (OSError, ValueError):
+            continue  # rotated away / half written
+    return profiles
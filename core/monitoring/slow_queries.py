@@ -0,0 +1,199 @@
+# monitoring/slow_queries.py
+#
+# Slow-query capture: record_query (monitoring.metrics) keeps queries of
+# a request slower than SLOW_QUERY_MS; once the response is ready they are
+# handed to a background thread that folds them into SlowQuery rows by
+# fingerprint, with an EXPLAIN of the first occurrence (the request never
+# waits for it). `manage.py slow_queries` prints the top offenders.
+
+import hashlib
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connections
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import SlowQuery
+
+
+logger = logging.getLogger(__name__)
+
+
+# Slow queries kept per request (a runaway loop should not eat memory)
+MAX_SLOW_QUERIES_PER_REQUEST = 20
+
+# Requests waiting for the flush thread; beyond this they are dropped
+MAX_PENDING_FLUSHES = 1000
+
+_MONITORING_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+# ---------------------------------------------------------
+# FINGERPRINT
+# ---------------------------------------------------------
+# '' is the only escape in standard SQL (ESCAPE '\' is a whole literal);
+# MySQL also takes backslash escapes
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_MYSQL_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"VALUES\s*\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql, vendor=None):
+    """
+    SQL with every literal / parameter as ?, IN lists as (...), so the
+    same query with other values (or another number of ids) groups together.
+    `vendor` is the connection's (string literal escapes differ).
+    """
+    literal = _MYSQL_STRING_LITERAL if vendor == "mysql" else _STRING_LITERAL
+    sql = literal.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _VALUES_LIST.sub("VALUES (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()
+
+
+# ---------------------------------------------------------
+# CAPTURE (inside the request)
+# ---------------------------------------------------------
+def call_site():
+    """Innermost project line (not Django, not monitoring) on the stack, or ''."""
+    base_dir = os.path.join(str(settings.BASE_DIR), "")
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(base_dir) and not filename.startswith(_MONITORING_DIR):
+            relative = os.path.relpath(filename, base_dir)
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return ""
+
+
+def capture_slow_query(metrics, sql, params, many, context, elapsed_ns):
+    if metrics.slow_queries is None:
+        metrics.slow_queries = []
+    if len(metrics.slow_queries) < MAX_SLOW_QUERIES_PER_REQUEST:
+        metrics.slow_queries.append(
+            (sql, None if many else params, context["connection"].alias, elapsed_ns, call_site())
+        )
+
+
+# ---------------------------------------------------------
+# FLUSH (after the response)
+# ---------------------------------------------------------
+def explain(alias, sql, params):
+    """Query plan of a SELECT on the connection that ran it, as text."""
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return ""
+
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            columns = [column[0] for column in cursor.description or ()]
+            rows = cursor.fetchall()
+    except DatabaseError as e:
+        return f"EXPLAIN failed: {e}"
+
+    lines = [" | ".join(columns)] if columns else []
+    lines += [" | ".join("" if value is None else str(value) for value in row) for row in rows]
+    return "\n".join(lines)
+
+
+def _count(key, elapsed_ms):
+    return SlowQuery.objects.filter(fingerprint=key).update(
+        count=F("count") + 1,
+        total_ms=F("total_ms") + elapsed_ms,
+        max_ms=Greatest("max_ms", elapsed_ms),
+        last_seen=timezone.now(),  # .update() skips auto_now
+    )
+
+
+def flush_slow_queries(view, slow_queries):
+    """Fold one request's slow queries into SlowQuery rows."""
+    for sql, params, alias, elapsed_ns, site in slow_queries:
+        normalized = normalize_sql(sql, connections[alias].vendor)
+        key = fingerprint(normalized)
+        elapsed_ms = elapsed_ns / 1e6
+
+        try:
+            if not _count(key, elapsed_ms):
+                # first time: EXPLAIN once, concurrent first inserts just count
+                _, created = SlowQuery.objects.get_or_create(
+                    fingerprint=key,
+                    defaults={
+                        "sql": normalized,
+                        "view": view,
+                        "call_site": site,
+                        "explain": explain(alias, sql, params),
+                        "count": 1,
+                        "total_ms": elapsed_ms,
+                        "max_ms": elapsed_ms,
+                    },
+                )
+                if not created:
+                    _count(key, elapsed_ms)
+        except DatabaseError:
+            logger.exception("Could not record slow query %s", key)
+
+
+# ---------------------------------------------------------
+# BACKGROUND FLUSH
+# ---------------------------------------------------------
+_pending = queue.Queue(maxsize=MAX_PENDING_FLUSHES)
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def defer_slow_queries(view, slow_queries):
+    """Hand one request's slow queries to the flush thread."""
+    try:
+        _pending.put_nowait((view, slow_queries))
+    except queue.Full:
+        logger.warning("Slow query flush queue is full, dropped %d queries of %s", len(slow_queries), view)
+        return
+    _ensure_worker()
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        # (re)started lazily: after a fork only the calling thread survives
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_flush_forever, name="slow-query-flush", daemon=True)
+            _worker.start()
+
+
+def _flush_forever():
+    while True:
+        view, slow_queries = _pending.get()
+        try:
+            flush_slow_queries(view, slow_queries)
+        except Exception:
+            logger.exception("Slow query flush failed")
+        finally:
+            close_old_connections()
+
+
+def flush_pending():
+    """Flush everything queued so far in the calling thread (tests, shutdown)."""
+    while True:
+        try:
+            view, slow_queries = _pending.get_nowait()
+        except queue.Empty:
+            return
+        flush_slow_queries(view, slow_queries)
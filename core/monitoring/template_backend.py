@@ -0,0 +1,38 @@
+# monitoring/template_backend.py
+
+from time import perf_counter_ns
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from .metrics import current_request_metrics
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        metrics = current_request_metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+
+        # render_to_string inside a template tag: already inside the outer timing
+        metrics.template_depth += 1
+        start = perf_counter_ns()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_ns += perf_counter_ns() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates whose renders count towards the request's template time."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,163 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from items.models import Item
+from monitoring import profiling, slow_queries
+from monitoring.metrics import registry
+from monitoring.models import SlowQuery
+from monitoring.slow_queries import normalize_sql
+from users.models import User
+
+
+class MetricsEndpointTests(TestCase):
+
+    def setUp(self):
+        registry.reset()
+        self.staff = User.objects.create_user("staff", password="x", role="staff")
+
+    def test_students_and_anonymous_are_refused(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+
+        self.client.force_login(User.objects.create_user("student", password="x"))
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_scraper_token(self):
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 403)
+
+    def test_requests_are_recorded_per_view(self):
+        self.client.get(reverse("list_found_items"))
+        self.client.force_login(self.staff)
+
+        body = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn('http_responses_total{view="list_found_items",method="GET",status="200"} 1', body)
+        self.assertIn('http_request_db_queries_sum{view="list_found_items",method="GET"} 1', body)
+        self.assertIn('http_request_template_seconds_count{view="list_found_items",method="GET"} 1', body)
+
+    def test_unknown_methods_are_one_label(self):
+        for method in ('FOO"BAR', "PROPFIND"):
+            self.client.generic(method, reverse("list_found_items"))
+        self.client.force_login(self.staff)
+
+        body = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn('http_responses_total{view="list_found_items",method="other",status="200"} 2', body)
+        self.assertNotIn("FOO", body)
+
+
+class ProfilingTests(TestCase):
+
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        self.staff = User.objects.create_user("staff", password="x", role="staff")
+
+    def profile(self, user, **settings):
+        self.client.force_login(user)
+        with override_settings(PROFILING_ENABLED=True, PROFILE_DIR=self.profile_dir.name, **settings):
+            return self.client.get(reverse("search_items") + "?_profile=1")
+
+    def test_staff_request_is_profiled(self):
+        name = self.profile(self.staff)["X-Profile-Id"]
+
+        files = sorted(os.listdir(self.profile_dir.name))
+        self.assertEqual(files, [f"{name}.collapsed", f"{name}.json", f"{name}.pstats"])
+
+        with override_settings(PROFILE_DIR=self.profile_dir.name):
+            page = self.client.get(reverse("profiles"))
+        self.assertContains(page, f"{name}.pstats")
+
+    def test_students_are_not_profiled(self):
+        response = self.profile(User.objects.create_user("student", password="x"))
+
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(os.listdir(self.profile_dir.name), [])
+
+    def test_concurrent_request_runs_unprofiled(self):
+        with profiling._profiling:  # another request is being profiled
+            response = self.profile(self.staff)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(os.listdir(self.profile_dir.name), [])
+
+    def test_only_newest_profiles_are_kept(self):
+        names = [self.profile(self.staff, PROFILE_KEEP=2)["X-Profile-Id"] for _ in range(3)]
+
+        kept = {entry.split(".")[0] for entry in os.listdir(self.profile_dir.name)}
+        self.assertEqual(kept, set(names[1:]))
+
+
+class SlowQueryTests(TestCase):
+
+    def setUp(self):
+        # no flush thread: the test flushes the queue itself (flush_pending)
+        self.enterContext(mock.patch.object(slow_queries, "_ensure_worker"))
+
+    def test_normalize_sql_groups_values_and_in_lists(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  LIMIT 21"),
+            normalize_sql("SELECT * FROM t WHERE id IN (%s) AND name = 'y' LIMIT 5"),
+        )
+        self.assertEqual(normalize_sql("SELECT a1 FROM t WHERE b = 3"), "SELECT a1 FROM t WHERE b = ?")
+
+    def test_normalize_sql_keeps_like_escape_clauses_apart(self):
+        query = Item.objects.filter(Q(item_name__icontains="a") | Q(description__icontains="b"))
+        sql, _ = query.query.sql_with_params()  # as record_query sees it
+
+        normalized = normalize_sql(sql, connection.vendor)
+
+        self.assertIn("description", normalized)
+        self.assertNotIn("'", normalized)
+
+    def test_normalize_sql_backslash_escapes_on_mysql(self):
+        self.assertEqual(
+            normalize_sql(r"SELECT * FROM t WHERE a = 'it\'s' AND b = 'x'", "mysql"),
+            "SELECT * FROM t WHERE a = ? AND b = ?",
+        )
+        self.assertEqual(
+            normalize_sql(r"SELECT * FROM t WHERE a LIKE 'x' ESCAPE '\' OR b = 1", "sqlite"),
+            "SELECT * FROM t WHERE a LIKE ? ESCAPE ? OR b = ?",
+        )
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_view_queries_are_grouped_with_explain(self):
+        for keyword in ("wallet", "phone"):
+            self.client.get(reverse("search_items") + f"?keyword={keyword}")
+        slow_queries.flush_pending()
+
+        query = SlowQuery.objects.get(sql__contains="items_item")
+        self.assertEqual(query.count, 2)
+        self.assertEqual(query.view, "search_items")
+        self.assertTrue(query.call_site.startswith("items/views.py:"))
+        self.assertIn("items_item", query.explain)
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_response_does_not_wait_for_explain(self):
+        with mock.patch.object(slow_queries, "explain", return_value="plan") as explain:
+            response = self.client.get(reverse("search_items") + "?keyword=wallet")
+
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(explain.called)
+            self.assertFalse(SlowQuery.objects.exists())
+
+            slow_queries.flush_pending()
+
+        self.assertTrue(explain.called)
+        self.assertTrue(SlowQuery.objects.filter(explain="plan").exists())
+
+    def test_fast_queries_are_not_recorded(self):
+        self.client.get(reverse("search_items"))
+        slow_queries.flush_pending()
+        self.assertFalse(SlowQuery.objects.exists())
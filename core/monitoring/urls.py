@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import metrics_view, profiles_view, profile_download
+
+urlpatterns = [
+    path('metrics/', metrics_view, name='metrics'),
+    path('profiles/', profiles_view, name='profiles'),
+    path('profiles/<str:filename>', profile_download, name='profile_download'),
+]
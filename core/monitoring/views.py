@@ -0,0 +1,61 @@
+import hmac
+import os
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import render
+
+from users.views import is_staff_or_admin
+
+from .metrics import registry
+from .profiling import PROFILE_NAME, profile_dir, recent_profiles
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _metrics_allowed(request):
+    # staff session, or the scraper's bearer token (METRICS_TOKEN)
+    if request.user.is_authenticated and is_staff_or_admin(request.user):
+        return True
+
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    header = request.headers.get('Authorization', '')
+    return bool(token) and hmac.compare_digest(header, f'Bearer {token}')
+
+
+# ---------------------------------------------------------
+# STAFF: Prometheus metrics of this process
+# ---------------------------------------------------------
+def metrics_view(request):
+    if not _metrics_allowed(request):
+        return HttpResponse("Staff only.", status=403)
+
+    return HttpResponse(registry.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+# ---------------------------------------------------------
+# STAFF: recent on-demand profiles
+# ---------------------------------------------------------
+@login_required
+@user_passes_test(is_staff_or_admin)
+def profiles_view(request):
+    return render(request, 'monitoring/profiles.html', {
+        'profiles': recent_profiles(),
+        'profiling_enabled': getattr(settings, 'PROFILING_ENABLED', False),
+    })
+
+
+@login_required
+@user_passes_test(is_staff_or_admin)
+def profile_download(request, filename):
+    if not PROFILE_NAME.match(filename):
+        raise Http404("Profile not found")
+
+    try:
+        profile = open(os.path.join(profile_dir(), filename), 'rb')
+    except FileNotFoundError:
+        raise Http404("Profile not found")
+
+    return FileResponse(profile, as_attachment=True, filename=filename)
@@ -1,3 +1,86 @@
+from datetime import date
+from unittest import mock
+
 from django.test import TestCase
+from django.urls import reverse
+
+from items.models import Item
+from items.testing import make_items
+from search_ai import views
+from users.models import User
+
+
+FILTERS = {
+    "keyword": None, "category": None, "color": None, "location": None,
+    "item_type": "found", "start_date": None, "end_date": "2025-01-10",
+}
+
+
+class AISearchTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("student", password="x")
+        self.client.force_login(self.user)
+
+        parse = mock.patch.object(views, "parse_nl_query_to_filters", return_value=dict(FILTERS))
+        self.parse = parse.start()
+        self.addCleanup(parse.stop)
+
+    def search(self, cursor=None, query="find my bottle"):
+        data = {"query": query}
+        if cursor is not None:
+            data["cursor"] = cursor
+        return self.client.post(reverse("ai_search"), data)
+
+    def found(self, name, day):
+        return Item.objects.create(
+            reported_by=self.user, item_name=name, description="Water bottle", category="Other",
+            location="Gym", item_type="found", date_found=date(2025, 1, day),
+        )
+
+    def test_results_are_ranked_by_relevance(self):
+        # closest to the end of the range first, whatever the report order
+        best = self.found("Bottle A", 10)
+        close = self.found("Bottle B", 8)
+        far = self.found("Bottle C", 1)
+        self.found("Bottle D", 20)  # after the range: filtered out
+
+        response = self.search()
+
+        self.assertEqual(response.context["ai_items"], [best, close, far])
+        self.assertIsNone(response.context["ai_next_cursor"])
+
+    def test_show_more_pages_through_the_same_ranking(self):
+        make_items(views.AI_SEARCH_PAGE_SIZE + 2, self.user, "found")
+
+        first = self.search()
+        self.assertEqual(len(first.context["ai_items"]), views.AI_SEARCH_PAGE_SIZE)
+        self.assertEqual(first.context["ai_next_cursor"], views.AI_SEARCH_PAGE_SIZE)
+
+        second = self.search(cursor=first.context["ai_next_cursor"])
+        self.assertEqual(len(second.context["ai_items"]), 2)
+        self.assertIsNone(second.context["ai_next_cursor"])
+
+        # no overlap, and the LLM is not asked again for the next page
+        shown = first.context["ai_items"] + second.context["ai_items"]
+        self.assertEqual(len(set(shown)), views.AI_SEARCH_PAGE_SIZE + 2)
+        self.assertEqual(self.parse.call_count, 1)
+
+    def test_cursor_of_another_query_starts_over(self):
+        make_items(3, self.user, "found")
+        self.search()
+
+        response = self.search(cursor=10, query="find my bag")
+
+        self.assertEqual(len(response.context["ai_items"]), 3)
+        self.assertEqual(self.parse.call_count, 2)
+
+    def test_only_newest_candidates_are_ranked(self):
+        best = self.found("Bottle A", 10)  # oldest report, best match
+        newer = [self.found(f"Bottle {i}", 1) for i in range(3)]
+
+        with mock.patch.object(views, "AI_SEARCH_CANDIDATE_POOL", 3):
+            response = self.search()
 
-# Create your tests here.
+        self.assertNotIn(best, response.context["ai_items"])
+        self.assertEqual(set(response.context["ai_items"]), set(newer))
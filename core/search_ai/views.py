@@ -1,13 +1,39 @@
 from django.shortcuts import render
-from django.db.models import Q
 from items.models import Item
+from items.colors import normalize_color
+from items.forms import date_range_q
+from items.matching import rank_items_for_filters
 from .utils import parse_nl_query_to_filters
 from datetime import datetime
 
 
+# How many results are shown per "page" of the AI answer
+AI_SEARCH_PAGE_SIZE = 10
+
+# Upper bound on how many filtered items are scored per search, so a vague
+# query never loads the whole table. Only the newest AI_SEARCH_CANDIDATE_POOL
+# reports that pass the filters are ranked: an older item that matches well
+# but falls outside the pool is not shown (not even behind "Show more").
+# Narrower queries (keyword, date range, …) shrink the filtered set first.
+AI_SEARCH_CANDIDATE_POOL = 500
+
+# Fields needed to score and display a result
+AI_SEARCH_FIELDS = (
+    "id", "item_name", "description", "category", "color", "color_bucket", "location",
+    "item_type", "date_lost", "date_found", "status", "image", "image_derivatives",
+)
+
+
 def ai_search_view(request):
+    """
+    Natural-language search: the LLM turns the query into filters, the
+    newest AI_SEARCH_CANDIDATE_POOL matching items are ranked by relevance
+    and shown AI_SEARCH_PAGE_SIZE at a time ("Show more" posts a cursor).
+    """
     ai_message = None
     result_items = []
+    next_cursor = None
+    query_text = ""
 
     if request.method == "POST":
         query_text = request.POST.get("query", "").strip()
@@ -35,15 +61,31 @@ def ai_search_view(request):
             )
             return render(request, "users/dashboard.html", {"ai_response": ai_message})
 
+        # "Show more" → offset into the ranked results of the same query
+        try:
+            cursor = max(int(request.POST.get("cursor", 0)), 0)
+        except ValueError:
+            cursor = 0
+
         # --------------------------------------------------------
         # Step 1: Extract structured filters using LLM
+        # (reuse the last parse when paging through the same query)
         # --------------------------------------------------------
-        filters = parse_nl_query_to_filters(query_text)
+        last_search = request.session.get("ai_search") or {}
+
+        if cursor and last_search.get("query") == query_text:
+            filters = last_search["filters"]
+        else:
+            cursor = 0
+            filters = parse_nl_query_to_filters(query_text)
+            request.session["ai_search"] = {"query": query_text, "filters": filters}
 
         # --------------------------------------------------------
         # Step 2: Start DB Query
         # --------------------------------------------------------
-        items_qs = Item.objects.all().order_by("-date_reported")
+        # newest first (id breaks ties within a day), so the pool below is the
+        # newest reports and ties in score favour them
+        items_qs = Item.objects.only(*AI_SEARCH_FIELDS).order_by("-date_reported", "-id")
 
         keyword = filters.get("keyword")
         category = filters.get("category")
@@ -64,7 +106,12 @@ def ai_search_view(request):
             items_qs = items_qs.filter(category__icontains=category)
 
         if color:
-            items_qs = items_qs.filter(color__icontains=color)
+            # "navy", "dark blue" … → one indexed bucket comparison
+            color_bucket = normalize_color(color)
+            if color_bucket:
+                items_qs = items_qs.filter(color_bucket=color_bucket)
+            else:
+                items_qs = items_qs.filter(color__icontains=color)
 
         if location:
             items_qs = items_qs.filter(location__icontains=location)
@@ -85,15 +132,33 @@ def ai_search_view(request):
         start_d = parse_date(start_date)
         end_d = parse_date(end_date)
 
-        if start_d:
-            items_qs = items_qs.filter(date_lost_or_found__gte=start_d)
-        if end_d:
-            items_qs = items_qs.filter(date_lost_or_found__lte=end_d)
+        # Lost and found dates are separate columns (both bounds on one)
+        date_range = date_range_q(start_d, end_d)
+        if date_range:
+            items_qs = items_qs.filter(date_range)
+
+        # --------------------------------------------------------
+        # Step 3: Rank by relevance, keep only the requested page
+        # --------------------------------------------------------
+        # Items closest to the end of the requested range score best on date
+        target_date = end_d or start_d
+
+        candidates = items_qs[:AI_SEARCH_CANDIDATE_POOL].iterator()
+        ranked = rank_items_for_filters(
+            candidates,
+            filters,
+            target_date=target_date,
+            limit=cursor + AI_SEARCH_PAGE_SIZE + 1,
+        )
+
+        page = ranked[cursor:cursor + AI_SEARCH_PAGE_SIZE]
+        result_items = [item for _, item in page]
 
-        result_items = list(items_qs)
+        if len(ranked) > cursor + AI_SEARCH_PAGE_SIZE:
+            next_cursor = cursor + AI_SEARCH_PAGE_SIZE
 
         # --------------------------------------------------------
-        # Step 3: Build FRIENDLY AI message
+        # Step 4: Build FRIENDLY AI message
         # --------------------------------------------------------
         if len(result_items) == 0:
             ai_message = (
@@ -103,19 +168,23 @@ def ai_search_view(request):
         else:
             ai_message = (
                 f"Great news! 🎉\n"
-                f"We found {len(result_items)} matching item(s):\n\n"
+                f"Here are the best matches "
+                f"({cursor + 1}–{cursor + len(result_items)}):\n\n"
             )
-            for item in result_items:
+            for score, item in page:
                 ai_message += (
                     f"• {item.item_name}\n"
                     f"  Color: {item.color}\n"
                     f"  Location: {item.location or 'Not specified'}\n"
                     f"  Date: {item.date_lost_or_found}\n"
-                    f"  Status: {item.item_type.capitalize()}\n\n"
+                    f"  Status: {item.item_type.capitalize()}\n"
+                    f"  Relevance: {score} / 100\n\n"
                 )
 
     # Return to dashboard with AI sidebar response
     return render(request, "users/dashboard.html", {
         "ai_response": ai_message,
         "ai_items": result_items,
+        "ai_query": query_text,
+        "ai_next_cursor": next_cursor,
     })
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class NotificationBroker:
+    """
+    Fans notification events out to open dashboard streams.
+
+    publish() is called from sync code (views, the outbox dispatcher) and
+    must be thread-safe. subscribe() is used by the async stream view.
+    Subclass this to plug in a shared broker (Redis pub/sub, ...) when
+    running more than one node, and point NOTIFICATION_BROKER at it.
+    """
+
+    def publish(self, user_id, event):
+        raise NotImplementedError
+
+    def subscribe(self, user_id):
+        """
+        Return a Subscription whose get() awaits the next event for user_id.
+        """
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class Subscription:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=100)
+
+    def put(self, event):
+        # called on the subscriber's loop; drop events for a stalled client
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class InMemoryBroker(NotificationBroker):
+    """
+    Process-local broker: only reaches streams served by the same process,
+    so it requires a single ASGI process that also dispatches the outbox
+    (NOTIFICATION_SSE and NOTIFICATION_DISPATCH_IN_PROCESS on).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.put, event)
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, "NOTIFICATION_BROKER", "users.broker.InMemoryBroker")
+                _broker = import_string(path)()
+
+    return _broker
+
+
+def publish_notification(notification):
+    event = {
+        "id": notification.id,
+        "message": notification.message,
+        "created_at": notification.created_at.isoformat() if notification.created_at else None,
+    }
+    get_broker().publish(notification.user_id, event)
@@ -0,0 +1,14 @@
+from django.utils.functional import SimpleLazyObject
+
+from .notifications import get_unread_count
+
+
+def notifications(request):
+    # Lazy: only looked up when a template actually shows the badge
+    user = getattr(request, 'user', None)
+    if user is None:
+        return {}
+
+    return {
+        'unread_notifications': SimpleLazyObject(lambda: get_unread_count(user)),
+    }
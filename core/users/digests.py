@@ -0,0 +1,98 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import Notification
+
+
+logger = logging.getLogger(__name__)
+
+
+DIGEST_SUBJECT = "Lost & Found: you have {count} new notification(s)"
+
+
+def build_digest(email, messages):
+    body = "Here is what happened on Lost & Found:\n\n"
+    for message, created_at in messages:
+        body += f"• {message}\n  ({created_at:%Y-%m-%d %H:%M})\n\n"
+    body += "Log in to your dashboard for details."
+
+    return EmailMessage(
+        subject=DIGEST_SUBJECT.format(count=len(messages)),
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email],
+    )
+
+
+def _send_batch(connection, digests):
+    """
+    Send one batch of digests over an already-open connection.
+    `digests` maps user id → (email, notification ids, [(message, created_at), ...]).
+    Each digest is marked as emailed right after the backend accepted it;
+    a failed one is logged and left for the next run.
+    """
+    sent = 0
+
+    for user_id, (email, note_ids, messages) in digests.items():
+        try:
+            delivered = connection.send_messages([build_digest(email, messages)])
+        except Exception:
+            logger.exception("Could not send notification digest to user %s", user_id)
+            continue
+
+        if delivered:
+            Notification.objects.filter(id__in=note_ids, emailed_at__isnull=True).update(
+                emailed_at=timezone.now()
+            )
+            sent += 1
+
+    return sent
+
+
+def send_notification_digests(window_hours=24, batch_size=200, connection=None):
+    """
+    Email every user one digest of their unread notifications created in
+    the last `window_hours` that were not emailed yet.
+    Digests are sent `batch_size` users at a time over a single reused
+    backend connection. Returns the number of digests sent.
+    """
+    since = timezone.now() - timedelta(hours=window_hours)
+
+    rows = (
+        Notification.objects.filter(
+            is_read=False,
+            emailed_at__isnull=True,
+            created_at__gte=since,
+        )
+        .exclude(user__email="")
+        .order_by("user_id", "id")
+        .values_list("id", "user_id", "user__email", "message", "created_at")
+    )
+
+    connection = connection or get_connection()
+    sent = 0
+
+    with connection:
+        digests = {}
+        current_user = None
+
+        for note_id, user_id, email, message, created_at in rows.iterator(chunk_size=2000):
+            if user_id != current_user:
+                # rows come ordered by user → flush only between users
+                if len(digests) >= batch_size:
+                    sent += _send_batch(connection, digests)
+                    digests = {}
+                current_user = user_id
+
+            _, note_ids, messages = digests.setdefault(user_id, (email, [], []))
+            note_ids.append(note_id)
+            messages.append((message, created_at))
+
+        if digests:
+            sent += _send_batch(connection, digests)
+
+    return sent
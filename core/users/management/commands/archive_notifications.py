@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.retention import archive_read_notifications, purge_dispatched_outbox
+
+
+class Command(BaseCommand):
+    help = "Archive old read notifications and purge delivered outbox rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "NOTIFICATION_RETENTION_DAYS", 30),
+            help="Keep read notifications younger than N days in the hot table.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.05,
+            help="Seconds to sleep between batches to let other writers in.",
+        )
+
+    def handle(self, *args, **options):
+        kwargs = {
+            "days": options["days"],
+            "batch_size": options["batch_size"],
+            "pause": options["pause"],
+        }
+
+        archived = archive_read_notifications(**kwargs)
+        purged = purge_dispatched_outbox(**kwargs)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} notification(s), purged {purged} outbox row(s)."
+        ))
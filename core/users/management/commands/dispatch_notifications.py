@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from users.notifications import dispatch_forever, dispatch_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued notifications from the outbox in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll the outbox instead of exiting when it is empty.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when --loop is given.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        if options["loop"]:
+            dispatch_forever(batch_size=batch_size, interval=options["interval"])
+            return
+
+        total = 0
+        while True:
+            handled = dispatch_outbox(batch_size=batch_size)
+            if not handled:
+                break
+            total += handled
+
+        self.stdout.write(self.style.SUCCESS(f"Dispatched {total} outbox entries."))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from users.stats import refresh_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized staff dashboard counters (fixes drift)."
+
+    def handle(self, *args, **options):
+        stats = refresh_dashboard_stats()
+        summary = ", ".join(f"{name}={value}" for name, value in stats.items())
+        self.stdout.write(self.style.SUCCESS(f"Dashboard stats refreshed: {summary}"))
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.digests import send_notification_digests
+
+
+class Command(BaseCommand):
+    help = "Email each user one digest of their unread notifications."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window-hours",
+            type=int,
+            default=getattr(settings, "NOTIFICATION_DIGEST_WINDOW_HOURS", 24),
+            help="Only include notifications created in the last N hours.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Digests sent per backend connection batch.",
+        )
+
+    def handle(self, *args, **options):
+        sent = send_notification_digests(
+            window_hours=options["window_hours"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} digest(s)."))
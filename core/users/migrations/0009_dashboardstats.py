@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_notificationarchive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_lost', models.PositiveIntegerField(default=0)),
+                ('total_found', models.PositiveIntegerField(default=0)),
+                ('unmatched_lost', models.PositiveIntegerField(default=0)),
+                ('unmatched_found', models.PositiveIntegerField(default=0)),
+                ('returned_items', models.PositiveIntegerField(default=0)),
+                ('pending_claims', models.PositiveIntegerField(default=0)),
+                ('approved_claims', models.PositiveIntegerField(default=0)),
+                ('rejected_claims', models.PositiveIntegerField(default=0)),
+                ('dirty', models.BooleanField(default=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
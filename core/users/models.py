@@ -38,5 +38,76 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    # Set once the notification went out in an email digest
+    emailed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # dashboard / unread badge lookups
+            models.Index(fields=['user', 'is_read'], name='notif_user_is_read_idx'),
+            # email digest scan
+            models.Index(fields=['is_read', 'emailed_at', 'created_at'], name='notif_digest_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.message[:30]}"
+
+
+class NotificationOutbox(models.Model):
+    """
+    Notifications waiting to be delivered. Rows are written in the same
+    transaction as the state change that caused them and turned into
+    Notification rows by the dispatch_notifications command.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    message = models.TextField()
+
+    # Same key → same notification (double submits, retries). A key is
+    # never reused, so it names one event: include what changes when the
+    # event repeats (ids, the version a transition produced)
+    dedupe_key = models.CharField(max_length=255, null=True, blank=True, unique=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    def __str__(self):
+        state = "dispatched" if self.dispatched_at else "pending"
+        return f"{self.user_id} - {self.message[:30]} [{state}]"
+
+
+class NotificationArchive(models.Model):
+    """
+    Read notifications moved out of the hot Notification table by the
+    archive_notifications command.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    message = models.TextField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.message[:30]} (archived)"
+
+
+class DashboardStats(models.Model):
+    """
+    Materialized staff-dashboard counters (single row, pk=1).
+    Item/Claim signals flag it dirty after commit; a dashboard read
+    recomputes it (at most every DASHBOARD_STATS_MIN_AGE seconds) and
+    reconcile_dashboard_stats refreshes it periodically.
+    """
+    total_lost = models.PositiveIntegerField(default=0)
+    total_found = models.PositiveIntegerField(default=0)
+    unmatched_lost = models.PositiveIntegerField(default=0)
+    unmatched_found = models.PositiveIntegerField(default=0)
+    returned_items = models.PositiveIntegerField(default=0)
+
+    pending_claims = models.PositiveIntegerField(default=0)
+    approved_claims = models.PositiveIntegerField(default=0)
+    rejected_claims = models.PositiveIntegerField(default=0)
+
+    dirty = models.BooleanField(default=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Dashboard stats (refreshed {self.refreshed_at})"
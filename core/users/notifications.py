@@ -0,0 +1,213 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .broker import publish_notification
+from .models import Notification, NotificationOutbox
+
+
+logger = logging.getLogger(__name__)
+
+
+# Unread counters are cached per user and kept current on create / read.
+# The timeout bounds drift when the cache is not shared between processes.
+UNREAD_COUNT_TIMEOUT = 300
+
+
+def unread_count_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def get_unread_count(user):
+    """
+    Number of unread notifications for a user, served from the cache.
+    Only the first lookup (or one after expiry) hits the database.
+    """
+    if not user.is_authenticated:
+        return 0
+
+    key = unread_count_key(user.pk)
+    count = cache.get(key)
+
+    if count is None:
+        count = Notification.objects.filter(user=user, is_read=False).count()
+        # add, not set: a counter filled (and bumped) meanwhile is newer
+        if not cache.add(key, count, UNREAD_COUNT_TIMEOUT):
+            count = cache.get(key, count)
+
+    return max(count, 0)
+
+
+def adjust_unread_count(user_id, delta):
+    """
+    Shift a user's cached unread counter by `delta`.
+    A missing counter is left alone; it is recounted on next read.
+    """
+    if not delta:
+        return
+
+    key = unread_count_key(user_id)
+    try:
+        if delta > 0:
+            cache.incr(key, delta)
+        else:
+            cache.decr(key, -delta)
+    except ValueError:
+        pass
+
+
+def forget_unread_count(user_id):
+    cache.delete(unread_count_key(user_id))
+
+
+def mark_all_read(user):
+    """
+    Mark every unread notification of `user` as read with a single UPDATE.
+    Returns the notifications that were unread, newest first, so the
+    caller can still show them.
+    """
+    notifications = list(
+        Notification.objects.filter(user=user, is_read=False)
+        .order_by('-created_at')
+    )
+
+    if notifications:
+        updated = Notification.objects.filter(
+            id__in=[note.id for note in notifications],
+            is_read=False,
+        ).update(is_read=True)
+        transaction.on_commit(lambda: adjust_unread_count(user.pk, -updated))
+
+    return notifications
+
+
+# ---------------------------------------------------------
+# OUTBOX
+# ---------------------------------------------------------
+def notify(user, message, dedupe_key=None):
+    """
+    Queue a notification for `user`. Call inside the transaction that
+    makes the change being notified about.
+    """
+    notify_many([(user, message, dedupe_key)])
+
+
+def notify_many(entries):
+    """
+    Queue several notifications with one INSERT.
+    `entries` is an iterable of (user, message) or (user, message, dedupe_key);
+    `user` may be a User or a user id.
+    """
+    rows = []
+    for entry in entries:
+        user, message = entry[0], entry[1]
+        dedupe_key = entry[2] if len(entry) > 2 else None
+        rows.append(NotificationOutbox(
+            user_id=getattr(user, "pk", user),
+            message=message,
+            dedupe_key=dedupe_key,
+        ))
+
+    if rows:
+        # a duplicate dedupe_key means it is already queued → skip it
+        NotificationOutbox.objects.bulk_create(rows, ignore_conflicts=True)
+
+        # no worker draining the outbox (WSGI / runserver) → deliver
+        # right after this transaction commits
+        if getattr(settings, 'NOTIFICATION_DISPATCH_ON_COMMIT', True):
+            user_ids = {row.user_id for row in rows}
+            transaction.on_commit(lambda: dispatch_after_commit(user_ids, len(rows)))
+
+
+def dispatch_after_commit(user_ids, limit):
+    """
+    on_commit fallback of notify_many: one batch of at most `limit`
+    pending rows of `user_ids` (the users just notified), so the request
+    never pays for other users' backlog. A failure must not turn the
+    already committed request into an error: the rows stay queued for
+    `manage.py dispatch_notifications`.
+    """
+    try:
+        dispatch_outbox(batch_size=limit, user_ids=user_ids)
+    except Exception:
+        logger.exception("Notification dispatch after commit failed")
+
+
+def dispatch_outbox(batch_size=500, user_ids=None):
+    """
+    Turn one batch of pending outbox rows (of `user_ids` only, if given)
+    into Notification rows.
+    Returns the number of outbox rows handled (0 → outbox is empty).
+    """
+    with transaction.atomic():
+        pending = NotificationOutbox.objects.select_for_update(skip_locked=True).filter(
+            dispatched_at__isnull=True
+        )
+        if user_ids is not None:
+            pending = pending.filter(user_id__in=user_ids)
+        batch = list(pending.order_by('id')[:batch_size])
+        if not batch:
+            return 0
+
+        # same user + same message in one batch → deliver once
+        seen = set()
+        notifications = []
+        for entry in batch:
+            key = (entry.user_id, entry.message)
+            if key in seen:
+                continue
+            seen.add(key)
+            notifications.append(Notification(user_id=entry.user_id, message=entry.message))
+
+        created = Notification.objects.bulk_create(notifications)
+
+        NotificationOutbox.objects.filter(
+            id__in=[entry.id for entry in batch]
+        ).update(dispatched_at=timezone.now())
+
+    # bulk_create skips post_save → update the cached counters here
+    for user_id, count in Counter(note.user_id for note in created).items():
+        adjust_unread_count(user_id, count)
+
+    for note in created:
+        publish_notification(note)
+
+    return len(batch)
+
+
+def dispatch_forever(batch_size=500, interval=1.0):
+    """
+    Keep draining the outbox; sleep `interval` seconds whenever it is empty.
+    Errors are logged and retried, pending rows stay in the outbox.
+    """
+    while True:
+        try:
+            handled = dispatch_outbox(batch_size=batch_size)
+        except Exception:
+            logger.exception("Notification dispatch failed")
+            close_old_connections()
+            handled = 0
+
+        if not handled:
+            time.sleep(interval)
+
+
+def start_dispatcher_thread(batch_size=500, interval=0.5):
+    """
+    Run the outbox dispatcher in a daemon thread of the current process
+    (single-node deployments, so the in-memory broker sees every event).
+    """
+    thread = threading.Thread(
+        target=dispatch_forever,
+        kwargs={"batch_size": batch_size, "interval": interval},
+        name="notification-dispatcher",
+        daemon=True,
+    )
+    thread.start()
+    return thread
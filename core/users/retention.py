@@ -0,0 +1,64 @@
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive, NotificationOutbox
+
+
+def archive_read_notifications(days=30, batch_size=1000, pause=0.0):
+    """
+    Move read notifications older than `days` into NotificationArchive.
+    Works in short transactions of `batch_size` rows (primary-key deletes)
+    so no long locks are held on the hot table. Returns rows archived.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    archived = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+                .order_by("id")
+                .values_list("id", "user_id", "message", "created_at")[:batch_size]
+            )
+            if not batch:
+                break
+
+            NotificationArchive.objects.bulk_create([
+                NotificationArchive(user_id=user_id, message=message, created_at=created_at)
+                for _, user_id, message, created_at in batch
+            ])
+            Notification.objects.filter(id__in=[row[0] for row in batch]).delete()
+
+        archived += len(batch)
+        if pause:
+            time.sleep(pause)
+
+    return archived
+
+
+def purge_dispatched_outbox(days=30, batch_size=1000, pause=0.0):
+    """
+    Delete outbox rows that were dispatched more than `days` ago.
+    Returns rows deleted.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+
+    while True:
+        ids = list(
+            NotificationOutbox.objects.filter(dispatched_at__lt=cutoff)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+
+        NotificationOutbox.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+        if pause:
+            time.sleep(pause)
+
+    return deleted
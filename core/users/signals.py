@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from claims.models import Claim
+from items.models import Item
+from items.signals import rows_updated
+
+from .broker import publish_notification
+from .models import Notification
+from .notifications import adjust_unread_count, forget_unread_count
+from .stats import mark_dashboard_stats_dirty
+
+
+@receiver(post_save, sender=Notification)
+def bump_unread_count(sender, instance, created, **kwargs):
+    # after commit: a rolled-back notification must not move the badge
+    if created:
+        if not instance.is_read:
+            transaction.on_commit(lambda: adjust_unread_count(instance.user_id, 1))
+    else:
+        # read / unread toggled one by one → recount on next lookup
+        transaction.on_commit(lambda: forget_unread_count(instance.user_id))
+
+
+@receiver(post_delete, sender=Notification)
+def drop_unread_count(sender, instance, **kwargs):
+    if not instance.is_read:
+        transaction.on_commit(lambda: adjust_unread_count(instance.user_id, -1))
+
+
+@receiver(post_save, sender=Notification)
+def push_notification(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: publish_notification(instance))
+
+
+# ---------------------------------------------------------
+# STAFF DASHBOARD STATS → flag dirty on any Item / Claim change
+# ---------------------------------------------------------
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+@receiver(post_save, sender=Claim)
+@receiver(post_delete, sender=Claim)
+@receiver(rows_updated, sender=Item)
+@receiver(rows_updated, sender=Claim)
+def dashboard_stats_changed(sender, **kwargs):
+    mark_dashboard_stats_dirty()
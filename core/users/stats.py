@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from claims.models import Claim
+from items.models import Item
+
+from .models import DashboardStats
+
+
+STATS_PK = 1
+
+
+def compute_dashboard_stats():
+    """
+    All staff-dashboard counters: one conditional-aggregation query per table.
+    """
+    stats = Item.objects.aggregate(
+        total_lost=Count('id', filter=Q(item_type='lost')),
+        total_found=Count('id', filter=Q(item_type='found')),
+        unmatched_lost=Count('id', filter=Q(item_type='lost', status='unmatched')),
+        unmatched_found=Count('id', filter=Q(item_type='found', status='unmatched')),
+        returned_items=Count('id', filter=Q(status='returned')),
+    )
+    stats.update(Claim.objects.aggregate(
+        pending_claims=Count('id', filter=Q(status='pending')),
+        approved_claims=Count('id', filter=Q(status='approved')),
+        rejected_claims=Count('id', filter=Q(status='rejected')),
+    ))
+    return stats
+
+
+def refresh_dashboard_stats():
+    """
+    Recompute the materialized row. The dirty flag is cleared *before*
+    counting, so a write that lands meanwhile flags it again.
+    """
+    DashboardStats.objects.update_or_create(pk=STATS_PK, defaults={'dirty': False})
+
+    stats = compute_dashboard_stats()
+    DashboardStats.objects.filter(pk=STATS_PK).update(refreshed_at=timezone.now(), **stats)
+    return stats
+
+
+def _flag_dirty():
+    DashboardStats.objects.filter(pk=STATS_PK, dirty=False).update(dirty=True)
+
+
+def mark_dashboard_stats_dirty():
+    """
+    Flag the row once the writer's transaction committed. Updating pk=1
+    inside every Item/Claim transaction made all writers queue on its lock.
+    """
+    transaction.on_commit(_flag_dirty)
+
+
+def get_dashboard_stats():
+    """
+    Dashboard counters from the materialized row (one primary-key read).
+
+    Signals only flag the row dirty; they don't apply deltas. A dirty row
+    is recomputed by the read that finds it older than
+    DASHBOARD_STATS_MIN_AGE seconds, so:
+    - counts may lag writes by up to DASHBOARD_STATS_MIN_AGE seconds;
+    - under steady writes one read per window pays the recount
+      (compute_dashboard_stats: one aggregate scan of items and one of
+      claims), every other read stays a primary-key lookup.
+    """
+    row = DashboardStats.objects.filter(pk=STATS_PK).first()
+
+    if row is None:
+        return refresh_dashboard_stats()
+
+    min_age = timedelta(seconds=getattr(settings, 'DASHBOARD_STATS_MIN_AGE', 30))
+    if row.dirty and (row.refreshed_at is None or timezone.now() - row.refreshed_at >= min_age):
+        return refresh_dashboard_stats()
+
+    return {
+        field: getattr(row, field)
+        for field in (
+            'total_lost', 'total_found', 'unmatched_lost', 'unmatched_found',
+            'returned_items', 'pending_claims', 'approved_claims', 'rejected_claims',
+        )
+    }
@@ -1,3 +1,305 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from users.digests import send_notification_digests
+from items.models import Item
+from users.models import DashboardStats, Notification, NotificationArchive, NotificationOutbox, User
+from users.notifications import get_unread_count, mark_all_read, notify
+from users.retention import archive_read_notifications, purge_dispatched_outbox
+from users.stats import get_dashboard_stats
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class NotificationDigestTests(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user("alice", email="alice@example.com", password="x")
+        self.bob = User.objects.create_user("bob", email="bob@example.com", password="x")
+
+    def notify(self, user, message, **fields):
+        return Notification.objects.create(user=user, message=message, **fields)
+
+    def test_one_digest_per_user(self):
+        self.notify(self.alice, "Match found")
+        self.notify(self.alice, "Claim approved")
+        self.notify(self.bob, "Claim rejected")
+
+        sent = send_notification_digests()
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(len(mail.outbox), 2)
+        alice_mail = next(m for m in mail.outbox if m.to == ["alice@example.com"])
+        self.assertIn("Match found", alice_mail.body)
+        self.assertIn("Claim approved", alice_mail.body)
+
+    def test_rerun_does_not_send_twice(self):
+        self.notify(self.alice, "Match found")
+
+        send_notification_digests()
+        sent = send_notification_digests()
+
+        self.assertEqual(sent, 0)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertTrue(Notification.objects.get().emailed_at)
+
+    def test_skips_read_and_old_notifications(self):
+        self.notify(self.alice, "Already read", is_read=True)
+        old = self.notify(self.bob, "Too old")
+        Notification.objects.filter(id=old.id).update(
+            created_at=timezone.now() - timedelta(days=3)
+        )
+
+        self.assertEqual(send_notification_digests(window_hours=24), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_batches_reuse_one_connection(self):
+        for i in range(5):
+            user = User.objects.create_user(f"user{i}", email=f"user{i}@example.com", password="x")
+            self.notify(user, "Hello")
+
+        with mock.patch("users.digests.get_connection", wraps=mail.get_connection) as get_connection:
+            sent = send_notification_digests(batch_size=2)
+
+        self.assertEqual(sent, 5)
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_failed_digest_is_retried_alone(self):
+        self.notify(self.alice, "Match found")
+        self.notify(self.bob, "Claim approved")
+
+        connection = mail.get_connection()
+        send_messages = connection.send_messages
+
+        def fail_for_bob(messages):
+            if messages[0].to == ["bob@example.com"]:
+                raise ConnectionError("SMTP went away")
+            return send_messages(messages)
+
+        with mock.patch.object(connection, "send_messages", side_effect=fail_for_bob):
+            with self.assertLogs("users.digests", "ERROR"):
+                self.assertEqual(send_notification_digests(connection=connection), 1)
+
+        self.assertEqual(send_notification_digests(), 1)
+        self.assertEqual([m.to for m in mail.outbox], [["alice@example.com"], ["bob@example.com"]])
+
+
+class NotificationStreamTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("alice", password="x"))
+
+    @override_settings(NOTIFICATION_SSE=True)
+    def test_stream_is_not_served_under_wsgi(self):
+        response = self.client.get(reverse("notification_stream"))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(response.streaming)
+
+    @override_settings(NOTIFICATION_SSE=True)
+    def test_dashboard_polls_under_wsgi(self):
+        response = self.client.get(reverse("dashboard"))
+
+        self.assertNotContains(response, "EventSource(")
+        self.assertContains(response, reverse("unread_notifications_count"))
+
+
+class NotificationOutboxTests(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user("alice", password="x")
+
+    def test_outbox_is_dispatched_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notify(self.alice, "Match found", dedupe_key="match:1")
+            notify(self.alice, "Match found", dedupe_key="match:1")
+
+        self.assertEqual(Notification.objects.get().message, "Match found")
+        self.assertFalse(NotificationOutbox.objects.filter(dispatched_at__isnull=True).exists())
+
+    def test_on_commit_dispatch_leaves_other_users_backlog(self):
+        bob = User.objects.create_user("bob", password="x")
+        NotificationOutbox.objects.create(user=bob, message="Queued earlier")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notify(self.alice, "Match found")
+
+        self.assertEqual(list(Notification.objects.values_list("user__username", flat=True)), ["alice"])
+        self.assertEqual(NotificationOutbox.objects.get(dispatched_at__isnull=True).user, bob)
+
+    @override_settings(NOTIFICATION_DISPATCH_ON_COMMIT=False)
+    def test_worker_mode_leaves_outbox_queued(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notify(self.alice, "Match found")
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+
+
+class UnreadCountTests(TestCase):
+
+    BADGE = '<span id="notification-badge" class="badge bg-danger{}">{}</span>'
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user("alice", password="x")
+
+    def notify(self, message="Match found"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notification.objects.create(user=self.alice, message=message)
+
+    def test_new_notifications_bump_the_cached_counter(self):
+        self.assertEqual(get_unread_count(self.alice), 0)
+
+        self.notify()
+        self.notify()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.alice), 2)
+
+    def test_rolled_back_notification_leaves_the_counter(self):
+        get_unread_count(self.alice)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                Notification.objects.create(user=self.alice, message="Match found")
+                raise ValueError("change failed")
+
+        self.assertEqual(get_unread_count(self.alice), 0)
+
+    def test_reading_one_notification_invalidates_the_counter(self):
+        get_unread_count(self.alice)
+        note = self.notify()
+
+        note.is_read = True
+        with self.captureOnCommitCallbacks(execute=True):
+            note.save()
+
+        self.assertEqual(get_unread_count(self.alice), 0)
+
+    def test_mark_all_read(self):
+        older, newer = self.notify("older"), self.notify("newer")
+        get_unread_count(self.alice)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(mark_all_read(self.alice), [newer, older])
+
+        self.assertFalse(Notification.objects.filter(is_read=False).exists())
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.alice), 0)
+
+    def test_badge_shows_the_unread_count(self):
+        self.client.force_login(self.alice)
+        self.assertContains(self.client.get(reverse("list_found_items")), self.BADGE.format(" d-none", 0), html=True)
+
+        self.notify()
+        self.notify()
+        self.assertContains(self.client.get(reverse("list_found_items")), self.BADGE.format("", 2), html=True)
+
+        # the dashboard shows them and marks them read
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertContains(self.client.get(reverse("dashboard")), "Match found")
+        self.assertContains(self.client.get(reverse("list_found_items")), self.BADGE.format(" d-none", 0), html=True)
+
+
+class DashboardStatsTests(TestCase):
+
+    def setUp(self):
+        self.reporter = User.objects.create_user("finder", password="x")
+        get_dashboard_stats()  # materialize the row
+
+    def report_lost_item(self):
+        return Item.objects.create(
+            reported_by=self.reporter, item_name="Wallet", description="",
+            category="Other", location="Library", item_type="lost",
+        )
+
+    def test_row_is_flagged_after_commit_only(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.report_lost_item()
+            self.assertFalse(DashboardStats.objects.get().dirty)
+
+        self.assertTrue(DashboardStats.objects.get().dirty)
+
+    def test_clean_row_is_one_query(self):
+        with self.assertNumQueries(1):
+            get_dashboard_stats()
+
+    @override_settings(DASHBOARD_STATS_MIN_AGE=60)
+    def test_fresh_dirty_row_is_one_query(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.report_lost_item()
+
+        with self.assertNumQueries(1):
+            get_dashboard_stats()
+
+    @override_settings(DASHBOARD_STATS_MIN_AGE=60)
+    def test_dirty_row_is_recounted_at_most_once_per_min_age(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.report_lost_item()
+        self.assertEqual(get_dashboard_stats()["total_lost"], 0)
+
+        DashboardStats.objects.update(refreshed_at=timezone.now() - timedelta(minutes=2))
+        self.assertEqual(get_dashboard_stats()["total_lost"], 1)
+        self.assertFalse(DashboardStats.objects.get().dirty)
+
+
+class RetentionTests(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user("alice", password="x")
+        self.old = timezone.now() - timedelta(days=40)
+
+    def notification(self, message, is_read=True, old=True):
+        note = Notification.objects.create(user=self.alice, message=message, is_read=is_read)
+        if old:
+            Notification.objects.filter(pk=note.pk).update(created_at=self.old)
+        return note
+
+    def outbox(self, message, dispatched_at):
+        return NotificationOutbox.objects.create(user=self.alice, message=message, dispatched_at=dispatched_at)
+
+    def test_archives_only_old_read_notifications(self):
+        for i in range(5):
+            self.notification(f"Old read {i}")
+        unread = self.notification("Old unread", is_read=False)
+        recent = self.notification("Recent read", old=False)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(archive_read_notifications(days=30, batch_size=2), 5)
+
+        # batches of 2 + 2 + 1, each one short DELETE by primary key
+        deletes = [q["sql"] for q in queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 3)
+
+        self.assertEqual(set(Notification.objects.values_list("id", flat=True)), {unread.id, recent.id})
+        self.assertEqual(
+            sorted(NotificationArchive.objects.values_list("user_id", "message", "created_at")),
+            [(self.alice.id, f"Old read {i}", self.old) for i in range(5)],
+        )
+
+    def test_batch_size_boundary(self):
+        for i in range(4):
+            self.notification(f"Old read {i}")
+
+        self.assertEqual(archive_read_notifications(days=30, batch_size=2), 4)
+        self.assertEqual(archive_read_notifications(days=30, batch_size=2), 0)
+        self.assertEqual(NotificationArchive.objects.count(), 4)
+
+    def test_purges_only_old_dispatched_outbox_rows(self):
+        for i in range(3):
+            self.outbox(f"Old {i}", self.old)
+        pending = self.outbox("Pending", None)
+        recent = self.outbox("Recent", timezone.now())
+
+        self.assertEqual(purge_dispatched_outbox(days=30, batch_size=2), 3)
+
+        self.assertEqual(set(NotificationOutbox.objects.values_list("id", flat=True)), {pending.id, recent.id})
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import signup_view, CustomLoginView, logout_view, dashboard_view,staff_dashboard_view
+from .views import signup_view, CustomLoginView, logout_view, dashboard_view,staff_dashboard_view,unread_notifications_count,notification_stream
 
 urlpatterns = [
     path('signup/', signup_view, name='signup'),
@@ -7,4 +7,6 @@ urlpatterns = [
     path('logout/', logout_view, name='logout'),
     path('dashboard/', dashboard_view, name='dashboard'),
     path('staff-dashboard/',staff_dashboard_view, name='staff_dashboard'),
+    path('notifications/unread-count/', unread_notifications_count, name='unread_notifications_count'),
+    path('notifications/stream/', notification_stream, name='notification_stream'),
 ]
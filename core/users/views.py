@@ -1,12 +1,24 @@
+import asyncio
+import json
+
+from django.conf import settings
 from django.shortcuts import render,redirect
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.views import LoginView 
 from django.urls import reverse_lazy
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from templates.users.forms import CustomUserCreationForm, CustomAuthenticationForm
 from items.models import Item
 from claims.models import Claim
 from users.models import Notification, User
+from users.broker import get_broker
+from users.notifications import get_unread_count, mark_all_read
+from users.stats import compute_dashboard_stats, get_dashboard_stats
+
+# Seconds between keep-alive comments on the notification stream
+STREAM_HEARTBEAT = 15
 
 def signup_view(request):
     if request.method == 'POST':
@@ -86,24 +98,64 @@ def dashboard_view(request):
     if request.user.role == "admin" or request.user.is_superuser:
         return redirect('staff_dashboard')
 
-    # Fetch unread notifications for the logged-in user
-    notifications = Notification.objects.filter(
-        user=request.user,
-        is_read=False
-    ).order_by('-created_at')
-
-    # Mark them as read after showing
-    for note in notifications:
-        note.is_read = True
-        note.save()
+    # Fetch unread notifications and mark them read (one UPDATE)
+    notifications = mark_all_read(request.user)
 
     # Render student/staff dashboard
     return render(request, 'users/dashboard.html', {
-        "notifications": notifications
+        "notifications": notifications,
+        "notification_sse": notification_sse_available(request),
+        "notification_poll_ms": getattr(settings, 'NOTIFICATION_POLL_SECONDS', 30) * 1000,
     })
 
 
 
+def notification_sse_available(request):
+    """
+    SSE only under ASGI: WSGI would buffer the endless stream in a worker.
+    Everywhere else the dashboard polls unread_notifications_count.
+    """
+    return getattr(settings, 'NOTIFICATION_SSE', False) and isinstance(request, ASGIRequest)
+
+
+@login_required
+def unread_notifications_count(request):
+    return JsonResponse({"unread": get_unread_count(request.user)})
+
+
+@login_required
+async def notification_stream(request):
+    """
+    Server-Sent Events stream of new notifications for the logged-in user.
+    Only served through ASGI (core/asgi.py) with NOTIFICATION_SSE on;
+    otherwise 204, which tells EventSource not to reconnect.
+    """
+    if not notification_sse_available(request):
+        return HttpResponse(status=204)
+
+    user = await request.auser()
+    broker = get_broker()
+
+    async def events():
+        subscription = broker.subscribe(user.pk)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await subscription.get(timeout=STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: notification\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 def is_staff_or_admin(user):
     if user.is_superuser or user.is_staff:
         return True
@@ -113,25 +165,11 @@ def is_staff_or_admin(user):
 @login_required
 @user_passes_test(is_staff_or_admin)
 def staff_dashboard_view(request):
-    total_lost = Item.objects.filter(item_type='lost').count()
-    total_found = Item.objects.filter(item_type='found').count()
-
-    unmatched_lost = Item.objects.filter(item_type='lost', status='unmatched').count()
-    unmatched_found = Item.objects.filter(item_type='found', status='unmatched').count()
-
-    pending_claims = Claim.objects.filter(status='pending').count()
-    approved_claims = Claim.objects.filter(status='approved').count()
-    rejected_claims = Claim.objects.filter(status='rejected').count()
-    returned_items = Item.objects.filter(status='returned').count()
-
-    context = {
-        'total_lost': total_lost,
-        'total_found': total_found,
-        'unmatched_lost': unmatched_lost,
-        'unmatched_found': unmatched_found,
-        'pending_claims': pending_claims,
-        'approved_claims': approved_claims,
-        'rejected_claims': rejected_claims,
-        'returned_items': returned_items,
-    }
+    # One indexed read of the materialized row, or one aggregate query
+    # per table when materialized stats are turned off
+    if getattr(settings, 'DASHBOARD_STATS_MATERIALIZED', True):
+        context = get_dashboard_stats()
+    else:
+        context = compute_dashboard_stats()
+
     return render(request, 'users/staff_dashboard.html', context)
\ No newline at end of file